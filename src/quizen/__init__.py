@@ -1,21 +1,53 @@
-"""Quizen package initialization."""
-
-from .google_api import DriveClient, SheetsClient, load_credentials, prepare_export  # noqa: F401
-from .llm import LLMClient, build_default_llm_client  # noqa: F401
-from .parts import (  # noqa: F401
-    PartClassificationResult,
-    PartClassifier,
-    build_classification_prompt,
-)
-from .pipeline import PipelineRunner, build_default_runner  # noqa: F401
-from .questions import (  # noqa: F401
-    QuestionGenerationOptions,
-    generate_questions,
-    generate_stub_questions,
-)
-from .reporting import build_meta_sheet_rows, persist_run  # noqa: F401
-from .runner import build_lectures_from_drive, run_drive_to_sheet  # noqa: F401
-from .web import create_app  # noqa: F401
+"""Quizen package initialization.
+
+Public names are resolved lazily (PEP 562) so that importing a light module
+such as `quizen.questions` does not pull in the Google client or web stacks.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from .google_api import DriveClient, SheetsClient, load_credentials, prepare_export  # noqa: F401
+    from .llm import LLMClient, build_default_llm_client  # noqa: F401
+    from .parts import (  # noqa: F401
+        PartClassificationResult,
+        PartClassifier,
+        build_classification_prompt,
+    )
+    from .pipeline import PipelineRunner, build_default_runner  # noqa: F401
+    from .questions import (  # noqa: F401
+        QuestionGenerationOptions,
+        generate_questions,
+        generate_stub_questions,
+    )
+    from .reporting import build_meta_sheet_rows, persist_run  # noqa: F401
+    from .runner import build_lectures_from_drive, run_drive_to_sheet  # noqa: F401
+    from .web import create_app  # noqa: F401
+
+_ATTR_TO_MOD = {
+    "PipelineRunner": "pipeline",
+    "build_default_runner": "pipeline",
+    "PartClassifier": "parts",
+    "PartClassificationResult": "parts",
+    "build_classification_prompt": "parts",
+    "LLMClient": "llm",
+    "build_default_llm_client": "llm",
+    "QuestionGenerationOptions": "questions",
+    "generate_questions": "questions",
+    "generate_stub_questions": "questions",
+    "build_meta_sheet_rows": "reporting",
+    "persist_run": "reporting",
+    "DriveClient": "google_api",
+    "SheetsClient": "google_api",
+    "load_credentials": "google_api",
+    "prepare_export": "google_api",
+    "build_lectures_from_drive": "runner",
+    "run_drive_to_sheet": "runner",
+    "create_app": "web",
+}
 
 __all__ = [
     "PipelineRunner",
@@ -38,3 +70,17 @@ __all__ = [
     "run_drive_to_sheet",
     "create_app",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _ATTR_TO_MOD[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_ATTR_TO_MOD))
@@ -1,7 +1,10 @@
 """Utilities to distribute questions across PARTs."""
 from __future__ import annotations
 
-from typing import Dict, List
+from collections import deque
+from functools import lru_cache
+from itertools import chain
+from typing import Deque, Dict, List, Tuple
 
 from .models import Part, Question
 
@@ -10,12 +13,18 @@ def minimum_distribution(total_questions: int, parts: List[Part]) -> Dict[str, i
     """Distribute minimum counts using floor division and remainder round-robin."""
     if total_questions <= 0 or not parts:
         return {}
-    base = total_questions // len(parts)
-    remainder = total_questions % len(parts)
-    allocation = {part.part_name: base for part in parts}
-    for idx in range(remainder):
-        allocation[parts[idx].part_name] += 1
-    return allocation
+    # Callers may mutate the result, so hand out a fresh dict over the cached pairs.
+    return dict(_allocation_for(total_questions, tuple(part.part_name for part in parts)))
+
+
+@lru_cache(maxsize=128)
+def _allocation_for(total_questions: int, names: Tuple[str, ...]) -> Tuple[Tuple[str, int], ...]:
+    base, remainder = divmod(total_questions, len(names))
+    allocation = dict.fromkeys(names, base)
+    if remainder:
+        for name in names[:remainder]:
+            allocation[name] = base + 1
+    return tuple(allocation.items())
 
 
 def rebalance_questions(questions: List[Question], parts: List[Part]) -> List[Question]:
@@ -23,28 +32,29 @@ def rebalance_questions(questions: List[Question], parts: List[Part]) -> List[Qu
     if not questions or not parts:
         return questions
 
+    names = [part.part_name for part in parts]
     target = minimum_distribution(len(questions), parts)
-    per_part: Dict[str, List[Question]] = {part.part_name: [] for part in parts}
-    overflow: List[Question] = []
+    idx_of = {name: idx for idx, name in enumerate(names)}
+    remaining = [target[name] for name in names]
+    buckets: List[List[Question]] = [[] for _ in names]
+    overflow: Deque[Question] = deque()
 
     for q in questions:
-        if q.part_name in per_part and len(per_part[q.part_name]) < target[q.part_name]:
-            per_part[q.part_name].append(q)
+        idx = idx_of.get(q.part_name, -1)
+        if idx >= 0 and remaining[idx] > 0:
+            buckets[idx].append(q)
+            remaining[idx] -= 1
         else:
             overflow.append(q)
 
     # Fill shortfalls with overflow questions
-    for part in parts:
-        needed = target[part.part_name] - len(per_part[part.part_name])
-        if needed > 0:
-            reassigned = overflow[:needed]
-            for q in reassigned:
-                q.part_name = part.part_name
-            per_part[part.part_name].extend(reassigned)
-            overflow = overflow[needed:]
-
-    balanced: List[Question] = []
-    for part in parts:
-        balanced.extend(per_part[part.part_name])
-    balanced.extend(overflow)
-    return balanced
+    for idx, needed in enumerate(remaining):
+        name = names[idx]
+        bucket = buckets[idx]
+        for _ in range(min(needed, len(overflow))):
+            q = overflow.popleft()
+            q.part_name = name
+            bucket.append(q)
+
+    # One allocation for the result instead of a comprehension plus a concatenated copy.
+    return list(chain(chain.from_iterable(buckets), overflow))
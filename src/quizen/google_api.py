@@ -1,22 +1,33 @@
 """Google Drive/Sheets integration helpers."""
 from __future__ import annotations
 
+import codecs
+import functools
 import io
 import json
 import logging
+import os
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import httplib2
+from google.auth.transport.requests import Request
 from google.oauth2 import credentials as user_credentials
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.http import MediaIoBaseDownload, build_http
 
 from .models import ExportRow
+from .retry import backoff_delays, parse_retry_after
 
 
 logger = logging.getLogger(__name__)
@@ -28,6 +39,13 @@ DRIVE_SCOPES = [
 ]
 SHEETS_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 DEFAULT_SCOPES = DRIVE_SCOPES + SHEETS_SCOPES
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+DRIVE_LIST_PAGE_SIZE = 1000
+DRIVE_FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+HTTP_CACHE_ENV = "QUIZEN_HTTP_CACHE"
+HTTP_TIMEOUT_SECONDS = 30
+META_APPEND_CHUNK_ROWS = 10_000
+SERVICE_CACHE_SIZE = 8
 
 
 def load_credentials(
@@ -41,21 +59,50 @@ def load_credentials(
     - 서비스 계정 키(`type == service_account`)이면 바로 로드
     - OAuth 클라이언트(JSON 내 `web`/`installed`)는 저장된 token JSON을 우선 사용
     - token이 없고 `allow_browser_flow=True`이면 로컬 서버 플로우로 token 생성 후 저장
+    - 결과는 (경로, scopes, token 경로, 파일 수정 시각) 기준으로 프로세스 내 캐시되며 만료 시 refresh
     """
 
-    scopes = list(scopes or DEFAULT_SCOPES)
-    raw = json.loads(credentials_path.read_text())
+    creds = _load_credentials_cached(
+        str(credentials_path.resolve()),
+        tuple(scopes or DEFAULT_SCOPES),
+        str(token_path.resolve()) if token_path else None,
+        allow_browser_flow,
+        _mtime_ns(credentials_path),
+        _mtime_ns(token_path),
+    )
+    if getattr(creds, "expired", False):
+        creds.refresh(Request())
+    return creds
+
+
+def _mtime_ns(path: Optional[Path]) -> Optional[int]:
+    if path is None or not path.exists():
+        return None
+    return path.stat().st_mtime_ns
+
+
+@functools.lru_cache(maxsize=8)
+def _load_credentials_cached(
+    credentials_path: str,
+    scopes: Tuple[str, ...],
+    token_path: Optional[str],
+    allow_browser_flow: bool,
+    credentials_mtime: Optional[int],  # noqa: ARG001 - part of the cache key
+    token_mtime: Optional[int],  # noqa: ARG001 - part of the cache key
+):
+    scope_list = list(scopes)
+    raw = json.loads(Path(credentials_path).read_text())
     if raw.get("type") == "service_account":
-        return service_account.Credentials.from_service_account_file(str(credentials_path), scopes=scopes)
+        return service_account.Credentials.from_service_account_file(credentials_path, scopes=scope_list)
 
-    if token_path and token_path.exists():
-        return user_credentials.Credentials.from_authorized_user_file(str(token_path), scopes=scopes)
+    if token_path and Path(token_path).exists():
+        return user_credentials.Credentials.from_authorized_user_file(token_path, scopes=scope_list)
 
     if allow_browser_flow:
-        flow = InstalledAppFlow.from_client_secrets_file(str(credentials_path), scopes=scopes)
+        flow = InstalledAppFlow.from_client_secrets_file(credentials_path, scopes=scope_list)
         creds = flow.run_local_server(port=0)
         if token_path:
-            token_path.write_text(creds.to_json())
+            Path(token_path).write_text(creds.to_json())
         return creds
 
     raise ValueError(
@@ -63,11 +110,66 @@ def load_credentials(
     )
 
 
+def _build_cached_http(credentials) -> AuthorizedHttp:
+    """Authorized httplib2 client; `QUIZEN_HTTP_CACHE` opts into an on-disk cache for ETag 304s."""
+
+    # build_http keeps googleapiclient's transport tweaks (308 is not followed as a redirect).
+    http = build_http()
+    http.timeout = HTTP_TIMEOUT_SECONDS
+    cache_dir = os.getenv(HTTP_CACHE_ENV)
+    if cache_dir:
+        http.cache = httplib2.FileCache(cache_dir)
+    return AuthorizedHttp(credentials, http=http)
+
+
+def _build_discovered(api: str, version: str, credentials):
+    """Build a service from the discovery document bundled with googleapiclient (no HTTP fetch)."""
+
+    return build(
+        api,
+        version,
+        http=_build_cached_http(credentials),
+        static_discovery=True,
+        cache_discovery=False,
+    )
+
+
+# Per-thread (api, version, id(credentials)) -> (credentials, service); httplib2 is not
+# thread-safe, and the credentials object is kept so its id cannot be recycled.
+_SERVICE_CACHE = threading.local()
+
+
+def _thread_service_cache() -> "OrderedDict[Tuple[str, str, int], Tuple[Any, Any]]":
+    cache = getattr(_SERVICE_CACHE, "services", None)
+    if cache is None:
+        cache = _SERVICE_CACHE.services = OrderedDict()
+    return cache
+
+
+def _get_service(api: str, version: str, credentials):
+    """Return an API service cached for the current thread and the given credentials."""
+
+    if credentials is None:
+        return build(api, version, credentials=credentials, static_discovery=True, cache_discovery=False)
+
+    cache = _thread_service_cache()
+    key = (api, version, id(credentials))
+    cached = cache.get(key)
+    if cached is not None and cached[0] is credentials:
+        cache.move_to_end(key)
+        return cached[1]
+    service = _build_discovered(api, version, credentials)
+    cache[key] = (credentials, service)
+    while len(cache) > SERVICE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return service
+
+
 @dataclass
 class DriveFile:
     id: str
     name: str
-    mime_type: str
+    mime_type: Optional[str] = None
 
 
 class DriveApiError(Exception):
@@ -92,23 +194,66 @@ class WriteResult:
     raw_response: Dict
 
 
+class _DecodingSink(io.RawIOBase):
+    """Write-only file object that decodes UTF-8 chunks as they arrive."""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.parts: List[str] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.parts.append(self._decoder.decode(b))
+        return len(b)
+
+    def getvalue(self) -> str:
+        """Return the decoded text and release the chunk buffers."""
+
+        self.parts.append(self._decoder.decode(b"", final=True))
+        text = "".join(self.parts)
+        self.parts.clear()
+        return text
+
+
 class DriveClient:
     """Drive API wrapper for listing and copying files."""
 
-    def __init__(self, credentials=None, service=None):
-        self.service = service or build("drive", "v3", credentials=credentials)
+    def __init__(self, credentials=None, service=None, download_chunksize: int = DOWNLOAD_CHUNK_SIZE):
+        self.credentials = credentials
+        self.download_chunksize = download_chunksize
+        self.service = service or _get_service("drive", "v3", credentials)
+        self._local = threading.local()
+
+    def _thread_service(self):
+        """Return a Drive service owned by the current thread (httplib2 is not thread-safe)."""
+
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = _build_discovered("drive", "v3", self.credentials)
+            self._local.service = service
+        return service
 
     def list_srt_files(self, folder_id: str) -> List[DriveFile]:
-        query = f"'{folder_id}' in parents and trashed = false"
-        fields = "nextPageToken, files(id, name, mimeType)"
-        files: List[DriveFile] = []
+        return list(self.iter_srt_files(folder_id))
+
+    def iter_srt_files(self, folder_id: str) -> Iterator[DriveFile]:
+        """Yield a folder's `.srt` files page by page instead of collecting them first."""
+
+        # Folders are excluded server-side; the `.srt` suffix is checked locally.
+        query = (
+            f"'{folder_id}' in parents and trashed = false "
+            f"and mimeType != '{DRIVE_FOLDER_MIME_TYPE}'"
+        )
+        fields = "nextPageToken,files(id,name)"
         page_token: Optional[str] = None
         page_count = 0
         try:
             while True:
                 resp = (
                     self.service.files()
-                    .list(q=query, pageSize=100, pageToken=page_token, fields=fields)
+                    .list(q=query, pageSize=DRIVE_LIST_PAGE_SIZE, pageToken=page_token, fields=fields)
                     .execute()
                 )
                 page_count += 1
@@ -123,13 +268,12 @@ class DriveClient:
                     )
                 for item in page_files:
                     if item.get("name", "").lower().endswith(".srt"):
-                        files.append(DriveFile(id=item["id"], name=item["name"], mime_type=item.get("mimeType", "")))
+                        yield DriveFile(id=item["id"], name=item["name"])
                 page_token = resp.get("nextPageToken")
                 if not page_token:
                     break
         except HttpError as exc:  # pragma: no cover - defensive
             raise DriveApiError(f"Drive listing failed for folder {folder_id}") from exc
-        return files
 
     def copy_file(self, file_id: str, destination_folder_id: str, new_name: str) -> DriveFile:
         body = {"name": new_name, "parents": [destination_folder_id]}
@@ -137,32 +281,71 @@ class DriveClient:
         return DriveFile(id=result["id"], name=result["name"], mime_type=result.get("mimeType", ""))
 
     def download_file(self, file_id: str) -> str:
-        request = self.service.files().get_media(fileId=file_id)
-        fh = io.BytesIO()
-        downloader = MediaIoBaseDownload(fh, request)
+        return self._download(self.service, file_id)
+
+    def download_files(self, file_ids: Sequence[str], max_workers: int = 8) -> List[str]:
+        """Download several files concurrently, preserving the input order.
+
+        Each worker thread builds its own authorized service. When the client was
+        constructed from an injected service without credentials, downloads run
+        sequentially on that service instead.
+        """
+
+        if self.credentials is None or max_workers <= 1 or len(file_ids) <= 1:
+            return [self.download_file(file_id) for file_id in file_ids]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(file_ids))) as executor:
+            return list(executor.map(lambda file_id: self._download(self._thread_service(), file_id), file_ids))
+
+    def _download(self, service, file_id: str) -> str:
+        request = service.files().get_media(fileId=file_id)
+        sink = _DecodingSink()
+        downloader = MediaIoBaseDownload(sink, request, chunksize=self.download_chunksize)
         done = False
         while not done:
             _, done = downloader.next_chunk()
-        fh.seek(0)
-        return fh.read().decode("utf-8")
+        del downloader
+        return sink.getvalue()
+
+
+def _is_missing_range_error(exc: HttpError) -> bool:
+    """Sheets rejects ranges that point at a missing tab with 400 "Unable to parse range"."""
+
+    if getattr(getattr(exc, "resp", None), "status", None) != 400:
+        return False
+    content = getattr(exc, "content", b"") or b""
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="replace")
+    return "Unable to parse range" in content
 
 
 class SheetsClient:
     """Sheets API wrapper to push ExportRow payloads."""
 
-    def __init__(self, credentials=None, service=None):
-        self.service = service or build("sheets", "v4", credentials=credentials)
+    def __init__(self, credentials=None, service=None, validate_before_write: bool = False):
+        self.service = service or _get_service("sheets", "v4", credentials)
+        # The preflight costs an extra round trip; by default a missing tab is detected
+        # from the write's own 400 response instead.
+        self.validate_before_write = validate_before_write
+        self._checked_headers: set = set()
 
     @staticmethod
-    def _execute_with_retry(request, retries: int = 3, base_delay: float = 1.0):
+    def _execute_with_retry(request, retries: int = 3, base_delay: float = 1.0, max_total_s: float = 60.0):
+        delays = backoff_delays(base_delay, retries - 1)
+        deadline = time.monotonic() + max_total_s
         attempt = 0
         while True:
             try:
                 return request.execute()
             except HttpError as exc:
-                status = getattr(getattr(exc, "resp", None), "status", None)
+                resp = getattr(exc, "resp", None)
+                status = getattr(resp, "status", None)
                 if status in (429, 500, 502, 503, 504) and attempt < retries - 1:
-                    delay = base_delay * (2**attempt)
+                    retry_after = parse_retry_after(resp.get("retry-after")) if hasattr(resp, "get") else None
+                    delay = delays[attempt] if retry_after is None else retry_after
+                    if time.monotonic() + delay > deadline:
+                        logger.warning("Sheets retry budget of %.1fs exhausted; giving up", max_total_s)
+                        raise
                     logger.warning(
                         "Sheets API returned %s; retrying in %.1fs (attempt %d/%d)",
                         status,
@@ -175,84 +358,152 @@ class SheetsClient:
                     continue
                 raise
 
-    def write_export_rows(
+    def batch_write(
         self,
         spreadsheet_id: str,
-        rows: Iterable[ExportRow],
-        start_row: int = 3,
-        sheet_name: str = "Sheet1",
-    ) -> WriteResult:
-        values: List[List[str | int]] = []
-        for row in rows:
-            values.append(row.sheet_cells)
-
-        sheet_metadata = (
-            self.service.spreadsheets()
-            .get(spreadsheetId=spreadsheet_id, fields="sheets.properties.title")
-            .execute()
+        value_ranges: Sequence[Dict],
+        value_input_option: str = "USER_ENTERED",
+    ) -> Dict:
+        """Write several `ValueRange` payloads in a single `values.batchUpdate` call."""
+
+        body = {"valueInputOption": value_input_option, "data": list(value_ranges)}
+        return self._execute_with_retry(
+            self.service.spreadsheets().values().batchUpdate(spreadsheetId=spreadsheet_id, body=body)
         )
-        sheet_titles = {sheet["properties"]["title"] for sheet in sheet_metadata.get("sheets", [])}
-        if sheet_name not in sheet_titles:
-            raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in spreadsheet {spreadsheet_id}")
 
-        header_row_index = max(1, start_row - 1)
+    def _ensure_header(self, spreadsheet_id: str, sheet_name: str, header_row_index: int) -> None:
+        """Check the target tab and its header row with one metadata request per client."""
+
+        cache_key = (spreadsheet_id, sheet_name, header_row_index)
+        if cache_key in self._checked_headers:
+            return
+
         header_range = f"{sheet_name}!A{header_row_index}:I{header_row_index}"
-        header_resp = (
-            self.service.spreadsheets()
-            .values()
-            .get(spreadsheetId=spreadsheet_id, range=header_range)
-            .execute()
-        )
-        if not header_resp.get("values"):
+        try:
+            metadata = (
+                self.service.spreadsheets()
+                .get(
+                    spreadsheetId=spreadsheet_id,
+                    ranges=[header_range],
+                    includeGridData=True,
+                    fields="sheets(properties(title),data(rowData(values(formattedValue))))",
+                )
+                .execute()
+            )
+        except HttpError as exc:
+            if _is_missing_range_error(exc):
+                raise SheetNotFoundError(
+                    f"Sheet '{sheet_name}' does not exist in spreadsheet {spreadsheet_id}"
+                ) from exc
+            raise
+
+        target = None
+        for sheet in metadata.get("sheets", []):
+            if sheet.get("properties", {}).get("title") == sheet_name:
+                target = sheet
+                break
+        if target is None:
+            raise SheetNotFoundError(f"Sheet '{sheet_name}' does not exist in spreadsheet {spreadsheet_id}")
+
+        header_values = [
+            cell.get("formattedValue")
+            for grid in target.get("data", [])
+            for row in grid.get("rowData", [])
+            for cell in row.get("values", [])
+        ]
+        if not any(header_values):
             raise SheetHeaderMissingError(
                 f"Expected header row at {header_range} but no values were returned"
             )
+        self._checked_headers.add(cache_key)
 
-        if not values:
-            return WriteResult(updated_range=None, success_count=0, failure_count=0, raw_response={})
+    def write_export_rows(
+        self,
+        spreadsheet_id: str,
+        rows: Iterable[ExportRow],
+        start_row: int = 3,
+        sheet_name: str = "Sheet1",
+        extra_ranges: Sequence[Dict] | None = None,
+    ) -> WriteResult:
+        """Write export rows (plus optional extra `ValueRange`s) in one batch call."""
 
-        end_row = start_row + len(values) - 1
-        target_range = f"{sheet_name}!A{start_row}:I{end_row}"
-        body = {"values": values}
-        response = self._execute_with_retry(
-            self.service.spreadsheets()
-            .values()
-            .update(
-                spreadsheetId=spreadsheet_id,
-                range=target_range,
-                valueInputOption="USER_ENTERED",
-                body=body,
-            )
-        )
+        values: List[List[str]] = [row.sheet_cells for row in rows]
+        row_count = len(values)
+
+        if self.validate_before_write:
+            self._ensure_header(spreadsheet_id, sheet_name, max(1, start_row - 1))
+
+        if not row_count and not extra_ranges:
+            return WriteResult(updated_range=None, success_count=0, failure_count=0, raw_response={})
 
-        updated_rows = int(response.get("updatedRows", len(values))) if values else 0
-        success_count = min(updated_rows, len(values))
-        failure_count = max(0, len(values) - success_count)
+        value_ranges: List[Dict] = []
+        if row_count:
+            end_row = start_row + row_count - 1
+            value_ranges.append({"range": f"{sheet_name}!A{start_row}:I{end_row}", "values": values})
+        value_ranges.extend(extra_ranges or [])
+        try:
+            response = self.batch_write(spreadsheet_id, value_ranges)
+        except HttpError as exc:
+            if _is_missing_range_error(exc):
+                raise SheetNotFoundError(
+                    f"Sheet '{sheet_name}' does not exist in spreadsheet {spreadsheet_id}"
+                ) from exc
+            raise
+
+        if not row_count:
+            return WriteResult(updated_range=None, success_count=0, failure_count=0, raw_response=response)
+
+        export_response = (response.get("responses") or [{}])[0]
+        updated_rows = int(export_response.get("updatedRows", row_count))
+        success_count = min(updated_rows, row_count)
+        failure_count = max(0, row_count - success_count)
         return WriteResult(
-            updated_range=response.get("updatedRange"),
+            updated_range=export_response.get("updatedRange"),
             success_count=success_count,
             failure_count=failure_count,
             raw_response=response,
         )
 
+    @staticmethod
+    def meta_value_range(sheet_name: str, rows: List[List[str]]) -> Dict:
+        """Build the `ValueRange` used for the meta tab so it can join an export batch."""
+
+        return {"range": f"{sheet_name}!A1:Z{len(rows)}", "values": rows}
+
     def append_meta_sheet(
         self,
         spreadsheet_id: str,
         sheet_name: str,
-        rows: List[List[str]],
+        rows: Iterable[List[str]],
+        chunk_rows: int = META_APPEND_CHUNK_ROWS,
     ) -> Dict:
-        body = {"values": rows}
-        return (
-            self.service.spreadsheets()
-            .values()
-            .update(
-                spreadsheetId=spreadsheet_id,
-                range=f"{sheet_name}!A1:Z{len(rows)}",
-                valueInputOption="USER_ENTERED",
-                body=body,
+        """Append meta rows after any existing content; the server resolves the target range.
+
+        Rows are appended, not replaced: exporting into the same spreadsheet
+        again adds a second meta block below the first. `rows` may be a
+        generator; it is consumed `chunk_rows` at a time, one append call per
+        chunk, and the last response is returned (`{}` when there were no rows).
+        """
+
+        row_iter = iter(rows)
+        response: Dict = {}
+        while True:
+            chunk = list(islice(row_iter, chunk_rows))
+            if not chunk:
+                return response
+            response = self._execute_with_retry(
+                self.service.spreadsheets()
+                .values()
+                .append(
+                    spreadsheetId=spreadsheet_id,
+                    range=f"{sheet_name}!A1",
+                    valueInputOption="USER_ENTERED",
+                    insertDataOption="INSERT_ROWS",
+                    body={"values": chunk},
+                )
             )
-            .execute()
-        )
+            if len(chunk) < chunk_rows:
+                return response
 
 
 def prepare_export(
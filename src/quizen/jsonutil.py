@@ -0,0 +1,59 @@
+"""JSON encode/decode helpers that use orjson when it is installed.
+
+`pip install quizen[speedups]` pulls in orjson; without it the stdlib `json`
+module is used with equivalent output (UTF-8, no ASCII escaping).
+"""
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import date, datetime
+from pathlib import PurePath
+from typing import Any, Callable, Optional
+
+try:  # pragma: no cover - exercised implicitly depending on the environment
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def encode_default(value: Any) -> Any:
+    """`default=` hook for values both encoders should write the same way.
+
+    Covers pydantic models, paths, UUIDs and dates (ISO 8601, as orjson writes them).
+    """
+
+    model_dump = getattr(value, "model_dump", None)
+    if model_dump is not None:
+        return model_dump(mode="json")
+    if isinstance(value, (PurePath, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, *, indent: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize `obj` to UTF-8 JSON bytes; compact unless `indent` asks for two spaces.
+
+    `default` converts objects the encoder does not know, as in `json.dumps`.
+    """
+
+    if orjson is not None:
+        if indent:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2)
+        return orjson.dumps(obj, default=default)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=default).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse JSON from bytes or str without an intermediate decode when orjson is present."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        # The stdlib parser accepts str/bytes/bytearray but not memoryview.
+        data = bytes(data)
+    return json.loads(data)
@@ -1,13 +1,115 @@
-"""LLM client scaffolding for Gemini 3 Flash interactions."""
+"""LLM client scaffolding for Gemini 3 Flash interactions.
+
+The default transport is a pooled HTTP/2 `httpx.Client`; HTTP/2 support needs
+the `h2` package (`pip install httpx[http2]`).
+"""
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import time
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import httpx
 
+from . import jsonutil
+from .llm_cache import CacheBackend, FileBackend, MemoryBackend, TieredBackend
+from .retry import backoff_delays, parse_retry_after
+
+API_KEY_HEADER = "X-Goog-Api-Key"
+JSON_CONTENT_TYPE = "application/json"
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60)
+DEFAULT_FANOUT_WORKERS = 8
+LLM_CACHE_ENV = "QUIZEN_LLM_CACHE"
+EMBEDDING_MODEL = "text-embedding-004"
+
+logger = logging.getLogger(__name__)
+
+
+def _build_http_client(api_key: str) -> httpx.Client:
+    """Pooled HTTP/2 client that sends the API key as a default header."""
+
+    return httpx.Client(
+        http2=True,
+        timeout=DEFAULT_TIMEOUT,
+        limits=DEFAULT_LIMITS,
+        headers={API_KEY_HEADER: api_key, "Content-Type": JSON_CONTENT_TYPE},
+    )
+
+
+_BODY_PREFIX = b'{"contents":[{"parts":[{"text":'
+_BODY_SCHEMA = b'}]}],"generationConfig":{"responseMimeType":"application/json","responseSchema":'
+_BODY_SUFFIX = b"}}"
+
+
+def _encode_body_prebuilt(prompt: str, schema_json: bytes) -> bytes:
+    """Splice an already-encoded schema into the generateContent envelope."""
+
+    return b"".join((_BODY_PREFIX, jsonutil.dumps(prompt), _BODY_SCHEMA, schema_json, _BODY_SUFFIX))
+
+
+def _log_attempt_failure(exc: Exception, model_name: str, attempt: int, max_retries: int) -> bool:
+    """Log a failed attempt; return False when the error should not be retried."""
+
+    if isinstance(exc, httpx.TimeoutException):
+        logger.warning(
+            "LLM request timed out for model %s (attempt %s/%s)",
+            model_name,
+            attempt,
+            max_retries + 1,
+        )
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code if exc.response else "unknown"
+        logger.warning(
+            "LLM request failed with status %s for model %s (attempt %s/%s)",
+            status,
+            model_name,
+            attempt,
+            max_retries + 1,
+        )
+        return True
+    if isinstance(exc, httpx.HTTPError):
+        logger.warning(
+            "LLM request error for model %s (attempt %s/%s): %s",
+            model_name,
+            attempt,
+            max_retries + 1,
+            exc,
+        )
+        return True
+    logger.error("LLM request failed for model %s: %s", model_name, exc)
+    return False
+
+
+def _retry_delay(exc: Exception, delays: Tuple[float, ...], attempt: int) -> float:
+    """Prefer the server's `Retry-After` hint over the precomputed backoff."""
+
+    if isinstance(exc, httpx.HTTPStatusError) and exc.response is not None:
+        retry_after = parse_retry_after(exc.response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after
+    return delays[attempt - 1]
+
+
+def _past_deadline(deadline: float | None, sleep_for: float) -> bool:
+    if deadline is None or time.monotonic() + sleep_for <= deadline:
+        return False
+    logger.warning("LLM retry budget exhausted; giving up instead of sleeping %.1fs", sleep_for)
+    return True
+
+
+def _log_model_fallback(model_name: str, max_retries: int) -> None:
+    logger.info(
+        "Falling back to next model after %s attempts for model %s",
+        max_retries + 1,
+        model_name,
+    )
+
 
 class LLMClient:
     """Minimal HTTP client wrapper for Gemini endpoints."""
@@ -18,12 +120,36 @@ class LLMClient:
         api_key: str,
         model: str | Sequence[str] = "models/gemini-3-flash-preview",
         client: httpx.Client | None = None,
+        cache_dir: str | os.PathLike | None = None,
+        cache: CacheBackend | None = None,
+        retry_jitter: bool = False,
     ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.model = model
-        self._client = client or httpx.Client(timeout=30)
+        self._client = client or _build_http_client(api_key)
         self._owns_client = client is None
+        # Owned clients carry the key as a default header; injected clients get it per request.
+        self._request_headers = (
+            None if self._owns_client else {API_KEY_HEADER: api_key, "Content-Type": JSON_CONTENT_TYPE}
+        )
+        # Randomize exponential backoff (not Retry-After) so parallel requests spread out.
+        self.retry_jitter = retry_jitter
+        # Optional cache of extracted args keyed by (request body, model); None disables it.
+        # `cache_dir` adds an on-disk layer behind an in-memory LRU.
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if cache is None and self.cache_dir:
+            cache = TieredBackend(MemoryBackend(), FileBackend(self.cache_dir))
+        self._cache = cache
+        self._urls: Dict[str, str] = {}
+        for model_name in self._normalize_models():
+            self._model_url(model_name)
+
+    @property
+    def cache(self) -> CacheBackend | None:
+        """Backend holding extracted responses, or None when caching is off."""
+
+        return self._cache
 
     def generate_json(
         self,
@@ -33,114 +159,186 @@ class LLMClient:
         models: Iterable[str] | None = None,
         max_retries: int = 2,
         backoff_factor: float = 1.0,
+        max_total_seconds: float | None = None,
     ) -> Dict[str, Any]:
-        """Send a generation request with retries and model fallback."""
+        """Send a generation request with retries and model fallback.
 
-        logger = logging.getLogger(__name__)
+        Retries honor a `Retry-After` header when the server sends one and otherwise
+        back off exponentially. `max_total_seconds` bounds total wall time across
+        all attempts and models: the last error is raised instead of sleeping
+        past that budget.
+        """
 
-        model_candidates = list(models) if models is not None else self._normalize_models()
-        if not model_candidates:
-            raise ValueError("At least one model must be provided for generation")
+        return self._send(
+            self._encode_body(prompt, schema),
+            prompt,
+            schema,
+            models=models,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            max_total_seconds=max_total_seconds,
+        )
+
+    def generate_json_prebuilt(
+        self,
+        prompt: str,
+        schema_json: bytes,
+        *,
+        models: Iterable[str] | None = None,
+        max_retries: int = 2,
+        backoff_factor: float = 1.0,
+        max_total_seconds: float | None = None,
+    ) -> Dict[str, Any]:
+        """Same as `generate_json`, with the response schema already JSON-encoded.
 
+        Use for constant schemas (e.g. `parts.PARTS_SCHEMA_JSON`) so they are
+        serialized once at import instead of on every request.
+        """
+
+        return self._send(
+            _encode_body_prebuilt(prompt, schema_json),
+            prompt,
+            None,
+            models=models,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            max_total_seconds=max_total_seconds,
+        )
+
+    def _send(
+        self,
+        body: bytes,
+        prompt: str,
+        schema: Dict[str, Any] | None,
+        *,
+        models: Iterable[str] | None,
+        max_retries: int,
+        backoff_factor: float,
+        max_total_seconds: float | None,
+    ) -> Dict[str, Any]:
+        model_candidates = self._resolve_models(models)
+        delays = backoff_delays(backoff_factor, max_retries, jitter=self.retry_jitter)
+        deadline = None if max_total_seconds is None else time.monotonic() + max_total_seconds
         last_exc: Exception | None = None
         for model_name in model_candidates:
             attempt = 0
             while attempt <= max_retries:
                 attempt += 1
                 try:
-                    return self._generate_for_model(prompt, schema, model_name)
-                except httpx.TimeoutException as exc:
-                    last_exc = exc
-                    logger.warning(
-                        "LLM request timed out for model %s (attempt %s/%s)",
-                        model_name,
-                        attempt,
-                        max_retries + 1,
-                    )
-                except httpx.HTTPStatusError as exc:
-                    last_exc = exc
-                    status = exc.response.status_code if exc.response else "unknown"
-                    logger.warning(
-                        "LLM request failed with status %s for model %s (attempt %s/%s)",
-                        status,
-                        model_name,
-                        attempt,
-                        max_retries + 1,
-                    )
-                except httpx.HTTPError as exc:
-                    last_exc = exc
-                    logger.warning(
-                        "LLM request error for model %s (attempt %s/%s): %s",
-                        model_name,
-                        attempt,
-                        max_retries + 1,
-                        exc,
-                    )
+                    return self._generate_for_model(body, model_name, prompt, schema)
                 except ValueError:
                     raise
-                except Exception as exc:  # noqa: BLE001 - propagate unexpected
+                except Exception as exc:  # noqa: BLE001 - classified below
                     last_exc = exc
-                    logger.error("LLM request failed for model %s: %s", model_name, exc)
-                    break
-
-                if attempt <= max_retries:
-                    sleep_for = backoff_factor * (2 ** (attempt - 1))
+                    if not _log_attempt_failure(exc, model_name, attempt, max_retries):
+                        break
+                    if attempt > max_retries:
+                        break
+                    sleep_for = _retry_delay(exc, delays, attempt)
+                    if _past_deadline(deadline, sleep_for):
+                        raise
                     if sleep_for > 0:
                         time.sleep(sleep_for)
 
-            logger.info(
-                "Falling back to next model after %s attempts for model %s",
-                max_retries + 1,
-                model_name,
-            )
+            _log_model_fallback(model_name, max_retries)
 
         if last_exc:
             raise last_exc
         raise RuntimeError("LLM generation failed without raising an explicit error")
 
+    def _resolve_models(self, models: Iterable[str] | None) -> List[str]:
+        model_candidates = list(models) if models is not None else self._normalize_models()
+        if not model_candidates:
+            raise ValueError("At least one model must be provided for generation")
+        return model_candidates
+
     def _normalize_models(self) -> List[str]:
         if isinstance(self.model, str):
             return [self.model]
         return list(self.model)
 
-    def _generate_for_model(self, prompt: str, schema: Dict[str, Any], model: str) -> Dict[str, Any]:
-        url = f"{self.base_url}/v1beta/models/{model}:generateContent"
-        payload = {
-            "contents": [{"parts": [{"text": prompt}]}],
-            "generationConfig": {
-                "responseMimeType": "application/json",
-                "responseSchema": schema,
-            },
-        }
-        headers = {"X-Goog-Api-Key": self.api_key}
-        response = self._client.post(url, json=payload, headers=headers)
+    def _model_url(self, model: str) -> str:
+        url = self._urls.get(model)
+        if url is None:
+            url = self._urls[model] = f"{self.base_url}/v1beta/models/{model}:generateContent"
+        return url
+
+    @staticmethod
+    def _encode_body(prompt: str, schema: Dict[str, Any]) -> bytes:
+        """Serialize the request envelope once; retries and model fallbacks reuse the bytes."""
+
+        return jsonutil.dumps(
+            {
+                "contents": [{"parts": [{"text": prompt}]}],
+                "generationConfig": {
+                    "responseMimeType": "application/json",
+                    "responseSchema": schema,
+                },
+            }
+        )
+
+    def _generate_for_model(
+        self, body: bytes, model: str, prompt: str, schema: Dict[str, Any] | None
+    ) -> Dict[str, Any]:
+        cache_key = self._cache_key(body, model)
+        cached = self._cache_load(cache_key)
+        if cached is not None:
+            return cached
+        response = self._client.post(self._model_url(model), content=body, headers=self._request_headers)
         response.raise_for_status()
-        data = response.json()
-        return self._extract_args(data, prompt, schema)
-
-    def _extract_args(self, data: Dict[str, Any], prompt: str, schema: Dict[str, Any]) -> Dict[str, Any]:
-        candidates = data.get("candidates")
-        if not isinstance(candidates, list) or not candidates:
-            raise ValueError(
-                "LLM response did not include any candidates; ensure the prompt and response schema match."
-            )
-        parts = candidates[0].get("content", {}).get("parts")
-        if not isinstance(parts, list) or not parts:
-            raise ValueError(
-                "LLM response missing content parts; confirm the prompt requests JSON output matching the schema."
-            )
-        function_call = parts[0].get("functionCall")
-        if not isinstance(function_call, dict):
-            raise ValueError(
-                "LLM response missing content.parts[0].functionCall.args; check the prompt/schema alignment."
-            )
-        args = function_call.get("args")
-        if not isinstance(args, dict):
-            raise ValueError(
-                "LLM response missing functionCall.args object; verify the response schema matches the prompt."
-            )
+        # generateContent bodies are a few KB; one C-level parse of the raw bytes is
+        # cheaper than incremental (ijson-style) parsing and we need the whole args object.
+        data = jsonutil.loads(response.content)
+        args = self._extract_args(data, prompt, schema)
+        self._cache_store(cache_key, args)
         return args
 
+    def _cache_key(self, body: bytes, model: str) -> str | None:
+        if self._cache is None:
+            return None
+        # The encoded body already covers prompt and schema.
+        return hashlib.blake2b(model.encode("utf-8") + b"\0" + body, digest_size=16).hexdigest()
+
+    def _cache_load(self, key: str | None) -> Dict[str, Any] | None:
+        return None if key is None else self._cache.get(key)
+
+    def _cache_store(self, key: str | None, args: Dict[str, Any]) -> None:
+        if key is not None:
+            self._cache.set(key, args)
+
+    def _extract_args(self, data: Dict[str, Any], prompt: str, schema: Dict[str, Any] | None) -> Dict[str, Any]:
+        try:
+            args = data["candidates"][0]["content"]["parts"][0]["functionCall"]["args"]
+            if not isinstance(args, dict):
+                raise TypeError("functionCall.args is not an object")
+            return args
+        except (KeyError, IndexError, TypeError, AttributeError) as exc:
+            raise ValueError(_describe_malformed_response(data)) from exc
+
+    def embed(self, texts: Sequence[str], *, model: str = EMBEDDING_MODEL) -> List[List[float]]:
+        """Embed several texts with one `batchEmbedContents` request, in input order."""
+
+        if not texts:
+            return []
+        body = jsonutil.dumps(
+            {
+                "requests": [
+                    {"model": f"models/{model}", "content": {"parts": [{"text": text}]}} for text in texts
+                ]
+            }
+        )
+        response = self._client.post(
+            f"{self.base_url}/v1beta/models/{model}:batchEmbedContents",
+            content=body,
+            headers=self._request_headers,
+        )
+        response.raise_for_status()
+        data = jsonutil.loads(response.content)
+        try:
+            return [embedding["values"] for embedding in data["embeddings"]]
+        except (KeyError, TypeError) as exc:
+            raise ValueError("Embedding response missing embeddings[].values") from exc
+
     def close(self):
         if self._owns_client:
             self._client.close()
@@ -152,12 +350,65 @@ class LLMClient:
         self.close()
 
 
+def _describe_malformed_response(data: Any) -> str:
+    """Explain which level of a malformed Gemini response is missing (error path only)."""
+
+    candidates = data.get("candidates") if isinstance(data, dict) else None
+    if not isinstance(candidates, list) or not candidates or not isinstance(candidates[0], dict):
+        return "LLM response did not include any candidates; ensure the prompt and response schema match."
+    content = candidates[0].get("content")
+    parts = content.get("parts") if isinstance(content, dict) else None
+    if not isinstance(parts, list) or not parts or not isinstance(parts[0], dict):
+        return "LLM response missing content parts; confirm the prompt requests JSON output matching the schema."
+    function_call = parts[0].get("functionCall")
+    if not isinstance(function_call, dict):
+        return "LLM response missing content.parts[0].functionCall.args; check the prompt/schema alignment."
+    return "LLM response missing functionCall.args object; verify the response schema matches the prompt."
+
+
+def generate_json_many(
+    llm_client: Any,
+    requests: Sequence[Tuple[str, Dict[str, Any]]],
+    *,
+    max_workers: int = DEFAULT_FANOUT_WORKERS,
+) -> List[Dict[str, Any] | Exception]:
+    """Call `llm_client.generate_json` for each `(prompt, schema)` pair concurrently.
+
+    Results come back in request order; a failed request yields its exception in
+    place so callers can apply per-item fallbacks. Threads are used instead of an
+    event loop so the helper also works when invoked from async request handlers,
+    and it accepts any object exposing `generate_json(prompt, schema)`.
+    """
+
+    def _call(request: Tuple[str, Dict[str, Any]]) -> Dict[str, Any] | Exception:
+        prompt, schema = request
+        try:
+            return llm_client.generate_json(prompt, schema)
+        except Exception as exc:  # noqa: BLE001 - returned to the caller for fallback
+            return exc
+
+    if len(requests) <= 1 or max_workers <= 1:
+        return [_call(request) for request in requests]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as executor:
+        return list(executor.map(_call, requests))
+
+
 def build_default_llm_client(
     *, base_url: str = "https://generativelanguage.googleapis.com", model: str = "models/gemini-1.5-flash"
 ) -> LLMClient:
-    """Create an LLM client using the GOOGLE_API_KEY env variable for tests and local runs."""
+    """Create an LLM client using the GOOGLE_API_KEY env variable for tests and local runs.
+
+    Setting `QUIZEN_LLM_CACHE` to a directory enables the on-disk response cache.
+    Retry backoff is jittered so concurrent PART requests do not retry in lockstep.
+    """
 
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise EnvironmentError("GOOGLE_API_KEY is required to build the default LLM client")
-    return LLMClient(base_url=base_url, api_key=api_key, model=model)
+    return LLMClient(
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        cache_dir=os.getenv(LLM_CACHE_ENV) or None,
+        retry_jitter=True,
+    )
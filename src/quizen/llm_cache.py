@@ -0,0 +1,208 @@
+"""Exact-match caches for LLM JSON responses.
+
+Prompts built by quizen are deterministic for a given course, so identical
+`(prompt, schema, model)` requests can reuse a stored response instead of
+paying for another Gemini call.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import operator
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Protocol, Sequence, Tuple
+
+from . import jsonutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_CACHE_SIZE = 256
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        ...
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU with optional per-entry TTL."""
+
+    def __init__(self, maxsize: int = DEFAULT_MEMORY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class FileBackend:
+    """One JSON file per key under `root`; writes are atomic via `os.replace`."""
+
+    def __init__(self, root: str | os.PathLike):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            entry = jsonutil.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable LLM cache entry %s: %s", path, exc)
+            return None
+        expires_at = entry.get("expires_at") if isinstance(entry, dict) else None
+        if expires_at is not None and time.time() >= expires_at:
+            return None
+        return entry.get("value") if isinstance(entry, dict) else None
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        path = self._path(key)
+        entry = {"expires_at": None if ttl is None else time.time() + ttl, "value": value}
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            # Write to a sibling temp file and rename so readers never see partial JSON.
+            fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(jsonutil.dumps(entry))
+            os.replace(tmp_name, path)
+        except OSError as exc:
+            logger.warning("Could not write LLM cache entry %s: %s", path, exc)
+
+
+class TieredBackend:
+    """Check a fast backend before a slow one, promoting slow hits into the fast one."""
+
+    def __init__(self, fast: CacheBackend, slow: CacheBackend):
+        self.fast = fast
+        self.slow = slow
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.fast.get(key)
+        if value is None:
+            value = self.slow.get(key)
+            if value is not None:
+                self.fast.set(key, value)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        self.fast.set(key, value, ttl=ttl)
+        self.slow.set(key, value, ttl=ttl)
+
+
+class ResponseCache:
+    """Cache backend wrapper with hit/miss counters.
+
+    Pass it as `LLMClient(cache=ResponseCache(...))` to see how often responses are reused.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None, ttl: Optional[float] = None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        self.backend.set(key, value, ttl=self.ttl if ttl is None else ttl)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def unit_vector(values: Sequence[float]) -> Tuple[float, ...]:
+    """L2-normalize so cosine similarity reduces to a dot product."""
+
+    norm = math.sqrt(sum(v * v for v in values))
+    if not norm:
+        return tuple(values)
+    return tuple(v / norm for v in values)
+
+
+def similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Dot product of two unit vectors (their cosine similarity)."""
+
+    return sum(map(operator.mul, a, b))
+
+
+class SemanticCache:
+    """Reuse payloads whose key text embeds close to an earlier one.
+
+    Entries store unit vectors, so a lookup is one dot product per entry.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        maxsize: int = DEFAULT_MEMORY_CACHE_SIZE,
+    ):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        # maxlen drops the oldest entry in O(1) once the cache is full.
+        self._entries: Deque[Tuple[Tuple[float, ...], Dict[str, Any], str]] = deque(maxlen=maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, vector: Sequence[float]) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Return `(payload, label)` of the most similar entry above the threshold."""
+
+        best: Optional[Tuple[Dict[str, Any], str]] = None
+        best_score = self.threshold
+        with self._lock:
+            for stored, payload, label in self._entries:
+                score = similarity(vector, stored)
+                if score >= best_score:
+                    best, best_score = (payload, label), score
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return best
+
+    def add(self, vector: Sequence[float], payload: Dict[str, Any], label: str) -> None:
+        with self._lock:
+            self._entries.append((tuple(vector), payload, label))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
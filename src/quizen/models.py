@@ -1,9 +1,14 @@
 """Core data models aligned with PRD v0.5."""
 from __future__ import annotations
 
+import re
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+
+
+_OPTION_PADDING = ("", "", "", "")
+_PART_CODE_RE = re.compile(r"PART\.[0-9]{2}")
 
 
 class Lecture(BaseModel):
@@ -26,12 +31,11 @@ class Part(BaseModel):
 
     @field_validator("part_code")
     def validate_part_code(cls, value: str) -> str:
+        if _PART_CODE_RE.fullmatch(value):
+            return value
         if not value.startswith("PART."):
             raise ValueError("part_code must start with 'PART.'")
-        suffix = value.split("PART.")[-1]
-        if len(suffix) != 2 or not suffix.isdigit():
-            raise ValueError("part_code must be zero-padded two digits, e.g., PART.01")
-        return value
+        raise ValueError("part_code must be zero-padded two digits, e.g., PART.01")
 
     @field_validator("part_name")
     def validate_part_name(cls, value: str) -> str:
@@ -107,13 +111,20 @@ class ExportRow(BaseModel):
 
     @property
     def sheet_cells(self) -> List[str]:
-        """Return A-I cell values with padding for options."""
-        padded_options = self.options + ["", "", "", ""]
+        """Return a fresh list of A-I cell values with padding for options."""
+        options = self.options
+        if len(options) > 4:
+            options = options[:4]
         return [
             str(self.difficulty_code),
             str(self.question_type_code),
             self.question_text,
             self.explanation_text,
             str(self.answer_code),
-            *padded_options[:4],
+            *options,
+            *_OPTION_PADDING[len(options):],
         ]
+
+
+# Built once and shared: each TypeAdapter compiles its own pydantic-core schema.
+QUESTION_LIST_ADAPTER = TypeAdapter(List[Question])
@@ -1,6 +1,7 @@
 """Filename parsing helpers for Drive SRT inputs."""
 from __future__ import annotations
 
+import os
 import re
 from pathlib import Path
 from typing import List, Tuple
@@ -13,17 +14,19 @@ FILENAME_PATTERN = re.compile(r"^(?P<order>\d{3})\s+(?P<id>\w+)\s+(?P<title>.+)\
 def parse_filename(path: Path) -> Tuple[Lecture, List[str]]:
     """Parse a single SRT filename into Lecture; returns lecture and warnings."""
     warnings: List[str] = []
-    match = FILENAME_PATTERN.match(path.name)
+    match = FILENAME_PATTERN.fullmatch(path.name)
     if not match:
         warnings.append(f"Filename does not match expected pattern: {path.name}")
         # Fallback using stem as title when parsing fails
         lecture = Lecture(order="", id=path.stem, title=path.stem, file_path=str(path))
         return lecture, warnings
 
-    lecture = Lecture(
-        order=match.group("order"),
-        id=match.group("id"),
-        title=match.group("title"),
+    # The pattern already guarantees non-empty string fields, so skip re-validation.
+    lecture = Lecture.model_construct(
+        order=match["order"],
+        id=match["id"],
+        title=match["title"],
+        part_code=None,
         file_path=str(path),
     )
     return lecture, warnings
@@ -34,11 +37,15 @@ def parse_course_folder(folder: Path) -> Tuple[List[Lecture], List[str]]:
     lectures: List[Lecture] = []
     warnings: List[str] = []
 
-    srt_files = sorted(folder.glob("*.srt"))
-    for srt_file in srt_files:
-        lecture, lecture_warnings = parse_filename(srt_file)
-        lectures.append(lecture)
-        warnings.extend(lecture_warnings)
-
-    lectures.sort(key=lambda lec: (lec.order or "", lec.title))
+    # scandir yields names and d_type without a stat per entry; one sort at the end
+    # (filename breaks ties) replaces the previous sort-by-path plus re-sort.
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".srt") or not entry.is_file():
+                continue
+            lecture, lecture_warnings = parse_filename(folder / entry.name)
+            lectures.append(lecture)
+            warnings.extend(lecture_warnings)
+
+    lectures.sort(key=lambda lec: (lec.order or "", lec.title, lec.file_path or ""))
     return lectures, warnings
@@ -8,12 +8,20 @@ The functions in this module follow PRD v0.5 requirements:
 """
 from __future__ import annotations
 
+import functools
+from collections import Counter
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
+from . import jsonutil
 from .llm import LLMClient
 from .models import Lecture, Part
 
+try:  # pragma: no cover - exercised implicitly depending on the environment
+    import fastjsonschema
+except ImportError:  # pragma: no cover
+    fastjsonschema = None
+
 
 PARTS_SCHEMA: Dict = {
     "type": "object",
@@ -37,20 +45,49 @@ PARTS_SCHEMA: Dict = {
     },
     "required": ["parts"],
 }
+PARTS_SCHEMA_JSON: bytes = jsonutil.dumps(PARTS_SCHEMA)
+
+
+def _compile_parts_validator():
+    """Compile PARTS_SCHEMA plus the Part field rules when fastjsonschema is installed."""
+
+    if fastjsonschema is None:
+        return None
+    item = PARTS_SCHEMA["properties"]["parts"]["items"]
+    properties = dict(
+        item["properties"],
+        part_code={"type": "string", "pattern": r"^PART\.[0-9]{2}\Z"},
+        part_name={"type": "string", "pattern": r"^PART\."},
+    )
+    schema = {
+        "type": "object",
+        "properties": {"parts": {"type": "array", "items": dict(item, properties=properties)}},
+        "required": ["parts"],
+    }
+    return fastjsonschema.compile(schema)
+
+
+# Local-only schema: the patterns mirror Part's validators and are not sent to Gemini.
+_VALIDATE_PARTS_PAYLOAD = _compile_parts_validator()
+
+
+_PROMPT_HEADER = (
+    "강의명을 PART 단위로 묶어 주세요. 출력은 JSON, 스키마 parts[]. "
+    "명명 규칙: PART.01 {파트 주제}. 모든 강의는 정확히 1개 PART에 포함.\n"
+    "강의 목록:\n"
+)
 
 
 def build_classification_prompt(lectures: List[Lecture]) -> str:
     """Construct a compact instruction for Gemini JSON mode."""
 
-    rows = [
-        f"- {lec.order or '???'} | {lec.id} | {lec.title}"
-        for lec in lectures
-    ]
-    lecture_list = "\n".join(rows)
-    return (
-        "강의명을 PART 단위로 묶어 주세요. 출력은 JSON, 스키마 parts[]. "
-        "명명 규칙: PART.01 {파트 주제}. 모든 강의는 정확히 1개 PART에 포함.\n"
-        f"강의 목록:\n{lecture_list}"
+    return _prompt_for(tuple((lec.order, lec.id, lec.title) for lec in lectures))
+
+
+@functools.lru_cache(maxsize=32)
+def _prompt_for(lec_tuple: Tuple[Tuple[str, str, str], ...]) -> str:
+    return _PROMPT_HEADER + "\n".join(
+        f"- {order or '???'} | {lec_id} | {title}" for order, lec_id, title in lec_tuple
     )
 
 
@@ -63,24 +100,42 @@ def _normalize_part_payload(payload: Dict) -> Part:
     )
 
 
-def _validate_parts(parts: List[Part], lectures: List[Lecture]) -> List[str]:
-    errors: List[str] = []
-    lecture_ids = {lec.id for lec in lectures}
-    assigned_counts: Dict[str, int] = {lec_id: 0 for lec_id in lecture_ids}
+def _parse_parts_payload(raw: Dict) -> List[Part]:
+    """Turn an LLM `parts` payload into Part models.
 
+    With fastjsonschema available the whole payload is checked by one compiled
+    validator (raising `JsonSchemaException`, a ValueError) and the models are
+    built without re-validation; otherwise each PART goes through pydantic.
+    """
+
+    if _VALIDATE_PARTS_PAYLOAD is None:
+        return [_normalize_part_payload(p) for p in raw.get("parts") or []]
+    _VALIDATE_PARTS_PAYLOAD(raw)
+    return [
+        Part.model_construct(
+            part_code=p["part_code"],
+            part_title=p["part_title"],
+            part_name=p["part_name"],
+            lecture_ids=list(p["lecture_ids"]),
+        )
+        for p in raw["parts"]
+    ]
+
+
+def _validate_parts(parts: List[Part], lecture_ids: Set[str]) -> List[str]:
+    errors: List[str] = []
     for part in parts:
         if not part.part_code.startswith("PART."):
             errors.append(f"Invalid part_code: {part.part_code}")
         if not part.part_name.startswith(part.part_code):
             errors.append(f"part_name must prefix part_code: {part.part_name}")
-        for lec_id in part.lecture_ids:
-            if lec_id not in assigned_counts:
-                errors.append(f"Unknown lecture_id in parts: {lec_id}")
-            else:
-                assigned_counts[lec_id] += 1
-
-    missing = [lec_id for lec_id, count in assigned_counts.items() if count == 0]
-    duplicates = [lec_id for lec_id, count in assigned_counts.items() if count > 1]
+
+    assigned = Counter(lec_id for part in parts for lec_id in part.lecture_ids)
+    errors.extend(
+        f"Unknown lecture_id in parts: {lec_id}" for lec_id in assigned if lec_id not in lecture_ids
+    )
+    missing = lecture_ids - assigned.keys()
+    duplicates = [lec_id for lec_id, count in assigned.items() if count > 1 and lec_id in lecture_ids]
     if missing:
         errors.append(f"Unassigned lectures: {', '.join(sorted(missing))}")
     if duplicates:
@@ -138,29 +193,39 @@ class PartClassifier:
         self.llm_client = llm_client
         self.max_retries = max_retries
 
+    def _request_parts(self, prompt: str) -> Dict:
+        # Real LLMClients accept the pre-encoded schema; duck-typed clients get the dict.
+        prebuilt = getattr(self.llm_client, "generate_json_prebuilt", None)
+        if prebuilt is not None:
+            return prebuilt(prompt, PARTS_SCHEMA_JSON)
+        return self.llm_client.generate_json(prompt, PARTS_SCHEMA)
+
     def classify(self, lectures: List[Lecture]) -> PartClassificationResult:
         warnings: List[str] = []
         if not lectures:
             return PartClassificationResult(parts=[], fallback_used=False, warnings=[])
 
         prompt = build_classification_prompt(lectures)
-        attempts = 0
         if self.llm_client:
-            while attempts <= self.max_retries:
-                attempts += 1
+            lecture_ids = {lec.id for lec in lectures}
+            for attempt in range(1, self.max_retries + 2):
+                # Only the LLM call and payload normalization can raise; schema
+                # problems are reported by _validate_parts and handled by branching.
                 try:
-                    raw = self.llm_client.generate_json(prompt, PARTS_SCHEMA)
-                    parts_payload = raw.get("parts") or []
-                    parts = [_normalize_part_payload(p) for p in parts_payload]
-                    errors = _validate_parts(parts, lectures)
-                    if errors:
-                        warnings.extend(errors)
-                        raise ValueError("; ".join(errors))
+                    parts = _parse_parts_payload(self._request_parts(prompt))
+                except Exception as exc:  # noqa: BLE001 - surface all for fallback
+                    warnings.append(f"LLM classification failed (attempt {attempt}): {exc}")
+                    continue
+
+                errors = _validate_parts(parts, lecture_ids)
+                if not errors:
                     return PartClassificationResult(
                         parts=parts, fallback_used=False, warnings=warnings
                     )
-                except Exception as exc:  # noqa: BLE001 - surface all for fallback
-                    warnings.append(f"LLM classification failed (attempt {attempts}): {exc}")
+                warnings.extend(errors)
+                warnings.append(
+                    f"LLM classification failed (attempt {attempt}): {'; '.join(errors)}"
+                )
 
         parts = fallback_split_parts(lectures)
         warnings.append("Fallback PART split applied")
@@ -1,33 +1,65 @@
 """Pipeline orchestration skeleton for quizen."""
 from __future__ import annotations
 
+import asyncio
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import BinaryIO, Callable, Deque, Dict, List, Optional, Sequence, Tuple
 
+from pydantic import TypeAdapter
+
+from . import jsonutil
 from .distribution import rebalance_questions
-from .models import ExportRow, Lecture, Part, PartSummary, Question
+from .llm_cache import SemanticCache
+from .models import QUESTION_LIST_ADAPTER, ExportRow, Lecture, Part, PartSummary, Question
 from .parts import PartClassifier, PartClassificationResult
-from .questions import QuestionGenerationOptions, generate_questions
-from .scoring import score_questions
+from .questions import (
+    QuestionGenerationOptions,
+    generate_questions,
+    summarize_and_generate_llm_questions,
+)
+from .scoring import SCORE_CHUNK_SIZE, SCORE_MAX_PROMPT_TOKENS, score_questions
 from .summaries import summarize_parts
-from .validation import ValidationError, validate_export_rows, validate_question
+from .validation import ValidationError, export_rows_valid, iter_export_row_errors, validate_question
+
+
+# List adapters dump a whole collection in one pydantic-core call instead of
+# one model_dump() per item.
+_PARTS_ADAPTER = TypeAdapter(List[Part])
+_SUMMARIES_ADAPTER = TypeAdapter(List[PartSummary])
+_EXPORT_ROWS_ADAPTER = TypeAdapter(List[ExportRow])
 
+DEFAULT_MAX_EVENTS = 10_000
 
-@dataclass
+
+@dataclass(slots=True)
 class PipelineEvents:
-    """Simple in-memory event log collector with optional sinks."""
+    """Simple in-memory event log collector with optional sinks.
+
+    Only the newest `max_events` events are kept (`None` keeps them all);
+    sinks still see every event.
+    """
 
-    events: List[Dict] = field(default_factory=list)
+    events: Deque[Dict] = field(default_factory=deque)
     sinks: List[Callable[[Dict], None]] = field(default_factory=list)
+    record: bool = True
+    max_events: Optional[int] = DEFAULT_MAX_EVENTS
+
+    def __post_init__(self):
+        self.events = deque(self.events, maxlen=self.max_events)
 
     def push(self, name: str, **payload):
+        """Record an event; with `record=False` and no sinks nothing is allocated."""
+        if not self.record and not self.sinks:
+            return
         event_payload = {"event": name, **payload}
-        self.events.append(event_payload)
+        if self.record:
+            self.events.append(event_payload)
         for sink in self.sinks:
             sink(event_payload)
 
 
-@dataclass
+@dataclass(slots=True)
 class CallResultCollector:
     """Collect external call outcomes in a common shape."""
 
@@ -57,7 +89,7 @@ class CallResultCollector:
         return [result for result in self.results if result.get("status") == "error"]
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineContext:
     """Shared context for a run."""
 
@@ -71,15 +103,43 @@ class PipelineContext:
 
     def to_dict(self) -> Dict:
         return {
-            "parts": [p.model_dump() for p in self.parts],
-            "summaries": [s.model_dump() for s in self.summaries],
-            "questions": [q.model_dump() for q in self.questions],
-            "export_rows": [r.model_dump() for r in self.export_rows],
+            "parts": _PARTS_ADAPTER.dump_python(self.parts),
+            "summaries": _SUMMARIES_ADAPTER.dump_python(self.summaries),
+            "questions": QUESTION_LIST_ADAPTER.dump_python(self.questions),
+            "export_rows": _EXPORT_ROWS_ADAPTER.dump_python(self.export_rows),
             "events": list(self.events.events),
             "warnings": list(self.warnings),
             "call_results": list(self.call_results.results),
         }
 
+    def write_json(self, stream: BinaryIO) -> None:
+        """Stream the `to_dict()` payload as UTF-8 JSON, one item at a time.
+
+        Models go through pydantic's JSON serializer directly instead of a
+        `model_dump()` dict, so peak memory stays at a single item.
+        """
+
+        sections = (
+            ("parts", self.parts, True),
+            ("summaries", self.summaries, True),
+            ("questions", self.questions, True),
+            ("export_rows", self.export_rows, True),
+            ("events", self.events.events, False),
+            ("warnings", self.warnings, False),
+            ("call_results", self.call_results.results, False),
+        )
+        stream.write(b"{")
+        for section_idx, (key, items, is_model) in enumerate(sections):
+            if section_idx:
+                stream.write(b",")
+            stream.write(b'"' + key.encode() + b'":[')
+            for idx, item in enumerate(items):
+                if idx:
+                    stream.write(b",")
+                stream.write(item.model_dump_json().encode() if is_model else jsonutil.dumps(item))
+            stream.write(b"]")
+        stream.write(b"}")
+
 
 class PipelineRunner:
     """Coordinates PART classification → summary → question generation → export rows."""
@@ -92,6 +152,9 @@ class PipelineRunner:
         map_export_rows: Callable[[List[Question]], List[ExportRow]],
         event_sinks: Optional[List[Callable[[Dict], None]]] = None,
         call_logger: Optional[CallResultCollector] = None,
+        summarize_and_generate: Optional[
+            Callable[[List[Part]], Tuple[List[PartSummary], List[Question]]]
+        ] = None,
     ):
         self.classify_parts = classify_parts
         self.summarize_parts = summarize_parts
@@ -99,6 +162,8 @@ class PipelineRunner:
         self.map_export_rows = map_export_rows
         self.event_sinks = event_sinks or []
         self.call_logger = call_logger or CallResultCollector()
+        # Optional fused stage that overlaps per-PART summaries with question generation.
+        self.summarize_and_generate = summarize_and_generate
 
     def run(self) -> PipelineContext:
         ctx = PipelineContext(
@@ -128,6 +193,35 @@ class PipelineRunner:
         )
         ctx.warnings.extend(part_meta.get("warnings") or [])
 
+        if self.summarize_and_generate is not None:
+            questions = self._run_fused_stage(ctx)
+        else:
+            questions = self._run_staged(ctx)
+        ctx.questions = rebalance_questions(questions, ctx.parts)
+        ctx.events.push("question_generation_completed", question_count=len(ctx.questions))
+
+        ctx.export_rows = self.map_export_rows(ctx.questions)
+        ctx.events.push("export_ready", row_count=len(ctx.export_rows))
+        return ctx
+
+    def _run_fused_stage(self, ctx: PipelineContext) -> List[Question]:
+        try:
+            ctx.summaries, questions = self.summarize_and_generate(ctx.parts)
+        except Exception as exc:  # pragma: no cover - propagated
+            self.call_logger.log(
+                "llm",
+                "part_summary",
+                status="error",
+                error_code=exc.__class__.__name__,
+                message=str(exc),
+            )
+            raise
+        self.call_logger.log("llm", "part_summary", status="success")
+        ctx.events.push("part_summary_completed", token_estimates=[s.token_estimate for s in ctx.summaries])
+        self.call_logger.log("llm", "question_generation", status="success")
+        return questions
+
+    def _run_staged(self, ctx: PipelineContext) -> List[Question]:
         try:
             ctx.summaries = self.summarize_parts(ctx.parts)
             self.call_logger.log("llm", "part_summary", status="success")
@@ -154,28 +248,38 @@ class PipelineRunner:
                 message=str(exc),
             )
             raise
-        ctx.questions = rebalance_questions(questions, ctx.parts)
-        ctx.events.push("question_generation_completed", question_count=len(ctx.questions))
+        return questions
+
+    async def arun(self) -> PipelineContext:
+        """Run the pipeline from async code without blocking the event loop.
+
+        The stage callables stay synchronous (per-PART LLM calls already fan out
+        on a thread pool), so the whole run is moved to a worker thread.
+        """
+
+        return await asyncio.to_thread(self.run)
 
-        ctx.export_rows = self.map_export_rows(ctx.questions)
-        ctx.events.push("export_ready", row_count=len(ctx.export_rows))
-        return ctx
 
+def default_export_mapper(questions: Sequence[Question]) -> List[ExportRow]:
+    """Convert validated questions to ExportRow payloads.
 
-def default_export_mapper(questions: List[Question]) -> List[ExportRow]:
-    """Convert validated questions to ExportRow payloads."""
+    Each question is validated and mapped in the same pass; the first invalid
+    question raises before any rows are returned. Rows are built with
+    `model_construct` because `validate_question` has just checked their fields.
+    """
     rows: List[ExportRow] = []
     for q in questions:
         validate_question(q)
-        options = q.options if q.question_type_code == 1 else []
         rows.append(
-            ExportRow(
+            ExportRow.model_construct(
                 difficulty_code=q.difficulty_code,
                 question_type_code=q.question_type_code,
                 question_text=q.question_text,
                 explanation_text=q.explanation_text,
                 answer_code=q.answer_code,
-                options=options,
+                # Fresh lists rather than a shared empty singleton, so rows never share
+                # a mutable options list; model_dump must keep emitting lists.
+                options=list(q.options) if q.question_type_code == 1 else [],
             )
         )
     return rows
@@ -195,27 +299,72 @@ def build_default_runner(
     llm_client=None,
     question_options: Optional[QuestionGenerationOptions] = None,
     call_logger: Optional[CallResultCollector] = None,
+    semantic_cache: Optional[SemanticCache] = None,
 ) -> PipelineRunner:
-    """Wire up the pipeline with deterministic fallbacks for local runs."""
+    """Wire up the pipeline with deterministic fallbacks for local runs.
+
+    When the LLM client's cache keeps hit/miss counts (`ResponseCache`), the
+    counts for question generation are logged to the call results.
+    `semantic_cache` lets near-duplicate PART summaries share generated questions.
+    With an LLM client and no semantic cache, each PART's question request is
+    sent as soon as its summary is ready rather than after all summaries.
+    """
 
     classifier = PartClassifier(llm_client=llm_client)
     q_options = question_options or QuestionGenerationOptions()
+    call_logger = call_logger or CallResultCollector()
 
     def _classify():
         return classifier.classify(lectures)
 
     def _summaries(parts: List[Part]):
-        return summarize_parts(parts, llm_client=llm_client)
+        return summarize_parts(parts, llm_client=llm_client, max_parallel_requests=q_options.max_parallel_requests)
+
+    def _cache_stats() -> Optional[Dict[str, int]]:
+        return getattr(getattr(llm_client, "cache", None), "stats", None)
+
+    def _log_cache_stats(before: Optional[Dict[str, int]]) -> None:
+        if before is None:
+            return
+        after = _cache_stats()
+        call_logger.log(
+            "llm_cache",
+            "question_generation",
+            message=f"hits={after['hits'] - before['hits']} misses={after['misses'] - before['misses']}",
+        )
+
+    def _score(questions: List[Question]):
+        return score_questions(
+            questions,
+            llm_client=llm_client,
+            chunk_size=SCORE_CHUNK_SIZE,
+            max_prompt_tokens=SCORE_MAX_PROMPT_TOKENS,
+            max_parallel_requests=q_options.max_parallel_requests,
+        )
 
     def _generate(summaries: List[PartSummary]):
-        questions = generate_questions(summaries, q_options, llm_client=llm_client)
-        return score_questions(questions, llm_client=llm_client)
+        before = _cache_stats()
+        questions = generate_questions(summaries, q_options, llm_client=llm_client, semantic_cache=semantic_cache)
+        _log_cache_stats(before)
+        return _score(questions)
+
+    def _summarize_and_generate(parts: List[Part]):
+        before = _cache_stats()
+        summaries, questions = summarize_and_generate_llm_questions(
+            parts,
+            q_options,
+            llm_client,
+            summarize_part=lambda part: summarize_parts([part], llm_client=llm_client)[0],
+            max_parallel_requests=q_options.max_parallel_requests,
+        )
+        _log_cache_stats(before)
+        return summaries, _score(questions)
 
     def _export(questions: List[Question]):
         rows = default_export_mapper(questions)
-        ok, errors = validate_export_rows(rows)
-        if not ok:
-            raise ValidationError("; ".join(errors))
+        # Stop at the first bad row on the happy path; only spell out every error on failure.
+        if not export_rows_valid(rows):
+            raise ValidationError("; ".join(iter_export_row_errors(rows)))
         return rows
 
     return PipelineRunner(
@@ -224,4 +373,6 @@ def build_default_runner(
         generate_questions=_generate,
         map_export_rows=_export,
         call_logger=call_logger,
+        # Semantic reuse needs every summary embedded up front, so it keeps the staged path.
+        summarize_and_generate=_summarize_and_generate if llm_client and semantic_cache is None else None,
     )
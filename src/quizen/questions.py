@@ -1,12 +1,20 @@
 """Question generation helpers aligned with PRD constraints."""
 from __future__ import annotations
 
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Sequence
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
 from .distribution import minimum_distribution
-from .models import PartSummary, Question
-from .llm import LLMClient
+from .models import Part, PartSummary, Question
+from .llm import DEFAULT_FANOUT_WORKERS, LLMClient, generate_json_many
+from .llm_cache import SemanticCache, similarity, unit_vector
+
+_DIFFICULTY_CODES = frozenset({1, 2, 3, 4, 5})
+# Anything not listed here is treated as OX (3), matching the PRD default.
+_Q_TYPE_MAP = {"1": 1, "mcq": 1, "MCQ": 1, "3": 3, "ox": 3, "OX": 3}
+_ANSWER_CODES = {1: frozenset({1, 2, 3, 4}), 3: frozenset({1, 2})}
 
 
 @dataclass
@@ -15,14 +23,18 @@ class QuestionGenerationOptions:
     total_questions: int = 10
     include_mcq: bool = True
     include_ox: bool = True
+    # Upper bound on concurrent LLM calls (summaries and questions) to respect rate limits.
+    max_parallel_requests: int = DEFAULT_FANOUT_WORKERS
 
     def validate(self) -> None:
-        if self.difficulty not in {1, 2, 3, 4, 5}:
+        if self.difficulty not in _DIFFICULTY_CODES:
             raise ValueError("difficulty must be 1~5")
         if self.total_questions <= 0:
             raise ValueError("total_questions must be positive")
         if not (self.include_mcq or self.include_ox):
             raise ValueError("At least one question type must be enabled")
+        if self.max_parallel_requests <= 0:
+            raise ValueError("max_parallel_requests must be positive")
 
 
 def _pick_question_type(part_index: int, allow_mcq: bool, allow_ox: bool) -> int:
@@ -50,7 +62,8 @@ def _fallback_question(part_name: str, idx: int, q_type: int, difficulty: int) -
         choices = []
         answer_code = 1
 
-    return Question(
+    # Every field here is produced locally from validated options, so skip pydantic validation.
+    return Question.model_construct(
         difficulty_code=difficulty,
         question_type_code=q_type,
         question_text=f"{part_name}의 핵심 내용을 이해했나요? (Q{idx})",
@@ -71,26 +84,47 @@ def _normalize_llm_question(
     position: int,
 ) -> Question:
     q_type_raw = raw.get("question_type") or raw.get("question_type_code")
-    q_type = 1 if str(q_type_raw) in {"1", "mcq", "MCQ"} else 3
+    q_type = _Q_TYPE_MAP.get(str(q_type_raw), 3)
 
     difficulty = int(raw.get("difficulty_code") or default_difficulty)
     answer_code = int(raw.get("answer_code") or 1)
-    explanation = raw.get("explanation_text") or raw.get("explanation")
-    question_text = raw.get("question_text") or raw.get("question")
-    options = raw.get("options") or []
-
-    if q_type == 1 and len(options) != 4:
-        options = _build_mcq_options(part_name, position)
+    explanation = raw.get("explanation_text") or raw.get("explanation") or f"{part_name} 핵심 확인"
+    question_text = raw.get("question_text") or raw.get("question") or f"{part_name} 질문 {position}"
 
-    if q_type == 3:
+    if q_type == 1:
+        options = raw.get("options") or []
+        if not isinstance(options, list) or len(options) != 4:
+            options = _build_mcq_options(part_name, position)
+    else:
         options = []
 
+    # Common success path: the fields Question validates are checked here, so
+    # construct without running pydantic again.
+    if (
+        difficulty in _DIFFICULTY_CODES
+        and answer_code in _ANSWER_CODES[q_type]
+        and isinstance(question_text, str)
+        and isinstance(explanation, str)
+        and all(isinstance(option, str) for option in options)
+    ):
+        return Question.model_construct(
+            difficulty_code=difficulty,
+            question_type_code=q_type,
+            question_text=question_text,
+            explanation_text=explanation,
+            answer_code=answer_code,
+            options=list(options),
+            part_name=part_name,
+            validity_score=None,
+            style_violation_flags=[],
+        )
+
     try:
         return Question(
             difficulty_code=difficulty,
             question_type_code=q_type,
-            question_text=question_text or f"{part_name} 질문 {position}",
-            explanation_text=explanation or f"{part_name} 핵심 확인", 
+            question_text=question_text,
+            explanation_text=explanation,
             answer_code=answer_code,
             options=options,
             part_name=part_name,
@@ -98,6 +132,9 @@ def _normalize_llm_question(
             style_violation_flags=[],
         )
     except Exception:
+        # The LLM's difficulty may be what failed validation; fall back to the requested one.
+        if difficulty not in _DIFFICULTY_CODES:
+            difficulty = default_difficulty
         return _fallback_question(part_name, position, q_type, difficulty)
 
 
@@ -114,7 +151,8 @@ def generate_stub_questions(
     if not summaries:
         return []
 
-    part_names = [summary.part_name for summary in summaries]
+    # Interned so every Question of a PART shares one part_name object.
+    part_names = [sys.intern(summary.part_name) for summary in summaries]
     distribution = minimum_distribution(options.total_questions, list(summaries))
 
     questions: List[Question] = []
@@ -129,70 +167,193 @@ def generate_stub_questions(
     return questions
 
 
+_QUESTION_PROMPT_TEMPLATE = (
+    "당신은 교육용 문항을 작성하는 전문가입니다.\n"
+    "다음 PART 요약을 참고하여 학습자 이해도를 점검할 선다형/ OX형 문항을 만들어 주세요.\n"
+    "PART 이름: {part_name}\n"
+    "요약: {content}\n"
+    "난이도 코드: {difficulty}\n"
+    "필요 문항 수: {planned}\n"
+    "규칙:\n"
+    "- question_type_code는 1(선다형) 또는 3(OX)만 사용합니다.\n"
+    "- 선다형은 options 4개와 answer_code 1~4, OX는 options를 비워 두고 answer_code 1(O)/2(X)로 지정합니다.\n"
+    "- question_text와 explanation_text는 한국어로 간결하게 작성합니다."
+)
+
+# Shared, never mutated: only `minItems` differs between requests.
+_QUESTION_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "question_text": {"type": "string"},
+        "explanation_text": {"type": "string"},
+        "question_type_code": {"type": "integer"},
+        "difficulty_code": {"type": "integer"},
+        "answer_code": {"type": "integer"},
+        "options": {
+            "type": "array",
+            "items": {"type": "string"},
+        },
+    },
+    "required": [
+        "question_text",
+        "explanation_text",
+        "question_type_code",
+        "answer_code",
+    ],
+}
+
+
+def _llm_question_prompt(summary: PartSummary, difficulty: int, planned: int) -> str:
+    return _QUESTION_PROMPT_TEMPLATE.format(
+        part_name=summary.part_name, content=summary.content, difficulty=difficulty, planned=planned
+    )
+
+
+def _llm_question_schema(planned: int) -> dict:
+    return {
+        "type": "object",
+        "properties": {
+            "questions": {"type": "array", "items": _QUESTION_ITEM_SCHEMA, "minItems": planned},
+        },
+        "required": ["questions"],
+    }
+
+
+def _rename_part(payload: Dict[str, Any], old_name: str, new_name: str) -> Dict[str, Any]:
+    """Point a reused questions payload at another PART name."""
+
+    if old_name == new_name:
+        return payload
+    renamed = []
+    for raw_q in payload.get("questions", []):
+        raw_q = dict(raw_q)
+        for field in ("question_text", "explanation_text"):
+            if isinstance(raw_q.get(field), str):
+                raw_q[field] = raw_q[field].replace(old_name, new_name)
+        renamed.append(raw_q)
+    return {**payload, "questions": renamed}
+
+
+def _resolve_question_payloads(
+    llm_client: LLMClient,
+    plans: List[Tuple[PartSummary, int]],
+    requests: List[Tuple[str, dict]],
+    semantic_cache: SemanticCache | None,
+    max_parallel_requests: int = DEFAULT_FANOUT_WORKERS,
+) -> List[Dict[str, Any] | Exception | None]:
+    """Share payloads between near-duplicate PARTs where possible and fan out the rest.
+
+    Exact repeats are answered by the client's own response cache (`LLMClient(cache=...)`).
+    """
+
+    results: List[Dict[str, Any] | Exception | None] = [None] * len(requests)
+    pending = list(range(len(requests)))
+
+    vectors: Dict[int, Tuple[float, ...]] = {}
+    followers: Dict[int, int] = {}
+    embed = getattr(llm_client, "embed", None) if semantic_cache is not None else None
+    if embed is not None and pending:
+        try:
+            # One batched embedding call for every pending summary.
+            embedded = embed([plans[idx][0].content for idx in pending])
+        except Exception:  # noqa: BLE001 - semantic reuse is best effort
+            embedded = None
+        if embedded is not None:
+            leaders: List[int] = []
+            for idx, values in zip(pending, embedded):
+                vector = vectors[idx] = unit_vector(values)
+                summary, planned = plans[idx]
+                hit = semantic_cache.lookup(vector)
+                if hit is not None and len(hit[0].get("questions", [])) >= planned:
+                    results[idx] = _rename_part(hit[0], hit[1], summary.part_name)
+                    continue
+                leader = next(
+                    (
+                        j
+                        for j in leaders
+                        if plans[j][1] >= planned and similarity(vector, vectors[j]) >= semantic_cache.threshold
+                    ),
+                    None,
+                )
+                if leader is None:
+                    leaders.append(idx)
+                else:
+                    followers[idx] = leader
+            pending = leaders
+
+    fetched = generate_json_many(
+        llm_client, [requests[idx] for idx in pending], max_workers=max_parallel_requests
+    )
+    for idx, result in zip(pending, fetched):
+        results[idx] = result
+        if isinstance(result, dict) and idx in vectors:
+            semantic_cache.add(vectors[idx], result, plans[idx][0].part_name)
+    for idx, leader in followers.items():
+        result = results[leader]
+        if isinstance(result, dict):
+            result = _rename_part(result, plans[leader][0].part_name, plans[idx][0].part_name)
+        results[idx] = result
+    return results
+
+
 def generate_llm_questions(
-    summaries: Sequence[PartSummary], options: QuestionGenerationOptions, llm_client: LLMClient
+    summaries: Sequence[PartSummary],
+    options: QuestionGenerationOptions,
+    llm_client: LLMClient,
+    semantic_cache: SemanticCache | None = None,
+    max_parallel_requests: int = DEFAULT_FANOUT_WORKERS,
 ) -> List[Question]:
-    """Generate questions via LLM with schema validation and deterministic fallback."""
+    """Generate questions via LLM with schema validation and deterministic fallback.
+
+    Per-PART requests are issued concurrently, at most `max_parallel_requests`
+    at a time to stay within Gemini rate limits; results are consumed in PART
+    order so numbering and fallbacks match a sequential run. With a
+    `semantic_cache` and a client that can `embed`, PARTs whose summaries are
+    near-duplicates share one request.
+    """
 
     options.validate()
     if not summaries:
         return []
 
-    part_names = [summary.part_name for summary in summaries]
+    plans, requests = _plan_question_requests(summaries, options)
+    results = _resolve_question_payloads(
+        llm_client, plans, requests, semantic_cache, max_parallel_requests=max_parallel_requests
+    )
+
+    return _questions_from_payloads(plans, results, options)
+
+
+def _plan_question_requests(
+    summaries: Sequence[PartSummary], options: QuestionGenerationOptions
+) -> Tuple[List[Tuple[PartSummary, int]], List[Tuple[str, dict]]]:
+    """Per-PART question counts (PARTs with none dropped) and their LLM requests."""
+
     distribution = minimum_distribution(options.total_questions, list(summaries))
+    plans = [
+        (summary, distribution.get(summary.part_name, 0))
+        for summary in summaries
+        if distribution.get(summary.part_name, 0) > 0
+    ]
+    requests = [
+        (_llm_question_prompt(summary, options.difficulty, planned), _llm_question_schema(planned))
+        for summary, planned in plans
+    ]
+    return plans, requests
 
-    questions: List[Question] = []
-    counter = 1
-    for summary in summaries:
-        planned = distribution.get(summary.part_name, 0)
-        if planned <= 0:
-            continue
 
-        prompt = (
-            "당신은 교육용 문항을 작성하는 전문가입니다.\n"
-            "다음 PART 요약을 참고하여 학습자 이해도를 점검할 선다형/ OX형 문항을 만들어 주세요.\n"
-            f"PART 이름: {summary.part_name}\n"
-            f"요약: {summary.content}\n"
-            f"난이도 코드: {options.difficulty}\n"
-            f"필요 문항 수: {planned}\n"
-            "규칙:\n"
-            "- question_type_code는 1(선다형) 또는 3(OX)만 사용합니다.\n"
-            "- 선다형은 options 4개와 answer_code 1~4, OX는 options를 비워 두고 answer_code 1(O)/2(X)로 지정합니다.\n"
-            "- question_text와 explanation_text는 한국어로 간결하게 작성합니다."
-        )
-        schema = {
-            "type": "object",
-            "properties": {
-                "questions": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "question_text": {"type": "string"},
-                            "explanation_text": {"type": "string"},
-                            "question_type_code": {"type": "integer"},
-                            "difficulty_code": {"type": "integer"},
-                            "answer_code": {"type": "integer"},
-                            "options": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                            },
-                        },
-                        "required": [
-                            "question_text",
-                            "explanation_text",
-                            "question_type_code",
-                            "answer_code",
-                        ],
-                    },
-                    "minItems": planned,
-                }
-            },
-            "required": ["questions"],
-        }
+def _questions_from_payloads(
+    plans: Sequence[Tuple[PartSummary, int]],
+    results: Sequence[Dict[str, Any] | BaseException | None],
+    options: QuestionGenerationOptions,
+) -> List[Question]:
+    """Normalize per-PART payloads in PART order, falling back where a payload is unusable."""
 
+    questions: List[Question] = []
+    counter = 1
+    for (summary, planned), result in zip(plans, results):
+        part_name = sys.intern(summary.part_name)
         try:
-            result = llm_client.generate_json(prompt, schema)
             payload_questions = list(result.get("questions", []))
         except Exception:
             payload_questions = []
@@ -200,7 +361,7 @@ def generate_llm_questions(
         if not payload_questions:
             for _ in range(planned):
                 q_type = _pick_question_type(counter, options.include_mcq, options.include_ox)
-                questions.append(_fallback_question(summary.part_name, counter, q_type, options.difficulty))
+                questions.append(_fallback_question(part_name, counter, q_type, options.difficulty))
                 counter += 1
             continue
 
@@ -214,23 +375,79 @@ def generate_llm_questions(
             normalized_raw = dict(raw_q)
             normalized_raw["question_type_code"] = q_type
 
-            question = _normalize_llm_question(
-                normalized_raw,
-                part_name=summary.part_name,
-                default_difficulty=options.difficulty,
-                position=counter,
+            questions.append(
+                _normalize_llm_question(
+                    normalized_raw,
+                    part_name=part_name,
+                    default_difficulty=options.difficulty,
+                    position=counter,
+                )
             )
-            questions.append(question)
             counter += 1
 
     return questions
 
 
+def summarize_and_generate_llm_questions(
+    parts: Sequence[Part],
+    options: QuestionGenerationOptions,
+    llm_client: LLMClient,
+    summarize_part: Callable[[Part], PartSummary],
+    max_parallel_requests: int = DEFAULT_FANOUT_WORKERS,
+) -> Tuple[List[PartSummary], List[Question]]:
+    """Summarize each PART and immediately request its questions.
+
+    Each PART runs as its own summary → questions chain on a thread pool, so
+    question generation for one PART overlaps with summaries of the others
+    instead of waiting for every summary. Summaries and questions come back in
+    PART order with the same numbering and fallbacks as `generate_llm_questions`.
+    """
+
+    options.validate()
+    if not parts:
+        return [], []
+    distribution = minimum_distribution(options.total_questions, list(parts))
+
+    def _chain(part: Part) -> Tuple[PartSummary, Dict[str, Any] | Exception | None]:
+        summary = summarize_part(part)
+        planned = distribution.get(part.part_name, 0)
+        if planned <= 0:
+            return summary, None
+        request = (_llm_question_prompt(summary, options.difficulty, planned), _llm_question_schema(planned))
+        return summary, _resolve_question_payloads(
+            llm_client, [(summary, planned)], [request], None, max_parallel_requests=1
+        )[0]
+
+    if len(parts) <= 1 or max_parallel_requests <= 1:
+        outcomes = [_chain(part) for part in parts]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_parallel_requests, len(parts))) as executor:
+            outcomes = list(executor.map(_chain, parts))
+
+    summaries = [summary for summary, _ in outcomes]
+    plans = [
+        (summary, distribution[summary.part_name])
+        for summary, _ in outcomes
+        if distribution.get(summary.part_name, 0) > 0
+    ]
+    results = [result for summary, result in outcomes if distribution.get(summary.part_name, 0) > 0]
+    return summaries, _questions_from_payloads(plans, results, options)
+
+
 def generate_questions(
-    summaries: Sequence[PartSummary], options: QuestionGenerationOptions, llm_client: LLMClient | None = None
+    summaries: Sequence[PartSummary],
+    options: QuestionGenerationOptions,
+    llm_client: LLMClient | None = None,
+    semantic_cache: SemanticCache | None = None,
 ) -> List[Question]:
     """Primary entry point for question generation with optional LLM support."""
 
     if llm_client:
-        return generate_llm_questions(summaries, options, llm_client)
+        return generate_llm_questions(
+            summaries,
+            options,
+            llm_client,
+            semantic_cache=semantic_cache,
+            max_parallel_requests=options.max_parallel_requests,
+        )
     return generate_stub_questions(summaries, options)
@@ -2,23 +2,47 @@
 from __future__ import annotations
 
 import json
+from collections import defaultdict
 from statistics import mean
 from pathlib import Path
-from typing import Dict, List, Sequence
+from typing import Dict, Iterator, List, Sequence
 
 from .models import Part, Question
+from .scoring import THRESHOLD_FLAG
 from .storage import JsonStorage
 
+# Question codes are tiny ints; index into prebuilt strings instead of calling str().
+_SMALL_INT_STR = tuple(str(i) for i in range(16))
 
-def _part_score_distribution(parts: Sequence[Part], questions: Sequence[Question]) -> List[Dict]:
-    """Aggregate validity score ranges per PART."""
+
+def _code_str(value: int) -> str:
+    return _SMALL_INT_STR[value] if 0 <= value < 16 else str(value)
+
+
+def part_score_distribution(parts: Sequence[Part], questions: Sequence[Question]) -> List[Dict]:
+    """Aggregate validity score ranges per PART.
+
+    Compute it once and pass it as `distribution=` to the meta sheet and meta
+    report builders when both are needed for the same run.
+    """
+
+    by_part: Dict[str, List[Question]] = defaultdict(list)
+    for q in questions:
+        by_part[q.part_name].append(q)
 
     distribution: List[Dict] = []
     for part in parts:
-        part_questions = [q for q in questions if q.part_name == part.part_name]
-        scores = [q.validity_score for q in part_questions if q.validity_score is not None]
-        below_threshold = sum("below_threshold" in (q.style_violation_flags or []) for q in part_questions)
-
+        part_questions = by_part.get(part.part_name, ())
+        scores: List[float] = []
+        below_threshold = 0
+        for q in part_questions:
+            if q.validity_score is not None:
+                scores.append(q.validity_score)
+            if q.style_violation_flags and THRESHOLD_FLAG in q.style_violation_flags:
+                below_threshold += 1
+
+        # statistics.mean keeps integer scores integral ("82", not "82.0") in the
+        # meta sheet; per-PART lists are at most a few dozen items.
         distribution.append(
             {
                 "part_name": part.part_name,
@@ -32,71 +56,89 @@ def _part_score_distribution(parts: Sequence[Part], questions: Sequence[Question
     return distribution
 
 
-def build_meta_sheet_rows(
+def iter_meta_sheet_rows(
     parts: List[Part],
     questions: List[Question],
     *,
     events: Sequence[Dict] | None = None,
     warnings: Sequence[str] | None = None,
     call_results: Sequence[Dict] | None = None,
-) -> List[List[str]]:
-    """Create rows for an optional `quizen_meta` tab with richer diagnostics."""
+    distribution: Sequence[Dict] | None = None,
+) -> Iterator[List[str]]:
+    """Yield rows for an optional `quizen_meta` tab with richer diagnostics."""
 
-    rows: List[List[str]] = [["part_code", "part_title", "lecture_count", "lecture_ids"]]
+    yield ["part_code", "part_title", "lecture_count", "lecture_ids"]
     for part in parts:
-        lecture_ids = ", ".join(part.lecture_ids)
-        rows.append([part.part_code, part.part_title, str(len(part.lecture_ids)), lecture_ids])
+        yield [part.part_code, part.part_title, str(len(part.lecture_ids)), ", ".join(part.lecture_ids)]
 
-    rows.append([])
-    rows.append(["#", "part_name", "question_type_code", "difficulty_code", "answer_code"])
+    yield []
+    yield ["#", "part_name", "question_type_code", "difficulty_code", "answer_code"]
     for idx, question in enumerate(questions, start=1):
-        rows.append(
-            [
-                str(idx),
-                question.part_name,
-                str(question.question_type_code),
-                str(question.difficulty_code),
-                str(question.answer_code),
-            ]
-        )
-
-    rows.append([])
-    rows.append(["pipeline_event", "payload"])
+        yield [
+            str(idx),
+            question.part_name,
+            _code_str(question.question_type_code),
+            _code_str(question.difficulty_code),
+            _code_str(question.answer_code),
+        ]
+
+    yield []
+    yield ["pipeline_event", "payload"]
     for event in events or []:
-        rows.append([event.get("event", ""), json.dumps(event, ensure_ascii=False)])
-
-    rows.append([])
-    rows.append(["part_name", "question_count", "average_score", "min_score", "max_score", "below_threshold"])
-    for stat in _part_score_distribution(parts, questions):
-        rows.append(
-            [
-                stat["part_name"],
-                str(stat["question_count"]),
-                "" if stat["average_score"] is None else str(stat["average_score"]),
-                "" if stat["min_score"] is None else str(stat["min_score"]),
-                "" if stat["max_score"] is None else str(stat["max_score"]),
-                str(stat["below_threshold"]),
-            ]
-        )
-
-    rows.append([])
-    rows.append(["warning"])
+        yield [event.get("event", ""), json.dumps(event, ensure_ascii=False)]
+
+    yield []
+    yield ["part_name", "question_count", "average_score", "min_score", "max_score", "below_threshold"]
+    if distribution is None:
+        distribution = part_score_distribution(parts, questions)
+    for stat in distribution:
+        yield [
+            stat["part_name"],
+            str(stat["question_count"]),
+            "" if stat["average_score"] is None else str(stat["average_score"]),
+            "" if stat["min_score"] is None else str(stat["min_score"]),
+            "" if stat["max_score"] is None else str(stat["max_score"]),
+            str(stat["below_threshold"]),
+        ]
+
+    yield []
+    yield ["warning"]
     for warning in warnings or []:
-        rows.append([warning])
+        yield [warning]
 
-    rows.append([])
-    rows.append(["service", "operation", "status", "error_code", "message"])
+    yield []
+    yield ["service", "operation", "status", "error_code", "message"]
     for result in call_results or []:
-        rows.append(
-            [
-                result.get("service", ""),
-                result.get("operation", ""),
-                result.get("status", ""),
-                result.get("error_code", ""),
-                result.get("message", ""),
-            ]
+        yield [
+            result.get("service", ""),
+            result.get("operation", ""),
+            result.get("status", ""),
+            result.get("error_code", ""),
+            result.get("message", ""),
+        ]
+
+
+def build_meta_sheet_rows(
+    parts: List[Part],
+    questions: List[Question],
+    *,
+    events: Sequence[Dict] | None = None,
+    warnings: Sequence[str] | None = None,
+    call_results: Sequence[Dict] | None = None,
+    distribution: Sequence[Dict] | None = None,
+) -> List[List[str]]:
+    """Create rows for an optional `quizen_meta` tab with richer diagnostics."""
+
+    return list(
+        iter_meta_sheet_rows(
+            parts,
+            questions,
+            events=events,
+            warnings=warnings,
+            call_results=call_results,
+            distribution=distribution,
         )
-    return rows
+    )
 
 
 def persist_run(storage: JsonStorage, run_id: str, payload: Dict) -> Path:
@@ -112,14 +154,16 @@ def build_meta_report(
     events: Sequence[Dict] | None = None,
     warnings: Sequence[str] | None = None,
     call_results: Sequence[Dict] | None = None,
+    distribution: Sequence[Dict] | None = None,
 ) -> Dict:
     """Structured payload for file logging and API responses."""
 
-    distribution = _part_score_distribution(parts, questions)
+    if distribution is None:
+        distribution = part_score_distribution(parts, questions)
     return {
         "events": list(events or []),
         "warnings": list(warnings or []),
-        "part_score_distribution": distribution,
+        "part_score_distribution": list(distribution),
         "call_results": list(call_results or []),
         "failed_calls": [result for result in call_results or [] if result.get("status") == "error"],
     }
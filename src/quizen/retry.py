@@ -0,0 +1,38 @@
+"""Shared backoff helpers for LLM and Google API retry loops."""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+
+def backoff_delays(backoff_factor: float, retries: int, *, jitter: bool = False) -> Tuple[float, ...]:
+    """Precompute exponential delays `factor * 2**i` for each retry.
+
+    With `jitter`, each delay is scaled by a random factor in [0.5, 1.5) so that
+    concurrent callers failing together do not retry in lockstep.
+    """
+
+    if jitter:
+        return tuple(backoff_factor * (1 << i) * (0.5 + random.random()) for i in range(max(0, retries)))
+    return tuple(backoff_factor * (1 << i) for i in range(max(0, retries)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a `Retry-After` header given as delta-seconds or an HTTP date."""
+
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -9,13 +9,17 @@ from .models import Lecture
 from .parsing import parse_filename
 from .pipeline import CallResultCollector, PipelineContext, build_default_runner
 from .questions import QuestionGenerationOptions
-from .reporting import build_meta_report, build_meta_sheet_rows
+from .reporting import build_meta_report, iter_meta_sheet_rows, part_score_distribution
 
 
 def build_lectures_from_drive(drive: DriveClient, folder_id: str) -> Tuple[List[Lecture], List[str]]:
-    """List SRT files in a Drive folder and parse them into Lecture models."""
+    """List SRT files in a Drive folder and parse them into Lecture models.
 
-    files = drive.list_srt_files(folder_id)
+    Files are parsed as Drive pages arrive when the client offers `iter_srt_files`.
+    """
+
+    iter_files = getattr(drive, "iter_srt_files", None)
+    files = iter_files(folder_id) if iter_files is not None else drive.list_srt_files(folder_id)
     lectures: List[Lecture] = []
     warnings: List[str] = []
 
@@ -45,8 +49,14 @@ def run_drive_to_sheet(
     sheet_name: str = "Sheet1",
     write_meta_sheet: bool = True,
     meta_sheet_name: str = "quizen_meta",
+    batch_meta_sheet: bool = False,
 ) -> Dict:
-    """End-to-end helper: Drive SRT ingest → pipeline → Sheets export."""
+    """End-to-end helper: Drive SRT ingest → pipeline → Sheets export.
+
+    With `batch_meta_sheet`, the meta rows join the export's `values.batchUpdate`
+    (written from `A1` of the meta tab) instead of a separate append, saving the
+    extra round trips when the template's meta tab starts empty.
+    """
 
     if (drive_client is None or sheets_client is None) and credentials_path is None:
         raise ValueError("credentials_path is required when clients are not provided")
@@ -103,8 +113,27 @@ def run_drive_to_sheet(
         )
         raise
 
+    distribution = part_score_distribution(ctx.parts, ctx.questions)
+    meta_rows = None
+    if write_meta_sheet:
+        meta_rows = iter_meta_sheet_rows(
+            ctx.parts,
+            ctx.questions,
+            events=ctx.events.events,
+            warnings=warnings + ctx.warnings,
+            call_results=ctx.call_results.results,
+            distribution=distribution,
+        )
+
     try:
-        sheets.write_export_rows(new_sheet_id, ctx.export_rows, sheet_name=sheet_name)
+        if meta_rows is not None and batch_meta_sheet:
+            meta_range = sheets.meta_value_range(meta_sheet_name, list(meta_rows))
+            sheets.write_export_rows(
+                new_sheet_id, ctx.export_rows, sheet_name=sheet_name, extra_ranges=[meta_range]
+            )
+            meta_rows = None
+        else:
+            sheets.write_export_rows(new_sheet_id, ctx.export_rows, sheet_name=sheet_name)
         call_logger.log("sheets", "write_export_rows", status="success")
     except Exception as exc:  # pragma: no cover - propagated
         call_logger.log(
@@ -116,14 +145,7 @@ def run_drive_to_sheet(
         )
         raise
 
-    if write_meta_sheet:
-        meta_rows = build_meta_sheet_rows(
-            ctx.parts,
-            ctx.questions,
-            events=ctx.events.events,
-            warnings=warnings + ctx.warnings,
-            call_results=ctx.call_results.results,
-        )
+    if meta_rows is not None:
         sheets.append_meta_sheet(new_sheet_id, sheet_name=meta_sheet_name, rows=meta_rows)
         call_logger.log("sheets", "append_meta_sheet", status="success")
 
@@ -133,13 +155,14 @@ def run_drive_to_sheet(
         events=ctx.events.events,
         warnings=warnings + ctx.warnings,
         call_results=ctx.call_results.results,
+        distribution=distribution,
     )
 
     return {
         "sheet_id": new_sheet_id,
         "question_count": len(ctx.export_rows),
         "warnings": warnings + ctx.warnings,
-        "events": ctx.events.events,
+        "events": list(ctx.events.events),
         "call_results": ctx.call_results.results,
         "call_failures": ctx.call_results.failures,
         "meta_report": meta_report,
@@ -1,36 +1,56 @@
 """Validity scoring utilities for questions."""
 from __future__ import annotations
 
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
+from .llm import DEFAULT_FANOUT_WORKERS, generate_json_many
 from .models import Question
 
 THRESHOLD_FLAG = "below_threshold"
+# Questions per rubric prompt when the pipeline shards scoring across requests.
+SCORE_CHUNK_SIZE = 20
+# Rough per-prompt budget (whitespace tokens, as in PartSummary.token_estimate).
+SCORE_MAX_PROMPT_TOKENS = 3000
+# str.endswith with a tuple is already a C-level check of just the tail. An
+# anchored regex such as `(?:습니다|...)\s*\Z` has to scan from the start of
+# the string and is ~3x slower on paragraph-length explanations, so the suffix
+# checks deliberately stay as endswith calls.
+_POLITE_ENDINGS = ("습니다", "합니다", "하십시오", "합니까", "입니까")
+# question_type_code -> (required question_text suffix, flag when it is missing)
+_QUESTION_STYLE = {1: ("시오.", "mcq_prompt_style"), 3: ("다.", "ox_tone")}
 
 def _detect_style_flags(question: Question) -> list[str]:
     flags: list[str] = []
-    polite_endings = ("습니다", "합니다", "하십시오", "합니까", "입니까")
-    if question.question_type_code == 1 and not question.question_text.endswith("시오."):
-        flags.append("mcq_prompt_style")
-    if question.question_type_code == 3 and not question.question_text.endswith("다."):
-        flags.append("ox_tone")
-    if question.explanation_text and not question.explanation_text.rstrip().endswith(polite_endings):
-        flags.append("explanation_tone")
+    style = _QUESTION_STYLE.get(question.question_type_code)
+    if style is not None and not question.question_text.endswith(style[0]):
+        flags.append(style[1])
+    explanation = question.explanation_text
+    if explanation:
+        # Check the suffix up to the last non-space character without an rstrip() copy.
+        end = len(explanation)
+        while end and explanation[end - 1].isspace():
+            end -= 1
+        if not explanation.endswith(_POLITE_ENDINGS, 0, end):
+            flags.append("explanation_tone")
     return flags
 
+_RUBRIC_HEADER = (
+    "당신은 교육용 문항을 평가하는 심사위원입니다.\n"
+    "각 문항을 0~100 사이 점수로 평가하고, 문제 유형이나 표현상의 이슈 태그, 개선 문장을 제시하세요.\n"
+    "응답은 JSON으로 반환하세요."
+)
+
+
+def _rubric_entry(idx: int, q: Question) -> str:
+    options = " | ".join(q.options) if q.options else "(OX)"
+    return f"[{idx}] {q.part_name}\n문항: {q.question_text}\n해설: {q.explanation_text}\n선지/정답: {options} / {q.answer_code}"
+
+
 def _build_rubric_prompt(questions: Sequence[Question]) -> str:
-    entries = []
-    for idx, q in enumerate(questions, start=1):
-        options = " | ".join(q.options) if q.options else "(OX)"
-        entries.append(
-            f"[{idx}] {q.part_name}\n문항: {q.question_text}\n해설: {q.explanation_text}\n선지/정답: {options} / {q.answer_code}"
-        )
-    rubric = (
-        "당신은 교육용 문항을 평가하는 심사위원입니다.\n"
-        "각 문항을 0~100 사이 점수로 평가하고, 문제 유형이나 표현상의 이슈 태그, 개선 문장을 제시하세요.\n"
-        "응답은 JSON으로 반환하세요."
+    # The header is a constant and the entries go straight into one join.
+    return _RUBRIC_HEADER + "\n\n" + "\n\n".join(
+        _rubric_entry(idx, q) for idx, q in enumerate(questions, start=1)
     )
-    return f"{rubric}\n\n" + "\n\n".join(entries)
 
 
 def _assign_scores_from_payload(
@@ -51,8 +71,80 @@ def _assign_scores_from_payload(
     return questions
 
 
+_RUBRIC_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scores": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "total_score": {"type": "number"},
+                    "issue_tags": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                    },
+                    "improvement": {"type": "string"},
+                },
+                "required": ["total_score"],
+            },
+        }
+    },
+    "required": ["scores"],
+}
+
+
+def _estimate_tokens(question: Question) -> int:
+    return (
+        len(question.question_text.split())
+        + len(question.explanation_text.split())
+        + sum(len(option.split()) for option in question.options)
+    )
+
+
+def _chunk_questions(
+    questions: List[Question], chunk_size: Optional[int], max_tokens: Optional[int]
+) -> List[List[Question]]:
+    """Split questions into rubric chunks capped by count and estimated tokens."""
+
+    if not chunk_size and not max_tokens:
+        return [questions]
+    chunks: List[List[Question]] = []
+    current: List[Question] = []
+    tokens = 0
+    for question in questions:
+        cost = _estimate_tokens(question) if max_tokens else 0
+        if current and (
+            (chunk_size and len(current) >= chunk_size) or (max_tokens and tokens + cost > max_tokens)
+        ):
+            chunks.append(current)
+            current, tokens = [], 0
+        current.append(question)
+        tokens += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _assign_heuristic_scores(questions: Sequence[Question], detect_style: bool) -> None:
+    for question in questions:
+        base = 80.0 if question.question_type_code == 3 else 85.0
+        # Each question gets its own list: callers append flags in place later.
+        style_flags = _detect_style_flags(question) if detect_style else []
+        if style_flags:
+            base -= 5
+
+        question.validity_score = base
+        question.style_violation_flags = style_flags
+
+
 def score_questions(
-    questions: List[Question], llm_client=None, threshold: float = 75.0
+    questions: List[Question],
+    llm_client=None,
+    threshold: float = 75.0,
+    chunk_size: Optional[int] = None,
+    max_prompt_tokens: Optional[int] = None,
+    max_parallel_requests: int = DEFAULT_FANOUT_WORKERS,
 ) -> List[Question]:
     """Assign validity scores via LLM rubric when available.
 
@@ -60,55 +152,33 @@ def score_questions(
     raises an error. When an LLM score falls below ``threshold``, a
     ``below_threshold`` flag is added to ``style_violation_flags`` to aid
     downstream filtering.
-    """
 
-    fallback_from_llm_error = False
-
-    if llm_client:
-        schema = {
-            "type": "object",
-            "properties": {
-                "scores": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "total_score": {"type": "number"},
-                            "issue_tags": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                            },
-                            "improvement": {"type": "string"},
-                        },
-                        "required": ["total_score"],
-                    },
-                }
-            },
-            "required": ["scores"],
-        }
-
-        try:
-            prompt = _build_rubric_prompt(questions)
-            payload = llm_client.generate_json(prompt, schema)
-            return _assign_scores_from_payload(questions, payload, threshold)
-        except Exception:
-            # Fall through to deterministic scoring
-            fallback_from_llm_error = True
+    With ``chunk_size`` and/or ``max_prompt_tokens``, the rubric is split into
+    prompts of at most that many questions / estimated tokens which are sent
+    concurrently; a failed chunk falls back on its own.
+    """
 
-    for question in questions:
-        base = 85.0
-        style_flags: list[str] = []
+    if not llm_client:
+        _assign_heuristic_scores(questions, detect_style=True)
+        return questions
 
-        if question.question_type_code == 3:
-            base = 80.0
+    if not questions:
+        return questions
+    chunks = _chunk_questions(questions, chunk_size, max_prompt_tokens)
 
-        # If we were supposed to use an LLM but failed, keep the deterministic
-        # fallback simple (no style deductions) to mirror the previous baseline.
-        if not fallback_from_llm_error:
-            style_flags = _detect_style_flags(question)
-            if style_flags:
-                base -= 5
+    results = generate_json_many(
+        llm_client,
+        [(_build_rubric_prompt(chunk), _RUBRIC_SCHEMA) for chunk in chunks],
+        max_workers=max_parallel_requests,
+    )
 
-        question.validity_score = base
-        question.style_violation_flags = style_flags
+    for chunk, payload in zip(chunks, results):
+        try:
+            if isinstance(payload, Exception):
+                raise payload
+            _assign_scores_from_payload(chunk, payload, threshold)
+        except Exception:
+            # If we were supposed to use an LLM but failed, keep the deterministic
+            # fallback simple (no style deductions) to mirror the previous baseline.
+            _assign_heuristic_scores(chunk, detect_style=False)
     return questions
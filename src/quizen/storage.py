@@ -1,25 +1,193 @@
 """Simple JSON storage for pipeline artifacts (placeholder for DB)."""
 from __future__ import annotations
 
-import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import jsonutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUN_CACHE_SIZE = 64
+# Patches appended to a run's log before it is folded back into the snapshot.
+SNAPSHOT_EVERY = 50
+# Run ids hash onto a fixed pool of write locks so the pool never grows.
+RUN_LOCK_STRIPES = 64
+
+_Signature = Tuple[int, int, Optional[Tuple[int, int]]]
+
+
+def _apply_patch(payload: Dict[str, Any], patch: Dict[str, Any]) -> None:
+    target: Any = payload
+    path = patch["path"]
+    for key in path[:-1]:
+        target = target[key]
+    target[path[-1]] = patch["value"]
+
+
+def _intern_part_names(payload: Dict[str, Any]) -> None:
+    """Share one string per PART name; decoding otherwise yields a copy per question."""
+
+    questions = payload.get("questions")
+    if not isinstance(questions, list):
+        return
+    for q in questions:
+        if isinstance(q, dict) and isinstance(q.get("part_name"), str):
+            q["part_name"] = sys.intern(q["part_name"])
 
 
 class JsonStorage:
-    """Persist run context to a JSON file for later retrieval."""
+    """Persist run context to a JSON file for later retrieval.
+
+    `save` writes a full snapshot; `save_patch` appends a single change to the
+    run's `.log` file (one JSON line per patch) and `load` replays it on top of
+    the snapshot. Every `SNAPSHOT_EVERY` patches the log is folded back into a
+    new snapshot.
+
+    Parsed runs are kept in a small LRU keyed by run id and validated against
+    the files' `(mtime_ns, size)`, so repeated reads skip the disk and JSON
+    decode. Loaded payloads are shared with the cache and must be treated as
+    read-only: callers change a run by saving an updated copy.
+
+    Writes to a run are serialized by a lock striped on its run id, and
+    snapshots are replaced atomically before the patch log they absorb is
+    removed.
+    """
 
-    def __init__(self, root: Path):
+    def __init__(self, root: Path, cache_size: int = DEFAULT_RUN_CACHE_SIZE):
         self.root = root
         self.root.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[_Signature, Dict[str, Any], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._run_locks = [threading.RLock() for _ in range(RUN_LOCK_STRIPES)]
+
+    def _run_lock(self, run_id: str) -> threading.RLock:
+        return self._run_locks[hash(run_id) % len(self._run_locks)]
+
+    def _snapshot_path(self, run_id: str) -> Path:
+        return self.root / f"{run_id}.json"
+
+    def _log_path(self, run_id: str) -> Path:
+        return self.root / f"{run_id}.log"
+
+    def _signature(self, run_id: str) -> _Signature:
+        stat = self._snapshot_path(run_id).stat()
+        try:
+            log_stat = self._log_path(run_id).stat()
+        except FileNotFoundError:
+            log = None
+        else:
+            log = (log_stat.st_mtime_ns, log_stat.st_size)
+        return (stat.st_mtime_ns, stat.st_size, log)
+
+    def version(self, run_id: str) -> str:
+        """Opaque token that changes whenever the run's snapshot or patch log does."""
+
+        try:
+            snapshot_mtime, snapshot_size, log = self._signature(run_id)
+        except FileNotFoundError:
+            raise FileNotFoundError(run_id) from None
+        log_mtime, log_size = log or (0, 0)
+        return f"{snapshot_mtime:x}-{snapshot_size:x}-{log_mtime:x}-{log_size:x}"
 
     def save(self, run_id: str, payload: Dict[str, Any]) -> Path:
-        path = self.root / f"{run_id}.json"
-        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2))
+        path = self._snapshot_path(run_id)
+        data = jsonutil.dumps(payload, indent=True, default=jsonutil.encode_default)
+        with self._run_lock(run_id):
+            # Write to a sibling temp file and rename so a crash never leaves a partial snapshot.
+            fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=f".{run_id}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+            self._log_path(run_id).unlink(missing_ok=True)
+            self._remember(run_id, payload, 0)
         return path
 
+    def save_patch(self, run_id: str, payload: Dict[str, Any], path: Sequence[Any], value: Any) -> None:
+        """Record that `payload[path...] = value` without rewriting the snapshot.
+
+        `payload` is the caller's already-updated copy of the run; it replaces the cached one.
+        """
+
+        line = jsonutil.dumps({"path": list(path), "value": value}, default=jsonutil.encode_default) + b"\n"
+        with self._run_lock(run_id):
+            with self._lock:
+                cached = self._cache.get(run_id)
+            # The cached count is current unless the files changed behind this instance.
+            if cached is not None and cached[0] == self._signature(run_id):
+                pending = cached[2] + 1
+            else:
+                pending = self._count_log_entries(run_id) + 1
+            if pending >= SNAPSHOT_EVERY:
+                self.save(run_id, payload)
+                return
+            with self._log_path(run_id).open("ab") as handle:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+            self._remember(run_id, payload, pending)
+
     def load(self, run_id: str) -> Dict[str, Any]:
-        path = self.root / f"{run_id}.json"
-        if not path.exists():
-            raise FileNotFoundError(run_id)
-        return json.loads(path.read_text())
+        try:
+            signature = self._signature(run_id)
+        except FileNotFoundError:
+            raise FileNotFoundError(run_id) from None
+        with self._lock:
+            cached = self._cache.get(run_id)
+            if cached is not None and cached[0] == signature:
+                self._cache.move_to_end(run_id)
+                return cached[1]
+        with self._run_lock(run_id):
+            payload = jsonutil.loads(self._snapshot_path(run_id).read_bytes())
+            patches = self._read_log(run_id)
+            for patch in patches:
+                _apply_patch(payload, patch)
+            _intern_part_names(payload)
+            self._remember(run_id, payload, len(patches))
+        return payload
+
+    def _read_log(self, run_id: str) -> List[Dict[str, Any]]:
+        try:
+            data = self._log_path(run_id).read_bytes()
+        except FileNotFoundError:
+            return []
+        lines = data.split(b"\n")
+        # A crash mid-append can leave a final line without its newline; drop it.
+        if lines[-1]:
+            logger.warning("Ignoring incomplete trailing patch in %s", self._log_path(run_id))
+        patches = []
+        for line in lines[:-1]:
+            if not line:
+                continue
+            try:
+                patches.append(jsonutil.loads(line))
+            except ValueError:
+                logger.warning("Ignoring undecodable patch in %s", self._log_path(run_id))
+        return patches
+
+    def _count_log_entries(self, run_id: str) -> int:
+        try:
+            return self._log_path(run_id).read_bytes().count(b"\n")
+        except FileNotFoundError:
+            return 0
+
+    def _remember(self, run_id: str, payload: Dict[str, Any], log_entries: int) -> None:
+        if self.cache_size <= 0:
+            return
+        signature = self._signature(run_id)
+        with self._lock:
+            self._cache[run_id] = (signature, payload, log_entries)
+            self._cache.move_to_end(run_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
@@ -1,44 +1,59 @@
 """PART summary generation helpers."""
 from __future__ import annotations
 
-from typing import List, Sequence
+from typing import Any, List, Sequence
 
-from .llm import LLMClient
+from .llm import DEFAULT_FANOUT_WORKERS, LLMClient, generate_json_many
 from .models import Part, PartSummary
 
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {"summary": {"type": "string"}},
+    "required": ["summary"],
+}
+
 
 def _default_summary_text(part: Part, lecture_titles: Sequence[str]) -> str:
     joined = "; ".join(lecture_titles)
     return f"{part.part_name} 강의 요약: {joined}"
 
 
+def _summary_prompt(part: Part) -> str:
+    return (
+        f"다음 강의들의 핵심 개념을 5문장 이내로 요약해 주세요.\n"
+        f"PART: {part.part_name}\n"
+        f"강의 ID: {', '.join(part.lecture_ids)}"
+    )
+
+
 def summarize_parts(
     parts: Sequence[Part],
     llm_client: LLMClient | None = None,
+    max_parallel_requests: int = DEFAULT_FANOUT_WORKERS,
 ) -> List[PartSummary]:
-    """Create PART summaries using LLM or deterministic fallback."""
+    """Create PART summaries using LLM or deterministic fallback.
+
+    With an LLM client, PART prompts are issued concurrently (at most
+    `max_parallel_requests` at a time) and each PART falls back independently
+    when its call fails.
+    """
 
+    if llm_client:
+        results = generate_json_many(
+            llm_client,
+            [(_summary_prompt(part), SUMMARY_SCHEMA) for part in parts],
+            max_workers=max_parallel_requests,
+        )
+    else:
+        results = [None] * len(parts)
+    return _summaries_from_results(parts, results)
+
+
+def _summaries_from_results(parts: Sequence[Part], results: Sequence[Any]) -> List[PartSummary]:
     summaries: List[PartSummary] = []
-    for part in parts:
-        if llm_client:
-            prompt = (
-                f"다음 강의들의 핵심 개념을 5문장 이내로 요약해 주세요.\n"
-                f"PART: {part.part_name}\n"
-                f"강의 ID: {', '.join(part.lecture_ids)}"
-            )
-            try:
-                result = llm_client.generate_json(
-                    prompt,
-                    schema={
-                        "type": "object",
-                        "properties": {"summary": {"type": "string"}},
-                        "required": ["summary"],
-                    },
-                )
-                content = result.get("summary") or _default_summary_text(part, part.lecture_ids)
-            except Exception:
-                content = _default_summary_text(part, part.lecture_ids)
-        else:
+    for part, result in zip(parts, results):
+        content = result.get("summary") if isinstance(result, dict) else None
+        if not content:
             content = _default_summary_text(part, part.lecture_ids)
 
         summaries.append(
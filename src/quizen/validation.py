@@ -1,7 +1,7 @@
 """Validation helpers for questions and export rows."""
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 from .models import ExportRow, Question
 
@@ -10,8 +10,17 @@ class ValidationError(Exception):
     """Raised when export validation fails."""
 
 
-MCQ_ANSWER_RANGE = {1, 2, 3, 4}
-OX_ANSWER_RANGE = {1, 2}
+MCQ_ANSWER_RANGE = frozenset({1, 2, 3, 4})
+OX_ANSWER_RANGE = frozenset({1, 2})
+DIFFICULTY_RANGE = frozenset({1, 2, 3, 4, 5})
+QUESTION_TYPE_RANGE = frozenset({1, 3})
+
+# Every valid (difficulty_code, question_type_code, answer_code) combination, so a
+# well-formed row needs one tuple lookup instead of several range checks.
+_VALID_ROW_CODES = frozenset(
+    [(d, 1, a) for d in DIFFICULTY_RANGE for a in MCQ_ANSWER_RANGE]
+    + [(d, 3, a) for d in DIFFICULTY_RANGE for a in OX_ANSWER_RANGE]
+)
 
 
 def validate_question(question: Question) -> None:
@@ -28,20 +37,42 @@ def validate_question(question: Question) -> None:
             raise ValidationError("OX options should be empty")
 
 
-def validate_export_rows(rows: List[ExportRow]) -> Tuple[bool, List[str]]:
-    """Validate rows before writing into Google Sheets template."""
+def _row_errors(idx: int, row: ExportRow) -> List[str]:
+    """Every message for a row that failed the fast-path check."""
+    q_type = row.question_type_code
     errors: List[str] = []
+    if row.difficulty_code not in DIFFICULTY_RANGE:
+        errors.append(f"Row {idx}: difficulty must be 1-5")
+    if q_type not in QUESTION_TYPE_RANGE:
+        errors.append(f"Row {idx}: question_type must be 1 or 3")
+    if q_type == 1:
+        if len(row.options) != 4:
+            errors.append(f"Row {idx}: MCQ must have 4 options")
+        if row.answer_code not in MCQ_ANSWER_RANGE:
+            errors.append(f"Row {idx}: MCQ answer must be 1-4")
+    elif q_type == 3 and row.answer_code not in OX_ANSWER_RANGE:
+        errors.append(f"Row {idx}: OX answer must be 1 or 2")
+    return errors
+
+
+def iter_export_row_errors(rows: Iterable[ExportRow]) -> Iterator[str]:
+    """Yield error messages row by row, so a validity check can stop at the first one."""
+    valid = _VALID_ROW_CODES
     for idx, row in enumerate(rows, start=3):  # spreadsheet rows start at 3
-        if row.difficulty_code not in {1, 2, 3, 4, 5}:
-            errors.append(f"Row {idx}: difficulty must be 1-5")
-        if row.question_type_code not in {1, 3}:
-            errors.append(f"Row {idx}: question_type must be 1 or 3")
-        if row.question_type_code == 1:
-            if len(row.options) != 4:
-                errors.append(f"Row {idx}: MCQ must have 4 options")
-            if row.answer_code not in MCQ_ANSWER_RANGE:
-                errors.append(f"Row {idx}: MCQ answer must be 1-4")
-        if row.question_type_code == 3:
-            if row.answer_code not in OX_ANSWER_RANGE:
-                errors.append(f"Row {idx}: OX answer must be 1 or 2")
-    return (len(errors) == 0), errors
+        q_type = row.question_type_code
+        if (row.difficulty_code, q_type, row.answer_code) in valid and (
+            q_type != 1 or len(row.options) == 4
+        ):
+            continue
+        yield from _row_errors(idx, row)
+
+
+def export_rows_valid(rows: Iterable[ExportRow]) -> bool:
+    """True when no row has an error; stops at the first invalid row."""
+    return next(iter_export_row_errors(rows), None) is None
+
+
+def validate_export_rows(rows: List[ExportRow]) -> Tuple[bool, List[str]]:
+    """Validate rows before writing into Google Sheets template."""
+    errors = list(iter_export_row_errors(rows))
+    return not errors, errors
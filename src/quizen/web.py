@@ -1,25 +1,40 @@
 """FastAPI application exposing pipeline APIs and HTML review views."""
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-import uuid
+import threading
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from hmac import compare_digest
+from math import fsum
+from operator import itemgetter
 from pathlib import Path
-from statistics import mean
-from typing import Any, Dict, Iterable, List, Optional
+from secrets import token_hex
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import jinja2
 from fastapi import Depends, FastAPI, Form, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field, field_validator
 
+from . import jsonutil
 from .distribution import rebalance_questions
-from .models import Lecture, Part, Question
-from .pipeline import build_default_runner
+from .models import QUESTION_LIST_ADAPTER, Lecture, Part, Question
+from .pipeline import PipelineContext, build_default_runner
 from .questions import QuestionGenerationOptions
 from .storage import JsonStorage
 from .validation import ValidationError, validate_question
 
+_RUN_CACHE_SIZE = 64
+# Question lists and review/report pages repeat a lot of text; small bodies skip gzip.
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 5
+
 
 class LecturePayload(BaseModel):
     order: str
@@ -43,7 +58,11 @@ class RunRequest(BaseModel):
     drive: DriveSheetSettings | None = None
 
     def to_models(self) -> tuple[list[Lecture], QuestionGenerationOptions]:
-        lectures = [Lecture(**lecture.model_dump()) for lecture in self.lectures]
+        # LecturePayload already validated these fields at the HTTP boundary.
+        lectures = [
+            Lecture.model_construct(order=lecture.order, id=lecture.id, title=lecture.title)
+            for lecture in self.lectures
+        ]
         options = QuestionGenerationOptions(
             total_questions=self.total_questions,
             difficulty=self.difficulty,
@@ -68,9 +87,33 @@ class QuestionEditPayload(BaseModel):
         return [opt for opt in value if opt is not None]
 
 
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by `jsonutil` (orjson when installed).
+
+    Endpoints return these directly so FastAPI skips its `jsonable_encoder` walk
+    over run payloads, which are already plain JSON data.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return jsonutil.dumps(content, default=jsonutil.encode_default)
+
+
+@lru_cache(maxsize=1)
 def _templates() -> Jinja2Templates:
+    """Template set shared by every app, with all templates compiled up front.
+
+    `auto_reload=False` stops Jinja from stat-ing the source file on each render;
+    template edits need a server restart.
+    """
     root = Path(__file__).parent / "templates"
-    return Jinja2Templates(directory=str(root))
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(root)),
+        autoescape=jinja2.select_autoescape(),
+        auto_reload=False,
+    )
+    for name in env.list_templates():
+        env.get_template(name)
+    return Jinja2Templates(env=env)
 
 
 class AppSettings(BaseModel):
@@ -132,40 +175,177 @@ def _update_state(run: Dict[str, Any]) -> Dict[str, Any]:
     return state
 
 
+class _RunStateCache:
+    """Reuse a run's derived state until its events list grows or is replaced.
+
+    Events are append-only, so `(events object, length)` identifies the input
+    to `_build_state`; reads of an unchanged run skip rescanning the events.
+    The run itself is left untouched, since it may be `JsonStorage`'s cached copy.
+    """
+
+    def __init__(self, maxsize: int = _RUN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[List[Dict[str, Any]], int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, run_id: str, run: Dict[str, Any]) -> Dict[str, Any]:
+        events = run.get("events", [])
+        with self._lock:
+            entry = self._entries.get(run_id)
+        if entry is not None and entry[0] is events and entry[1] == len(events):
+            state = entry[2]
+        else:
+            state = _build_state(events)
+            with self._lock:
+                self._entries[run_id] = (events, len(events), state)
+                self._entries.move_to_end(run_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return state
+
+
 def _load_run_or_404(storage: JsonStorage, run_id: str) -> Dict[str, Any]:
+    """Load a run for reading; handlers save an updated copy instead of mutating it."""
+
     try:
         return storage.load(run_id)
     except FileNotFoundError as exc:  # pragma: no cover - defensive
         raise HTTPException(status_code=404, detail=str(exc))
 
 
-def _filter_questions(
-    questions: Iterable[Dict[str, Any]],
-    *,
-    part_name: str | None = None,
-    question_type: int | None = None,
-    min_score: float | None = None,
-    style_only: bool = False,
-    search: str | None = None,
-) -> List[Dict[str, Any]]:
-    filtered: List[Dict[str, Any]] = []
-    for q in questions:
-        if part_name and q.get("part_name") != part_name:
-            continue
-        if question_type and q.get("question_type_code") != question_type:
-            continue
-        if min_score is not None:
-            score = q.get("validity_score")
-            if score is None or score < min_score:
-                continue
-        if style_only and not q.get("style_violation_flags"):
-            continue
+def _run_etag_or_404(storage: JsonStorage, run_id: str) -> str:
+    try:
+        return f'W/"{storage.version(run_id)}"'
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class _QuestionIndex:
+    """Per-run lookup tables for the question filters.
+
+    PART and type filters intersect precomputed position lists, and the search
+    blobs and sorted PART names are built once, so a request only scans its
+    candidate questions.
+    Searches run `str.find` over one joined corpus (a single C-level scan per
+    match) and their hit sets are memoized per needle.
+    """
+
+    _SEARCH_MEMO_SIZE = 32
+
+    def __init__(self, questions: List[Dict[str, Any]]):
+        self.questions = questions
+        self.by_part: Dict[Any, List[int]] = defaultdict(list)
+        self.by_type: Dict[Any, List[int]] = defaultdict(list)
+        self.blobs: List[str] = []
+        for idx, q in enumerate(questions):
+            self.by_part[q.get("part_name")].append(idx)
+            self.by_type[q.get("question_type_code")].append(idx)
+            self.blobs.append(f"{q.get('question_text','')} {q.get('explanation_text','')}".lower())
+        self.part_names: List[str] = sorted(name for name in self.by_part if name)
+        self._starts: List[int] = []
+        offset = 0
+        for blob in self.blobs:
+            self._starts.append(offset)
+            offset += len(blob) + 1
+        self._corpus = "\0".join(self.blobs)
+        self._search_hits: Dict[str, frozenset] = {}
+
+    def _matching(self, needle: str) -> frozenset:
+        hits = self._search_hits.get(needle)
+        if hits is not None:
+            return hits
+        if "\0" in needle:  # could straddle the corpus separator; check blobs one by one
+            hits = frozenset(idx for idx, blob in enumerate(self.blobs) if needle in blob)
+        else:
+            corpus, starts = self._corpus, self._starts
+            found = set()
+            pos = corpus.find(needle)
+            while pos != -1:
+                idx = bisect_right(starts, pos) - 1
+                found.add(idx)
+                # Skip the rest of this blob; one hit per question is enough.
+                next_start = starts[idx + 1] if idx + 1 < len(starts) else len(corpus)
+                pos = corpus.find(needle, next_start)
+            hits = frozenset(found)
+        if len(self._search_hits) >= self._SEARCH_MEMO_SIZE:
+            self._search_hits.clear()
+        self._search_hits[needle] = hits
+        return hits
+
+    def filter(
+        self,
+        *,
+        part_name: str | None = None,
+        question_type: int | None = None,
+        min_score: float | None = None,
+        style_only: bool = False,
+        search: str | None = None,
+    ) -> List[Dict[str, Any]]:
+        """Questions matching every given filter; the stored list itself when none are set.
+
+        Callers must not mutate the returned list.
+        """
+        # An empty part_name (the review form's "전체" option) means no PART filter.
+        if not (part_name or question_type is not None or min_score is not None or style_only or search):
+            return self.questions
+        candidates: Iterable[int] = range(len(self.questions))
+        if part_name:
+            candidates = self.by_part.get(part_name, [])
+        if question_type is not None:
+            by_type = self.by_type.get(question_type, [])
+            candidates = sorted(set(candidates).intersection(by_type)) if part_name else by_type
         if search:
-            blob = f"{q.get('question_text','')} {q.get('explanation_text','')}".lower()
-            if search.lower() not in blob:
-                continue
-        filtered.append(q)
-    return filtered
+            hits = self._matching(search.lower())
+            candidates = [idx for idx in candidates if idx in hits]
+
+        # One comprehension per requested filter; unused filters cost nothing per row.
+        questions = self.questions
+        filtered = [questions[idx] for idx in candidates]
+        if min_score is not None:
+            filtered = [
+                q for q in filtered if (score := q.get("validity_score")) is not None and score >= min_score
+            ]
+        if style_only:
+            filtered = [q for q in filtered if q.get("style_violation_flags")]
+        return filtered
+
+
+class _QuestionIndexCache:
+    """Reuse a run's `_QuestionIndex` while its questions list is the same object.
+
+    `JsonStorage` hands back the same payload until the run file changes, so
+    identity is a safe key; in-place edits must call `invalidate`.
+    """
+
+    def __init__(self, maxsize: int = _RUN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, _QuestionIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, run_id: str, questions: List[Dict[str, Any]]) -> _QuestionIndex:
+        with self._lock:
+            index = self._entries.get(run_id)
+            if index is not None and index.questions is questions:
+                self._entries.move_to_end(run_id)
+                return index
+        index = _QuestionIndex(questions)
+        with self._lock:
+            self._entries[run_id] = index
+            self._entries.move_to_end(run_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return index
+
+    def invalidate(self, run_id: str) -> None:
+        with self._lock:
+            self._entries.pop(run_id, None)
 
 
 def _sort_questions(questions: List[Dict[str, Any]], sort_by: str | None, order: str | None) -> List[Dict[str, Any]]:
@@ -178,53 +358,71 @@ def _sort_questions(questions: List[Dict[str, Any]], sort_by: str | None, order:
         "validity": "validity_score",
     }
     key = key_map.get(sort_by, sort_by)
-    return sorted(questions, key=lambda q: q.get(key) or 0, reverse=reverse)
-
-
-def _apply_question_edit(question: Dict[str, Any], payload: QuestionEditPayload) -> Question:
-    edited = dict(question)
-    if payload.question_text is not None:
-        edited["question_text"] = payload.question_text
-    if payload.explanation_text is not None:
-        edited["explanation_text"] = payload.explanation_text
-    if payload.options is not None:
-        edited["options"] = payload.options
-    if payload.answer_code is not None:
-        edited["answer_code"] = payload.answer_code
-    if payload.difficulty_code is not None:
-        edited["difficulty_code"] = payload.difficulty_code
+    # Questions missing the key always go last, in their original order, instead of
+    # being compared as 0 against strings or scores.
+    present: List[Dict[str, Any]] = []
+    missing: List[Dict[str, Any]] = []
+    for q in questions:
+        (missing if q.get(key) is None else present).append(q)
+    present.sort(key=itemgetter(key), reverse=reverse)
+    return present + missing
+
+
+# Edits to these fields cannot break a stored (already validated) question.
+_FREE_TEXT_FIELDS = frozenset({"question_text", "explanation_text"})
+
+
+def _apply_question_edit(question: Dict[str, Any], payload: QuestionEditPayload) -> Dict[str, Any]:
+    """Return the edited question dict, revalidating only when a constrained field changes."""
+    changes = payload.model_dump(exclude_none=True)
+    edited = {**question, **changes}
+    if changes.keys() <= _FREE_TEXT_FIELDS:
+        return edited
 
     model = Question(**edited)
     validate_question(model)
-    return model
+    return model.model_dump()
 
 
 def create_app(
     storage_dir: str | Path = "./runs", llm_client=None, config_path: str | Path | None = None
 ) -> FastAPI:
+    """Build the app; `llm_client` is shared by every run.
+
+    Reusing one client keeps its pooled HTTP/2 connections warm across requests
+    instead of paying a new TLS handshake per run. The app does not own the
+    client: the caller that created it also closes it.
+    """
+
     storage = JsonStorage(Path(storage_dir))
+    question_indexes = _QuestionIndexCache()
+    run_states = _RunStateCache()
     settings = _load_settings(config_path)
-    app = FastAPI(title="quizen", version="0.1.0")
+
+    app = FastAPI(title="quizen", version="0.1.0", default_response_class=FastJSONResponse)
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
     templates = _templates()
 
-    def get_settings():
-        return settings
+    token = settings.auth_token.encode() if settings.auth_token else None
+    password = settings.auth_password.encode() if settings.auth_password else None
 
-    def require_auth(
-        request: Request,  # noqa: ARG001 - FastAPI injects
-        config: AppSettings = Depends(get_settings),
-    ):
-        if not config.auth_token and not config.auth_password:
-            return
+    def _matches(header: str | None, secret: bytes | None) -> bool:
+        # compare_digest keeps the comparison time independent of where the values differ.
+        return secret is not None and header is not None and compare_digest(header.encode(), secret)
 
-        token_header = request.headers.get("X-Auth-Token")
-        password_header = request.headers.get("X-Auth-Password")
+    if token is None and password is None:
 
-        if config.auth_token and token_header == config.auth_token:
+        def require_auth():
             return
-        if config.auth_password and password_header == config.auth_password:
-            return
-        raise HTTPException(status_code=401, detail="Unauthorized")
+
+    else:
+
+        def require_auth(request: Request):
+            if _matches(request.headers.get("X-Auth-Token"), token):
+                return
+            if _matches(request.headers.get("X-Auth-Password"), password):
+                return
+            raise HTTPException(status_code=401, detail="Unauthorized")
 
     auth = Depends(require_auth)
 
@@ -247,26 +445,35 @@ def create_app(
             },
         )
 
+    def _persist_run(run_id: str, ctx: PipelineContext, req: RunRequest) -> Dict[str, Any]:
+        # Dumping the run and writing it are both synchronous; callers run this on a
+        # worker thread. It is awaited rather than left to BackgroundTasks: clients
+        # use the returned run_id right away, and a deferred snapshot would race save_patch.
+        payload = ctx.to_dict()
+        payload["request"] = req.model_dump()
+        _update_state(payload)
+        storage.save(run_id, payload)
+        return payload
+
     @app.post("/runs")
-    def run_pipeline(req: RunRequest, _auth=auth):
+    async def run_pipeline(req: RunRequest, _auth=auth):
         lectures, options = req.to_models()
-        run_id = uuid.uuid4().hex
+        run_id = token_hex(16)
         runner = build_default_runner(lectures, llm_client=llm_client, question_options=options)
         try:
-            ctx = runner.run()
+            ctx = await runner.arun()
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc))
-        payload = ctx.to_dict()
-        payload["request"] = req.model_dump()
-        _update_state(payload)
-        storage.save(run_id, payload)
+        payload = await asyncio.to_thread(_persist_run, run_id, ctx, req)
         state = payload["state"]
-        return {
-            "run_id": run_id,
-            "events": ctx.events.events,
-            "question_count": len(ctx.questions),
-            **state,
-        }
+        return FastJSONResponse(
+            {
+                "run_id": run_id,
+                "events": payload["events"],
+                "question_count": len(ctx.questions),
+                **state,
+            }
+        )
 
     @app.post("/runs/form", response_class=HTMLResponse)
     async def run_pipeline_from_form(
@@ -283,8 +490,8 @@ def create_app(
         include_ox: Optional[str] = Form(None),
     ):
         try:
-            lecture_payloads = json.loads(lectures_json or "[]")
-        except json.JSONDecodeError as exc:
+            lecture_payloads = jsonutil.loads(lectures_json) if lectures_json else []
+        except ValueError as exc:  # json.JSONDecodeError and orjson.JSONDecodeError
             raise HTTPException(status_code=400, detail=f"Invalid lectures JSON: {exc}")
 
         req = RunRequest(
@@ -301,16 +508,13 @@ def create_app(
             ),
         )
         lectures, options = req.to_models()
-        run_id = uuid.uuid4().hex
+        run_id = token_hex(16)
         runner = build_default_runner(lectures, llm_client=llm_client, question_options=options)
         try:
-            ctx = runner.run()
+            ctx = await runner.arun()
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc))
-        payload = ctx.to_dict()
-        payload["request"] = req.model_dump()
-        _update_state(payload)
-        storage.save(run_id, payload)
+        payload = await asyncio.to_thread(_persist_run, run_id, ctx, req)
         state = payload["state"]
 
         return templates.TemplateResponse(
@@ -319,19 +523,24 @@ def create_app(
             {
                 "run_id": run_id,
                 "question_count": len(ctx.questions),
-                "events": ctx.events.events,
+                "events": payload["events"],
                 "state": state,
             },
         )
 
     @app.get("/runs/{run_id}")
-    def get_run(run_id: str, _auth=auth):
+    def get_run(request: Request, run_id: str, _auth=auth):
+        # The ETag is read before the load, so a concurrent edit can only make it stale, never too new.
+        etag = _run_etag_or_404(storage, run_id)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
         run = _load_run_or_404(storage, run_id)
-        _update_state(run)
-        return run
+        state = run_states.update(run_id, run)
+        return FastJSONResponse({**run, "state": state}, headers={"ETag": etag})
 
     @app.get("/runs/{run_id}/questions")
     def search_questions(
+        request: Request,
         run_id: str,
         _auth=auth,
         part: str | None = Query(None),
@@ -342,11 +551,13 @@ def create_app(
         sort_by: str | None = Query(None, description="part|difficulty|validity"),
         order: str | None = Query("asc"),
     ):
+        etag = _run_etag_or_404(storage, run_id)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
         run = _load_run_or_404(storage, run_id)
-        state = _update_state(run)
+        state = run_states.update(run_id, run)
         questions = run.get("questions", [])
-        filtered = _filter_questions(
-            questions,
+        filtered = question_indexes.get(run_id, questions).filter(
             part_name=part,
             question_type=question_type,
             min_score=min_score,
@@ -354,39 +565,52 @@ def create_app(
             search=search,
         )
         sorted_q = _sort_questions(filtered, sort_by, order)
-        return {
-            "run_id": run_id,
-            "count": len(sorted_q),
-            "questions": sorted_q,
-            "state": state,
-        }
+        return FastJSONResponse(
+            {
+                "run_id": run_id,
+                "count": len(sorted_q),
+                "questions": sorted_q,
+                "state": state,
+            },
+            headers={"ETag": etag},
+        )
 
     @app.patch("/runs/{run_id}/questions/{index}")
     def edit_question(run_id: str, index: int, payload: QuestionEditPayload, _auth=auth):
         run = _load_run_or_404(storage, run_id)
-        questions: List[Dict[str, Any]] = list(run.get("questions", []))
+        questions: List[Dict[str, Any]] = run.get("questions", [])
         try:
             original = questions[index]
         except IndexError:
             raise HTTPException(status_code=404, detail="Question not found")
 
         try:
-            updated = _apply_question_edit(original, payload)
+            edited = _apply_question_edit(original, payload)
         except ValidationError as exc:
             raise HTTPException(status_code=400, detail=str(exc))
         except Exception as exc:  # pragma: no cover - defensive
             raise HTTPException(status_code=400, detail=str(exc))
 
-        questions[index] = updated.model_dump()
-        run["questions"] = questions
-        state = _update_state(run)
-        storage.save(run_id, run)
-        return {"run_id": run_id, "index": index, "question": questions[index], "state": state}
+        if edited == original:
+            # No-op edit (e.g. a UI re-submitting the form): skip rewriting the whole run.
+            state = run_states.update(run_id, run)
+            return FastJSONResponse({"run_id": run_id, "index": index, "question": original, "state": state})
+
+        # Copy-on-write: the loaded run is shared with the storage cache, so other
+        # readers keep seeing it unchanged until the updated copy is saved.
+        updated_questions = list(questions)
+        updated_questions[index] = edited
+        updated = {**run, "questions": updated_questions}
+        question_indexes.invalidate(run_id)
+        state = run_states.update(run_id, updated)
+        # Append just this question to the run's log instead of rewriting every question.
+        storage.save_patch(run_id, updated, ["questions", index], edited)
+        return FastJSONResponse({"run_id": run_id, "index": index, "question": edited, "state": state})
 
     @app.post("/runs/{run_id}/revalidate")
     def revalidate_and_rebalance(run_id: str, _auth=auth):
         run = _load_run_or_404(storage, run_id)
-        questions = [Question.model_validate(q) for q in run.get("questions", [])]
+        questions = QUESTION_LIST_ADAPTER.validate_python(run.get("questions", []))
 
         try:
             for question in questions:
@@ -400,13 +624,12 @@ def create_app(
         if part_objects:
             questions = rebalance_questions(questions, part_objects)
 
-        run["questions"] = [q.model_dump() for q in questions]
-        run.setdefault("events", []).append(
-            {"event": "revalidation_completed", "question_count": len(questions)}
-        )
-        state = _update_state(run)
-        storage.save(run_id, run)
-        return {"run_id": run_id, "question_count": len(questions), **state}
+        events = [*run.get("events", []), {"event": "revalidation_completed", "question_count": len(questions)}]
+        updated = {**run, "questions": QUESTION_LIST_ADAPTER.dump_python(questions), "events": events}
+        state = run_states.update(run_id, updated)
+        updated["state"] = state
+        storage.save(run_id, updated)
+        return FastJSONResponse({"run_id": run_id, "question_count": len(questions), **state})
 
     @app.get("/runs/{run_id}/review", response_class=HTMLResponse)
     def review_run(
@@ -421,23 +644,22 @@ def create_app(
     ):
         run = _load_run_or_404(storage, run_id)
         questions = run.get("questions", [])
-        state = _update_state(run)
-        filtered = _filter_questions(
-            questions,
+        state = run_states.update(run_id, run)
+        index = question_indexes.get(run_id, questions)
+        filtered = index.filter(
             part_name=part,
             question_type=question_type,
             min_score=min_score,
             style_only=style_only,
             search=search,
         )
-        part_names = sorted({q.get("part_name") for q in questions if q.get("part_name")})
         return templates.TemplateResponse(
             request,
             "review.html",
             {
                 "run_id": run_id,
                 "questions": filtered,
-                "parts": part_names,
+                "parts": index.part_names,
                 "events": run.get("events", []),
                 "state": state,
                 "filters": {
@@ -453,14 +675,24 @@ def create_app(
     @app.get("/runs/{run_id}/report", response_class=HTMLResponse)
     def run_report(request: Request, run_id: str):
         run = _load_run_or_404(storage, run_id)
-        state = _update_state(run)
+        state = run_states.update(run_id, run)
         questions = run.get("questions", [])
         events = run.get("events", [])
-        scores = [q.get("validity_score") for q in questions if q.get("validity_score") is not None]
-        avg_score = mean(scores) if scores else None
-        low_scores = [q for q in questions if q.get("validity_score") is not None and q["validity_score"] < 70]
-        style_flags = [q for q in questions if q.get("style_violation_flags")]
-        parts = sorted({q.get("part_name") for q in questions if q.get("part_name")})
+        # One pass over the questions collects every report input.
+        scores: List[float] = []
+        low_scores: List[Dict[str, Any]] = []
+        style_flags: List[Dict[str, Any]] = []
+        for q in questions:
+            score = q.get("validity_score")
+            if score is not None:
+                scores.append(score)
+                if score < 70:
+                    low_scores.append(q)
+            if q.get("style_violation_flags"):
+                style_flags.append(q)
+        # fsum keeps the average exact enough without statistics.mean's Fraction path.
+        avg_score = fsum(scores) / len(scores) if scores else None
+        parts = question_indexes.get(run_id, questions).part_names
 
         return templates.TemplateResponse(
             request,
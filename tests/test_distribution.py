@@ -25,6 +25,14 @@ def test_minimum_distribution_round_robin():
     assert allocation == {parts[0].part_name: 3, parts[1].part_name: 2}
 
 
+def test_minimum_distribution_returns_fresh_dict_for_cached_inputs():
+    parts = [make_part(1), make_part(2)]
+    first = minimum_distribution(4, parts)
+    first[parts[0].part_name] = 99
+
+    assert minimum_distribution(4, parts) == {parts[0].part_name: 2, parts[1].part_name: 2}
+
+
 def test_rebalance_questions_moves_overflow_to_short_parts():
     parts = [make_part(1), make_part(2)]
     questions = [make_question(parts[0].part_name, idx) for idx in range(4)]
@@ -38,3 +46,17 @@ def test_rebalance_questions_moves_overflow_to_short_parts():
     assert counts == {parts[0].part_name: 2, parts[1].part_name: 2}
     assert len(balanced) == len(questions)
 
+
+def test_rebalance_questions_reassigns_unknown_parts_in_order():
+    parts = [make_part(1), make_part(2)]
+    questions = [
+        make_question(parts[0].part_name, 0),
+        make_question("PART.99 Unknown", 1),
+        make_question(parts[0].part_name, 2),
+        make_question(parts[0].part_name, 3),
+    ]
+
+    balanced = rebalance_questions(questions, parts)
+
+    assert [q.question_text for q in balanced] == ["Q0", "Q2", "Q1", "Q3"]
+    assert [q.part_name for q in balanced] == [parts[0].part_name] * 2 + [parts[1].part_name] * 2
@@ -1,4 +1,6 @@
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 
@@ -13,6 +15,7 @@ from quizen.google_api import (
     SheetNotFoundError,
     SheetsClient,
     WriteResult,
+    _build_cached_http,
     load_credentials,
 )
 from quizen.models import ExportRow
@@ -44,66 +47,129 @@ def test_load_credentials_uses_token_for_oauth(tmp_path: Path):
     assert result is mock_user.return_value
 
 
+def test_load_credentials_caches_until_file_changes(tmp_path: Path):
+    creds_path = tmp_path / "service.json"
+    creds_path.write_text(json.dumps({"type": "service_account"}))
+
+    with patch("quizen.google_api.service_account.Credentials.from_service_account_file") as mock_service:
+        mock_service.side_effect = lambda *args, **kwargs: object()
+        first = load_credentials(creds_path)
+        second = load_credentials(creds_path)
+        creds_path.write_text(json.dumps({"type": "service_account", "rotated": True}))
+        os.utime(creds_path, ns=(0, 1))
+        third = load_credentials(creds_path)
+
+    assert first is second
+    assert third is not first
+    assert mock_service.call_count == 2
+
+
+def test_clients_share_cached_service_per_credentials():
+    creds = object()
+    built = []
+
+    def _fake_build(api, version, **kwargs):
+        built.append((api, version))
+        return object()
+
+    with patch("quizen.google_api.build", _fake_build), patch(
+        "quizen.google_api._build_cached_http", lambda creds: object()
+    ):
+        first = SheetsClient(credentials=creds)
+        second = SheetsClient(credentials=creds)
+        DriveClient(credentials=creds)
+
+    assert first.service is second.service
+    assert built == [("sheets", "v4"), ("drive", "v3")]
+
+
+def test_cached_services_are_not_shared_across_threads():
+    creds = object()
+
+    with patch("quizen.google_api.build", lambda api, version, **kwargs: object()), patch(
+        "quizen.google_api._build_cached_http", lambda creds: object()
+    ):
+        main = SheetsClient(credentials=creds)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            other = pool.submit(SheetsClient, credentials=creds).result()
+
+    assert main.service is not other.service
+
+
 class _FakeGetResponse:
-    def __init__(self, sheet_names):
+    def __init__(self, sheet_names, header_present=True):
         self.sheet_names = sheet_names
+        self.header_present = header_present
+
+    def execute(self):
+        header_cells = [{"formattedValue": "h"}] if self.header_present else []
+        return {
+            "sheets": [
+                {"properties": {"title": name}, "data": [{"rowData": [{"values": header_cells}]}]}
+                for name in self.sheet_names
+            ]
+        }
+
+
+class _FakeAppendRequest:
+    def __init__(self, appended_with):
+        self.appended_with = appended_with
 
     def execute(self):
-        return {"sheets": [{"properties": {"title": name}} for name in self.sheet_names]}
+        return {"updates": {"updatedRows": len(self.appended_with["body"]["values"])}}
 
 
 class _FakeValues:
-    def __init__(self, *, header_present=True, updated_rows=None, raise_on_execute: list[HttpError] | None = None):
+    def __init__(self, *, updated_rows=None, raise_on_execute: list[HttpError] | None = None):
         self.updated_with = None
-        self.header_present = header_present
         self.updated_rows = updated_rows
-        self._mode = None
         self.raise_on_execute = raise_on_execute or []
-        self.get_calls = []
-
-    def get(self, spreadsheetId, range):
-        self._mode = "get"
-        self.get_calls.append({"spreadsheetId": spreadsheetId, "range": range})
-        return self
+        self.batch_calls = []
 
-    def update(self, spreadsheetId, range, valueInputOption, body):
-        self._mode = "update"
-        self.updated_with = {
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        self.appended_with = {
             "spreadsheetId": spreadsheetId,
             "range": range,
             "valueInputOption": valueInputOption,
+            "insertDataOption": insertDataOption,
             "body": body,
         }
+        return _FakeAppendRequest(self.appended_with)
+
+    def batchUpdate(self, spreadsheetId, body):
+        self.updated_with = {"spreadsheetId": spreadsheetId, "body": body}
+        self.batch_calls.append(self.updated_with)
         return self
 
     def execute(self):
-        if self.raise_on_execute and self._mode == "update":
+        if self.raise_on_execute:
             exc = self.raise_on_execute.pop(0)
             raise exc
-        if self._mode == "get":
-            return {"values": [["h"]] if self.header_present else []}
-        if self._mode == "update":
+        responses = []
+        for value_range in self.updated_with["body"]["data"]:
             updated_rows = self.updated_rows
             if updated_rows is None:
-                updated_rows = len(self.updated_with["body"]["values"])
-            return {"updatedRange": self.updated_with["range"], "updatedRows": updated_rows}
-        raise AssertionError("Unknown mode for _FakeValues")
+                updated_rows = len(value_range["values"])
+            responses.append({"updatedRange": value_range["range"], "updatedRows": updated_rows})
+        return {
+            "totalUpdatedRows": sum(r["updatedRows"] for r in responses),
+            "responses": responses,
+        }
 
 
 class _FakeSpreadsheets:
     def __init__(self, *, sheet_names=None, header_present=True, updated_rows=None, raise_on_execute=None):
         self.sheet_names = sheet_names or ["Sheet1"]
-        self._values = _FakeValues(
-            header_present=header_present, updated_rows=updated_rows, raise_on_execute=raise_on_execute
-        )
+        self.header_present = header_present
+        self._values = _FakeValues(updated_rows=updated_rows, raise_on_execute=raise_on_execute)
         self.get_calls = []
 
     def values(self):
         return self._values
 
-    def get(self, spreadsheetId, fields):
-        self.get_calls.append({"spreadsheetId": spreadsheetId, "fields": fields})
-        return _FakeGetResponse(self.sheet_names)
+    def get(self, spreadsheetId, **kwargs):
+        self.get_calls.append({"spreadsheetId": spreadsheetId, **kwargs})
+        return _FakeGetResponse(self.sheet_names, header_present=self.header_present)
 
 
 class _FakeSheetsService:
@@ -149,25 +215,50 @@ def test_write_export_rows_builds_sheet_cells():
     assert result.success_count == 2
     assert result.failure_count == 0
     expected_body = {
-        "values": [
-            ["3", "1", "Q1", "E1", "2", "A", "B", "C", "D"],
-            ["2", "3", "Q2", "E2", "1", "", "", "", ""],
-        ]
+        "valueInputOption": "USER_ENTERED",
+        "data": [
+            {
+                "range": "Export!A3:I4",
+                "values": [
+                    ["3", "1", "Q1", "E1", "2", "A", "B", "C", "D"],
+                    ["2", "3", "Q2", "E2", "1", "", "", "", ""],
+                ],
+            }
+        ],
     }
     assert sheet_service.spreadsheets().values().updated_with["body"] == expected_body
+    assert sheet_service.spreadsheets().get_calls == []
 
 
 def test_write_export_rows_validates_sheet_and_header():
     sheet_service = _FakeSheetsService(sheet_names=["Other"])
-    client = SheetsClient(service=sheet_service)
+    client = SheetsClient(service=sheet_service, validate_before_write=True)
 
     with pytest.raises(SheetNotFoundError):
         client.write_export_rows("sheet123", [], start_row=3, sheet_name="Missing")
 
     sheet_service = _FakeSheetsService(sheet_names=["Export"], header_present=False)
-    client = SheetsClient(service=sheet_service)
+    client = SheetsClient(service=sheet_service, validate_before_write=True)
     with pytest.raises(SheetHeaderMissingError):
         client.write_export_rows("sheet123", [], start_row=3, sheet_name="Export")
+    assert sheet_service.spreadsheets().get_calls[0]["ranges"] == ["Export!A2:I2"]
+
+
+def test_write_export_rows_maps_missing_range_error_without_preflight():
+    http_error = HttpError(Response({"status": 400}), b'{"error": {"message": "Unable to parse range: Missing!A3:I3"}}')
+    sheet_service = _FakeSheetsService(sheet_names=["Export"], raise_on_execute=[http_error])
+    client = SheetsClient(service=sheet_service)
+    row = ExportRow(
+        difficulty_code=3,
+        question_type_code=3,
+        question_text="Q1",
+        explanation_text="E1",
+        answer_code=1,
+    )
+
+    with pytest.raises(SheetNotFoundError):
+        client.write_export_rows("sheet123", [row], sheet_name="Missing")
+    assert sheet_service.spreadsheets().get_calls == []
 
 
 def test_write_export_rows_retries_and_reports_partial_success():
@@ -203,6 +294,68 @@ def test_write_export_rows_retries_and_reports_partial_success():
     assert result.failure_count == 1
 
 
+def test_write_export_rows_batches_extra_ranges_and_caches_preflight():
+    sheet_service = _FakeSheetsService(sheet_names=["Export", "quizen_meta"])
+    client = SheetsClient(service=sheet_service, validate_before_write=True)
+    row = ExportRow(
+        difficulty_code=3,
+        question_type_code=3,
+        question_text="Q1",
+        explanation_text="E1",
+        answer_code=1,
+    )
+    meta_range = SheetsClient.meta_value_range("quizen_meta", [["meta"]])
+
+    client.write_export_rows("sheet123", [row], sheet_name="Export", extra_ranges=[meta_range])
+    client.write_export_rows("sheet123", [row], sheet_name="Export")
+
+    values = sheet_service.spreadsheets().values()
+    assert [r["range"] for r in values.batch_calls[0]["body"]["data"]] == ["Export!A3:I3", "quizen_meta!A1:Z1"]
+    assert len(values.batch_calls) == 2
+    assert len(sheet_service.spreadsheets().get_calls) == 1
+
+
+def test_append_meta_sheet_uses_values_append_with_insert_rows():
+    sheet_service = _FakeSheetsService(sheet_names=["quizen_meta"])
+    client = SheetsClient(service=sheet_service)
+
+    response = client.append_meta_sheet("sheet123", "quizen_meta", [["a"], ["b"]])
+
+    appended = sheet_service.spreadsheets().values().appended_with
+    assert appended["range"] == "quizen_meta!A1"
+    assert appended["insertDataOption"] == "INSERT_ROWS"
+    assert response["updates"]["updatedRows"] == 2
+
+
+def test_append_meta_sheet_streams_rows_in_chunks():
+    sheet_service = _FakeSheetsService(sheet_names=["quizen_meta"])
+    client = SheetsClient(service=sheet_service)
+    chunks = []
+    values = sheet_service.spreadsheets().values()
+    original_append = values.append
+
+    def _recording_append(**kwargs):
+        chunks.append(kwargs["body"]["values"])
+        return original_append(**kwargs)
+
+    values.append = _recording_append
+
+    response = client.append_meta_sheet("sheet123", "quizen_meta", ([str(i)] for i in range(5)), chunk_rows=2)
+
+    assert chunks == [[["0"], ["1"]], [["2"], ["3"]], [["4"]]]
+    assert response["updates"]["updatedRows"] == 1
+
+
+def test_append_meta_sheet_skips_request_for_empty_rows():
+    sheet_service = _FakeSheetsService(sheet_names=["quizen_meta"])
+    client = SheetsClient(service=sheet_service)
+    calls = []
+    sheet_service.spreadsheets().values().append = lambda **kwargs: calls.append(kwargs)
+
+    assert client.append_meta_sheet("sheet123", "quizen_meta", iter([])) == {}
+    assert calls == []
+
+
 class _FakeFiles:
     def __init__(self, payloads, *, next_tokens=None, raise_on_execute: list[HttpError] | None = None):
         self.payloads = payloads if isinstance(payloads, list) else [payloads]
@@ -250,6 +403,10 @@ def test_list_srt_and_copy_file_filters_and_copies():
     files = client.list_srt_files("folder123")
     assert len(files) == 1
     assert files[0].id == "1"
+    assert service.files().requests[0]["pageSize"] == 1000
+    assert "name contains" not in service.files().requests[0]["q"]
+    assert "mimeType != 'application/vnd.google-apps.folder'" in service.files().requests[0]["q"]
+    assert service.files().requests[0]["fields"] == "nextPageToken,files(id,name)"
 
     copy = client.copy_file("source", "dest", "new-name")
     assert copy.id == "copy123"
@@ -267,6 +424,18 @@ def test_list_srt_files_warns_on_empty_pagination(caplog):
     assert any("continuation token without files" in record.message for record in caplog.records)
 
 
+def test_iter_srt_files_fetches_next_page_only_when_needed():
+    payloads = [[{"id": "1", "name": "a.srt"}], [{"id": "2", "name": "b.srt"}]]
+    service = _FakeDriveService(payloads, next_tokens=["token", None])
+    client = DriveClient(service=service)
+
+    files = client.iter_srt_files("folder123")
+    assert next(files).id == "1"
+    assert len(service.files().requests) == 1
+    assert [item.id for item in files] == ["2"]
+    assert service.files().requests[1]["pageToken"] == "token"
+
+
 def test_list_srt_files_raises_drive_error_on_http_failure():
     http_error = HttpError(Response({"status": 500}), b"error")
     service = _FakeDriveService([], raise_on_execute=[http_error])
@@ -275,3 +444,85 @@ def test_list_srt_files_raises_drive_error_on_http_failure():
     with pytest.raises(DriveApiError):
         client.list_srt_files("folder123")
 
+
+def test_download_file_decodes_chunks_split_inside_characters():
+    payload = "1\n00:00:01,000 --> 00:00:02,000\n안녕하세요\n".encode("utf-8")
+
+    class _FakeDownloader:
+        def __init__(self, fd, request, chunksize):
+            self.fd = fd
+            self.chunksize = chunksize
+            self.offset = 0
+
+        def next_chunk(self):
+            chunk = payload[self.offset : self.offset + self.chunksize]
+            self.fd.write(chunk)
+            self.offset += len(chunk)
+            return None, self.offset >= len(payload)
+
+    class _MediaFiles:
+        def get_media(self, fileId):
+            return object()
+
+    service = type("_Service", (), {"files": lambda self: _MediaFiles()})()
+    client = DriveClient(service=service, download_chunksize=5)
+
+    with patch("quizen.google_api.MediaIoBaseDownload", _FakeDownloader):
+        text = client.download_file("file-1")
+
+    assert text == payload.decode("utf-8")
+
+
+def test_download_files_preserves_order_with_per_thread_services():
+    class _Request:
+        def __init__(self, file_id):
+            self.file_id = file_id
+
+    class _Downloader:
+        def __init__(self, fd, request, chunksize):
+            self.fd = fd
+            self.request = request
+
+        def next_chunk(self):
+            self.fd.write(f"body-{self.request.file_id}".encode("utf-8"))
+            return None, True
+
+    class _MediaFiles:
+        def get_media(self, fileId):
+            return _Request(fileId)
+
+    built = []
+
+    def _fake_build(*args, **kwargs):
+        service = type("_Service", (), {"files": lambda self: _MediaFiles()})()
+        built.append(kwargs)
+        return service
+
+    with patch("quizen.google_api.build", _fake_build), patch(
+        "quizen.google_api._build_cached_http", lambda creds: object()
+    ), patch("quizen.google_api.MediaIoBaseDownload", _Downloader):
+        client = DriveClient(credentials=object())
+        texts = client.download_files([f"id{i}" for i in range(6)], max_workers=3)
+
+    assert texts == [f"body-id{i}" for i in range(6)]
+    assert all("http" in kwargs for kwargs in built)
+    assert all(kwargs["cache_discovery"] is False for kwargs in built)
+    assert all(kwargs["static_discovery"] is True for kwargs in built)
+
+
+def test_build_cached_http_uses_configured_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("QUIZEN_HTTP_CACHE", str(tmp_path / "cache"))
+
+    authorized = _build_cached_http(object())
+
+    assert authorized.http.cache.cache == str(tmp_path / "cache")
+
+
+def test_build_cached_http_has_no_disk_cache_by_default(monkeypatch):
+    monkeypatch.delenv("QUIZEN_HTTP_CACHE", raising=False)
+
+    authorized = _build_cached_http(object())
+
+    assert authorized.http.cache is None
+    assert authorized.http.timeout == 30
+    assert 308 not in authorized.http.redirect_codes
@@ -1,9 +1,12 @@
+import json
 import os
 
 import httpx
 import pytest
 
+from quizen import jsonutil
 from quizen.llm import LLMClient, build_default_llm_client
+from quizen.retry import backoff_delays, parse_retry_after
 
 
 class _FakeResponse:
@@ -14,8 +17,9 @@ class _FakeResponse:
     def raise_for_status(self):
         return None
 
-    def json(self):
-        return self._payload
+    @property
+    def content(self):
+        return json.dumps(self._payload).encode("utf-8")
 
 
 class _FakeClient:
@@ -24,8 +28,8 @@ class _FakeClient:
         self.requests = []
         self.closed = False
 
-    def post(self, url, json=None, headers=None):
-        self.requests.append({"url": url, "json": json, "headers": headers})
+    def post(self, url, content=None, headers=None):
+        self.requests.append({"url": url, "json": json.loads(content), "headers": headers})
         return _FakeResponse(self.payload)
 
     def close(self):
@@ -51,6 +55,8 @@ def test_generate_json_uses_supplied_client_and_api_key_header():
     assert result == {"result": "ok"}
     assert fake_client.requests[0]["headers"]["X-Goog-Api-Key"] == "secret-key"
     assert fake_client.requests[0]["url"].endswith(":generateContent")
+    assert fake_client.requests[0]["headers"]["Content-Type"] == "application/json"
+    assert fake_client.requests[0]["json"]["contents"][0]["parts"][0]["text"] == "prompt"
 
 
 def test_generate_json_retries_with_backoff(monkeypatch, caplog):
@@ -64,7 +70,7 @@ def test_generate_json_retries_with_backoff(monkeypatch, caplog):
         def __init__(self):
             self.calls = 0
 
-        def post(self, url, json=None, headers=None):
+        def post(self, url, content=None, headers=None):
             self.calls += 1
             if self.calls < 3:
                 raise httpx.TimeoutException("timeout")
@@ -99,7 +105,7 @@ def test_generate_json_falls_back_to_next_model(caplog):
         def __init__(self):
             self.calls = []
 
-        def post(self, url, json=None, headers=None):
+        def post(self, url, content=None, headers=None):
             self.calls.append(url)
             if "primary" in url:
                 response = httpx.Response(503, request=httpx.Request("POST", url))
@@ -155,3 +161,222 @@ def test_build_default_llm_client_errors_without_env(monkeypatch):
 
     with pytest.raises(EnvironmentError):
         build_default_llm_client()
+
+
+def test_owned_client_uses_pooled_http2_transport_with_default_key_header():
+    llm = LLMClient(base_url="https://example.com", api_key="owned-key")
+    try:
+        assert llm._client.headers["X-Goog-Api-Key"] == "owned-key"
+        assert llm._request_headers is None
+    finally:
+        llm.close()
+
+
+def test_owned_client_is_built_once_and_reused_until_closed(monkeypatch):
+    import quizen.llm as llm_module
+
+    payload = {"candidates": [{"content": {"parts": [{"functionCall": {"args": {"ok": True}}}]}}]}
+    seen = []
+    built = []
+
+    def build(api_key):
+        client = httpx.Client(
+            transport=httpx.MockTransport(lambda request: seen.append(request) or httpx.Response(200, json=payload)),
+            headers={"X-Goog-Api-Key": api_key},
+        )
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(llm_module, "_build_http_client", build)
+    with LLMClient(base_url="https://example.com", api_key="k", model="models/unit-test") as llm:
+        assert llm.generate_json("one", {"type": "object"}) == {"ok": True}
+        assert llm.generate_json("two", {"type": "object"}) == {"ok": True}
+
+    assert len(built) == 1 and len(seen) == 2
+    assert built[0].is_closed
+
+
+def test_generate_json_prefers_retry_after_and_respects_deadline(monkeypatch):
+    payload = {"candidates": [{"content": {"parts": [{"functionCall": {"args": {"result": "ok"}}}]}}]}
+
+    class _ThrottledClient:
+        def __init__(self, retry_after):
+            self.retry_after = retry_after
+            self.calls = 0
+
+        def post(self, url, content=None, headers=None):
+            self.calls += 1
+            if self.calls == 1:
+                request = httpx.Request("POST", url)
+                response = httpx.Response(429, headers={"Retry-After": self.retry_after}, request=request)
+                raise httpx.HTTPStatusError("throttled", request=request, response=response)
+            return _FakeResponse(payload)
+
+    sleep_calls = []
+    monkeypatch.setattr("time.sleep", lambda secs: sleep_calls.append(secs))
+
+    llm = LLMClient(base_url="https://example.com", api_key="k", model="models/m", client=_ThrottledClient("0.25"))
+    assert llm.generate_json("prompt", {"type": "object"}) == {"result": "ok"}
+    assert sleep_calls == [0.25]
+
+    llm = LLMClient(base_url="https://example.com", api_key="k", model="models/m", client=_ThrottledClient("120"))
+    with pytest.raises(httpx.HTTPStatusError):
+        llm.generate_json("prompt", {"type": "object"}, max_total_seconds=5)
+    assert sleep_calls == [0.25]
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_backoff_delays_are_exponential_and_jitter_stays_within_half_either_side():
+    assert backoff_delays(0.5, 3) == (0.5, 1.0, 2.0)
+
+    for _ in range(50):
+        jittered = backoff_delays(0.5, 3, jitter=True)
+        assert all(0.5 * base <= delay < 1.5 * base for base, delay in zip((0.5, 1.0, 2.0), jittered))
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        ({}, "did not include any candidates"),
+        ({"candidates": [{"content": {}}]}, "missing content parts"),
+        ({"candidates": [{"content": {"parts": [{"functionCall": {"args": "x"}}]}}]}, "functionCall.args object"),
+    ],
+)
+def test_extract_args_reports_malformed_level(payload, message):
+    fake_client = _FakeClient(payload)
+    llm = LLMClient(base_url="https://example.com", api_key="k", model="models/m", client=fake_client)
+
+    with pytest.raises(ValueError) as excinfo:
+        llm.generate_json("prompt", {"type": "object"})
+
+    assert message in str(excinfo.value)
+    assert isinstance(excinfo.value.__cause__, (KeyError, IndexError, TypeError))
+    assert len(fake_client.requests) == 1  # malformed bodies are not retried
+
+
+def test_generate_json_prebuilt_sends_same_envelope_as_generate_json():
+    payload = {"candidates": [{"content": {"parts": [{"functionCall": {"args": {"ok": True}}}]}}]}
+    schema = {"type": "object", "properties": {"summary": {"type": "string"}}}
+    fake_client = _FakeClient(payload)
+    llm = LLMClient(base_url="https://example.com", api_key="k", model="models/m", client=fake_client)
+
+    llm.generate_json("요약해 주세요", schema)
+    llm.generate_json_prebuilt("요약해 주세요", json.dumps(schema).encode("utf-8"))
+
+    assert fake_client.requests[0]["json"] == fake_client.requests[1]["json"]
+
+
+def test_jsonutil_round_trips_non_ascii_without_escaping():
+    encoded = jsonutil.dumps({"text": "한국어"})
+
+    assert "한국어".encode("utf-8") in encoded
+    assert jsonutil.loads(encoded) == {"text": "한국어"}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonutil_indented_output_matches_stdlib(monkeypatch, use_orjson):
+    if use_orjson and jsonutil.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(jsonutil, "orjson", None)
+    payload = {"questions": [{"text": "한국어", "options": []}], "count": 1}
+
+    encoded = jsonutil.dumps(payload, indent=True)
+
+    assert encoded == json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonutil_encode_default_matches_across_backends(monkeypatch, use_orjson):
+    import datetime
+    import uuid
+    from pathlib import Path
+
+    if use_orjson and jsonutil.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(jsonutil, "orjson", None)
+    run_id = uuid.UUID(int=1)
+    payload = {"path": Path("runs/a.json"), "id": run_id, "at": datetime.datetime(2024, 1, 2, 3, 4, 5)}
+
+    decoded = jsonutil.loads(jsonutil.dumps(payload, default=jsonutil.encode_default))
+
+    assert decoded == {"path": "runs/a.json", "id": str(run_id), "at": "2024-01-02T03:04:05"}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonutil_loads_accepts_memoryview(monkeypatch, use_orjson):
+    if use_orjson and jsonutil.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(jsonutil, "orjson", None)
+
+    assert jsonutil.loads(memoryview('{"a": "한국어"}'.encode("utf-8"))) == {"a": "한국어"}
+
+
+def test_generate_json_reads_and_writes_disk_cache(tmp_path):
+    payload = {"candidates": [{"content": {"parts": [{"functionCall": {"args": {"result": "캐시"}}}]}}]}
+    fake_client = _FakeClient(payload)
+    llm = LLMClient(
+        base_url="https://example.com", api_key="k", model="models/unit-test", client=fake_client, cache_dir=tmp_path
+    )
+
+    first = llm.generate_json("prompt", {"type": "object"})
+    second = llm.generate_json("prompt", {"type": "object"})
+    llm.generate_json("other prompt", {"type": "object"})
+
+    assert first == second == {"result": "캐시"}
+    assert len(fake_client.requests) == 2
+    assert len(list(tmp_path.glob("*.json"))) == 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_generate_json_uses_supplied_memory_cache():
+    from quizen.llm_cache import MemoryBackend
+
+    payload = {"candidates": [{"content": {"parts": [{"functionCall": {"args": {"result": "ok"}}}]}}]}
+    fake_client = _FakeClient(payload)
+    llm = LLMClient(
+        base_url="https://example.com",
+        api_key="k",
+        model="models/unit-test",
+        client=fake_client,
+        cache=MemoryBackend(),
+    )
+
+    assert llm.generate_json("prompt", {"type": "object"}) == llm.generate_json("prompt", {"type": "object"})
+    assert len(fake_client.requests) == 1
+
+
+def test_response_cache_counts_client_cache_hits():
+    from quizen.llm_cache import ResponseCache
+
+    payload = {"candidates": [{"content": {"parts": [{"functionCall": {"args": {"result": "ok"}}}]}}]}
+    fake_client = _FakeClient(payload)
+    cache = ResponseCache()
+    llm = LLMClient(base_url="https://example.com", api_key="k", model="models/m", client=fake_client, cache=cache)
+
+    llm.generate_json("prompt", {"type": "object"})
+    llm.generate_json("prompt", {"type": "object"})
+
+    assert llm.cache is cache
+    assert len(fake_client.requests) == 1
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_embed_sends_one_batch_request_and_returns_vectors_in_order():
+    fake_client = _FakeClient({"embeddings": [{"values": [0.1, 0.2]}, {"values": [0.3, 0.4]}]})
+    llm = LLMClient(base_url="https://example.com", api_key="k", model="models/m", client=fake_client)
+
+    vectors = llm.embed(["a", "b"])
+
+    assert vectors == [[0.1, 0.2], [0.3, 0.4]]
+    assert len(fake_client.requests) == 1
+    assert fake_client.requests[0]["url"].endswith(":batchEmbedContents")
+    assert [r["content"]["parts"][0]["text"] for r in fake_client.requests[0]["json"]["requests"]] == ["a", "b"]
@@ -0,0 +1,78 @@
+import pytest
+
+from quizen.llm_cache import (
+    FileBackend,
+    MemoryBackend,
+    ResponseCache,
+    SemanticCache,
+    TieredBackend,
+    unit_vector,
+)
+
+
+def test_memory_backend_evicts_least_recently_used_and_expires(monkeypatch):
+    backend = MemoryBackend(maxsize=2)
+    backend.set("a", {"v": 1})
+    backend.set("b", {"v": 2})
+    backend.get("a")
+    backend.set("c", {"v": 3})
+
+    assert backend.get("b") is None
+    assert backend.get("a") == {"v": 1}
+
+    now = [100.0]
+    monkeypatch.setattr("quizen.llm_cache.time.monotonic", lambda: now[0])
+    backend.set("ttl", {"v": 4}, ttl=10)
+    now[0] = 111.0
+    assert backend.get("ttl") is None
+
+
+@pytest.mark.parametrize("ttl, expected", [(None, {"v": "값"}), (-1, None)])
+def test_file_backend_round_trips_and_honors_ttl(tmp_path, ttl, expected):
+    backend = FileBackend(tmp_path / "cache")
+
+    backend.set("k", {"v": "값"}, ttl=ttl)
+
+    assert backend.get("k") == expected
+    assert backend.get("missing") is None
+    assert not list((tmp_path / "cache").glob("*.tmp"))
+
+
+def test_tiered_backend_promotes_slow_hits(tmp_path):
+    slow = FileBackend(tmp_path)
+    slow.set("k", {"v": 1})
+    fast = MemoryBackend()
+    tiered = TieredBackend(fast, slow)
+
+    assert tiered.get("k") == {"v": 1}
+    assert fast.get("k") == {"v": 1}
+    tiered.set("n", {"v": 2})
+    assert slow.get("n") == fast.get("n") == {"v": 2}
+
+
+def test_response_cache_counts_hits_and_misses():
+    cache = ResponseCache()
+
+    assert cache.get("k") is None
+    cache.set("k", {"ok": True})
+    assert cache.get("k") == {"ok": True}
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_semantic_cache_returns_best_match_above_threshold():
+    cache = SemanticCache(threshold=0.9)
+    cache.add(unit_vector([1.0, 0.0]), {"questions": ["x"]}, "PART.01 A")
+    cache.add(unit_vector([0.0, 1.0]), {"questions": ["y"]}, "PART.02 B")
+
+    assert cache.lookup(unit_vector([0.95, 0.1])) == ({"questions": ["x"]}, "PART.01 A")
+    assert cache.lookup(unit_vector([1.0, 1.0])) is None
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_semantic_cache_drops_oldest_entry_when_full():
+    cache = SemanticCache(threshold=0.9, maxsize=2)
+    for idx, vector in enumerate(([1.0, 0.0], [0.0, 1.0], [-1.0, 0.0])):
+        cache.add(unit_vector(vector), {"n": idx}, f"PART.0{idx}")
+
+    assert cache.lookup(unit_vector([1.0, 0.0])) is None
+    assert cache.lookup(unit_vector([-1.0, 0.0])) == ({"n": 2}, "PART.02")
@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from quizen.models import Lecture
+from quizen.parsing import parse_course_folder, parse_filename
+
+
+def test_parse_filename_extracts_order_id_and_title():
+    lecture, warnings = parse_filename(Path("/course/012 L12 변수와 타입.srt"))
+
+    assert (lecture.order, lecture.id, lecture.title) == ("012", "L12", "변수와 타입")
+    assert warnings == []
+    assert lecture.model_dump() == Lecture(**lecture.model_dump()).model_dump()
+
+
+def test_parse_course_folder_scans_srt_files_and_sorts(tmp_path: Path):
+    for name in ["002 L2 Beta.srt", "001 L1 Alpha.srt", "notes.txt", "broken.srt"]:
+        (tmp_path / name).write_text("")
+    (tmp_path / "nested.srt").mkdir()
+
+    lectures, warnings = parse_course_folder(tmp_path)
+
+    assert [lec.id for lec in lectures] == ["broken", "L1", "L2"]
+    assert lectures[1].file_path == str(tmp_path / "001 L1 Alpha.srt")
+    assert len(warnings) == 1
@@ -1,6 +1,13 @@
-from quizen.models import Lecture
-from quizen.parts import PartClassifier
-from quizen.pipeline import build_default_runner
+import asyncio
+import io
+import json
+
+import pytest
+
+from quizen import parts as parts_module
+from quizen.models import ExportRow, Lecture, Part, Question
+from quizen.parts import PartClassifier, _validate_parts, build_classification_prompt
+from quizen.pipeline import build_default_runner, default_export_mapper
 from quizen.questions import QuestionGenerationOptions
 
 
@@ -18,6 +25,68 @@ def test_part_classifier_fallback_assigns_all_lectures():
     assert any("Fallback PART split" in w for w in result.warnings)
 
 
+def test_part_classifier_retries_after_invalid_parts():
+    lectures = [Lecture(order="001", id="L1", title="Alpha"), Lecture(order="002", id="L2", title="Beta")]
+    part = {"part_code": "PART.01", "part_title": "Intro", "part_name": "PART.01 Intro"}
+    responses = [
+        {"parts": [dict(part, lecture_ids=["L1"])]},
+        {"parts": [dict(part, lecture_ids=["L1", "L2"])]},
+    ]
+
+    class _Client:
+        def generate_json(self, prompt, schema):
+            return responses.pop(0)
+
+    result = PartClassifier(llm_client=_Client(), max_retries=1).classify(lectures)
+
+    assert result.fallback_used is False
+    assert result.parts[0].lecture_ids == ["L1", "L2"]
+    assert result.warnings == [
+        "Unassigned lectures: L2",
+        "LLM classification failed (attempt 1): Unassigned lectures: L2",
+    ]
+
+
+@pytest.mark.parametrize("compiled", [True, False])
+def test_part_payload_rejects_unpadded_code_with_or_without_compiled_schema(monkeypatch, compiled):
+    if not compiled:
+        monkeypatch.setattr(parts_module, "_VALIDATE_PARTS_PAYLOAD", None)
+    elif parts_module._VALIDATE_PARTS_PAYLOAD is None:
+        pytest.skip("fastjsonschema not installed")
+    good = {"part_code": "PART.01", "part_title": "A", "part_name": "PART.01 A", "lecture_ids": ["L1"]}
+
+    parsed = parts_module._parse_parts_payload({"parts": [good]})
+
+    assert parsed == [Part(**good)]
+    with pytest.raises(ValueError):
+        parts_module._parse_parts_payload({"parts": [dict(good, part_code="PART.1")]})
+    with pytest.raises(ValueError):
+        parts_module._parse_parts_payload({"parts": [dict(good, part_code="PART.01\n")]})
+
+
+def test_validate_parts_reports_unknown_missing_and_duplicate_ids():
+    parts = [
+        Part(part_code="PART.01", part_title="A", part_name="PART.01 A", lecture_ids=["L1", "X9"]),
+        Part(part_code="PART.02", part_title="B", part_name="PART.02 B", lecture_ids=["L1", "X9"]),
+    ]
+
+    errors = _validate_parts(parts, {"L1", "L2", "L3"})
+
+    assert errors == [
+        "Unknown lecture_id in parts: X9",
+        "Unassigned lectures: L2, L3",
+        "Lecture assigned to multiple parts: L1",
+    ]
+
+
+def test_classification_prompt_is_cached_per_lecture_list():
+    lectures = [Lecture(order="", id="L1", title="Alpha"), Lecture(order="002", id="L2", title="Beta")]
+
+    prompt = build_classification_prompt(lectures)
+
+    assert "- ??? | L1 | Alpha\n- 002 | L2 | Beta" in prompt
+    assert build_classification_prompt(list(lectures)) is prompt
+
 
 def test_pipeline_runner_builds_export_rows():
     lectures = [Lecture(order="001", id="L1", title="Alpha"), Lecture(order="002", id="L2", title="Beta")]
@@ -30,3 +99,80 @@ def test_pipeline_runner_builds_export_rows():
     assert ctx.events.events[0]["event"] == "run_started"
     assert ctx.events.events[-1]["event"] == "export_ready"
 
+
+def test_pipeline_context_write_json_matches_to_dict():
+    lectures = [Lecture(order="001", id="L1", title="알파"), Lecture(order="002", id="L2", title="Beta")]
+    ctx = build_default_runner(lectures, question_options=QuestionGenerationOptions(total_questions=4)).run()
+    buffer = io.BytesIO()
+
+    ctx.write_json(buffer)
+
+    assert json.loads(buffer.getvalue()) == ctx.to_dict()
+
+
+def test_pipeline_runner_arun_runs_off_the_event_loop():
+    lectures = [Lecture(order="001", id="L1", title="Alpha")]
+    runner = build_default_runner(lectures, question_options=QuestionGenerationOptions(total_questions=2))
+
+    ctx = asyncio.run(runner.arun())
+
+    assert ctx.events.events[-1]["event"] == "export_ready"
+
+
+def test_pipeline_context_to_dict_matches_per_item_model_dump():
+    lectures = [Lecture(order="001", id="L1", title="Alpha"), Lecture(order="002", id="L2", title="Beta")]
+    ctx = build_default_runner(lectures, question_options=QuestionGenerationOptions(total_questions=4)).run()
+
+    payload = ctx.to_dict()
+
+    assert payload["questions"] == [q.model_dump() for q in ctx.questions]
+    assert payload["export_rows"] == [r.model_dump() for r in ctx.export_rows]
+    assert payload["parts"] == [p.model_dump() for p in ctx.parts]
+
+
+def test_default_export_mapper_matches_validated_rows():
+    questions = [
+        Question(
+            difficulty_code=2,
+            question_type_code=1,
+            question_text="Q1",
+            explanation_text="E1",
+            answer_code=4,
+            options=["a", "b", "c", "d"],
+            part_name="PART.01 A",
+        ),
+        Question(
+            difficulty_code=3,
+            question_type_code=3,
+            question_text="Q2",
+            explanation_text="E2",
+            answer_code=2,
+            part_name="PART.01 A",
+        ),
+    ]
+
+    rows = default_export_mapper(questions)
+
+    assert [row.model_dump() for row in rows] == [
+        ExportRow.model_validate(row.model_dump()).model_dump() for row in rows
+    ]
+    assert rows[0].options == questions[0].options and rows[0].options is not questions[0].options
+    assert rows[1].options == [] and rows[1].options is not rows[0].options
+
+
+def test_export_row_sheet_cells_follow_copies_and_are_not_shared():
+    row = ExportRow(
+        difficulty_code=2,
+        question_type_code=1,
+        question_text="Q1",
+        explanation_text="E1",
+        answer_code=1,
+        options=["a", "b"],
+    )
+
+    cells = row.sheet_cells
+    cells.append("padding")
+    assert row.sheet_cells == ["2", "1", "Q1", "E1", "1", "a", "b", "", ""]
+
+    copied = row.model_copy(update={"question_text": "Q2"})
+    assert copied.sheet_cells[2] == "Q2"
@@ -1,5 +1,5 @@
 from quizen.models import Lecture
-from quizen.pipeline import build_default_runner
+from quizen.pipeline import PipelineEvents, build_default_runner
 
 
 def test_pipeline_events_sink_receives_events():
@@ -17,3 +17,27 @@ def test_pipeline_events_sink_receives_events():
     assert "run_started" in captured
     assert captured[-1] == "export_ready"
     assert len(ctx.events.events) == len(captured)
+
+
+def test_pipeline_events_can_skip_recording_but_still_feed_sinks():
+    captured = []
+    silent = PipelineEvents(record=False)
+    forwarding = PipelineEvents(sinks=[captured.append], record=False)
+
+    silent.push("run_started")
+    forwarding.push("export_ready", row_count=2)
+
+    assert not silent.events and not forwarding.events
+    assert captured == [{"event": "export_ready", "row_count": 2}]
+
+
+def test_pipeline_events_keep_only_the_newest_events():
+    captured = []
+    events = PipelineEvents(sinks=[captured.append], max_events=2)
+
+    for idx in range(3):
+        events.push("stage", idx=idx)
+
+    assert [event["idx"] for event in events.events] == [1, 2]
+    assert len(captured) == 3
+    assert PipelineEvents(max_events=None).events.maxlen is None
@@ -1,9 +1,17 @@
+import threading
+import time
+
+import pytest
+
 from quizen.questions import (
     QuestionGenerationOptions,
     generate_llm_questions,
     generate_questions,
+    summarize_and_generate_llm_questions,
 )
-from quizen.models import PartSummary
+from quizen.llm_cache import SemanticCache
+from quizen.models import Part, PartSummary, Question
+from quizen.summaries import summarize_parts
 
 
 class _FakeLLM:
@@ -85,3 +93,239 @@ def test_generate_questions_switches_to_llm_when_available():
 
     assert len(questions) == 1
     assert questions[0].question_text == "LLM"
+
+
+def test_generate_llm_questions_fans_out_and_keeps_part_order():
+    class _PerPartLLM:
+        def __init__(self):
+            self.calls = []
+
+        def generate_json(self, prompt, schema):
+            self.calls.append(prompt)
+            if "PART.02" in prompt:
+                raise RuntimeError("boom")
+            return {
+                "questions": [
+                    {
+                        "question_text": "LLM",
+                        "explanation_text": "E",
+                        "question_type_code": 1,
+                        "answer_code": 1,
+                        "options": ["a", "b", "c", "d"],
+                    }
+                ]
+            }
+
+    summaries = [PartSummary(part_name=f"PART.0{i} P{i}", content="요약") for i in range(1, 4)]
+    client = _PerPartLLM()
+
+    questions = generate_llm_questions(summaries, QuestionGenerationOptions(total_questions=3), client)
+
+    assert len(client.calls) == 3
+    assert [q.part_name for q in questions] == [s.part_name for s in summaries]
+    assert questions[0].question_text == "LLM"
+    assert "PART.02 P2" in questions[1].question_text
+    assert questions[2].question_text == "LLM"
+
+
+def test_generate_llm_questions_shares_payload_between_similar_summaries():
+    class _EmbeddingLLM(_FakeLLM):
+        def embed(self, texts):
+            self.embedded = list(texts)
+            return [[1.0, 0.0], [0.99, 0.05], [0.0, 1.0]]
+
+    payload = {
+        "questions": [
+            {
+                "question_text": "PART.01 A 질문",
+                "explanation_text": "E",
+                "question_type_code": 1,
+                "answer_code": 1,
+                "options": ["a", "b", "c", "d"],
+            }
+        ]
+    }
+    client = _EmbeddingLLM(payload)
+    summaries = [
+        PartSummary(part_name="PART.01 A", content="변수"),
+        PartSummary(part_name="PART.02 B", content="변수들"),
+        PartSummary(part_name="PART.03 C", content="함수"),
+    ]
+
+    questions = generate_llm_questions(
+        summaries, QuestionGenerationOptions(total_questions=3), client, semantic_cache=SemanticCache()
+    )
+
+    assert client.embedded == ["변수", "변수들", "함수"]
+    assert len(client.calls) == 2
+    assert [q.question_text for q in questions] == ["PART.01 A 질문", "PART.02 B 질문", "PART.01 A 질문"]
+    assert [q.part_name for q in questions] == [s.part_name for s in summaries]
+
+
+class _ConcurrencyLLM:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def generate_json(self, prompt, schema):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return {}
+
+
+def test_generate_llm_questions_caps_parallel_requests():
+    summaries = [PartSummary(part_name=f"PART.0{i} P{i}", content="요약") for i in range(1, 5)]
+    client = _ConcurrencyLLM()
+
+    generate_llm_questions(summaries, QuestionGenerationOptions(total_questions=4), client, max_parallel_requests=2)
+
+    assert client.peak <= 2
+
+
+def test_generate_questions_and_summaries_honor_parallel_request_option():
+    parts = [
+        Part(part_code=f"PART.0{i}", part_title=f"P{i}", part_name=f"PART.0{i} P{i}", lecture_ids=[f"L{i}"])
+        for i in range(1, 5)
+    ]
+    options = QuestionGenerationOptions(total_questions=4, max_parallel_requests=2)
+    client = _ConcurrencyLLM()
+
+    summaries = summarize_parts(parts, llm_client=client, max_parallel_requests=options.max_parallel_requests)
+    generate_questions(summaries, options, llm_client=client)
+
+    assert 1 < client.peak <= 2
+
+
+def test_summarize_and_generate_matches_staged_generation():
+    class _PromptLLM:
+        def generate_json(self, prompt, schema):
+            if "PART.02" in prompt and "summary" in schema["properties"]:
+                raise RuntimeError("summary down")
+            if "summary" in schema["properties"]:
+                return {"summary": f"요약 {prompt[-10:]}"}
+            return {
+                "questions": [
+                    {
+                        "question_text": f"Q {prompt.splitlines()[2]}",
+                        "explanation_text": "E",
+                        "question_type_code": 1,
+                        "answer_code": 1,
+                        "options": ["a", "b", "c", "d"],
+                    }
+                ]
+            }
+
+    parts = [
+        Part(part_code=f"PART.0{i}", part_title=f"P{i}", part_name=f"PART.0{i} P{i}", lecture_ids=[f"L{i}"])
+        for i in range(1, 4)
+    ]
+    options = QuestionGenerationOptions(total_questions=5)
+    client = _PromptLLM()
+
+    staged_summaries = summarize_parts(parts, client)
+    staged = generate_llm_questions(staged_summaries, options, client)
+    summaries, fused = summarize_and_generate_llm_questions(
+        parts, options, client, summarize_part=lambda part: summarize_parts([part], client)[0]
+    )
+
+    assert summaries == staged_summaries
+    assert [q.model_dump() for q in fused] == [q.model_dump() for q in staged]
+
+
+def test_invalid_llm_difficulty_falls_back_to_requested_difficulty():
+    payload = {
+        "questions": [
+            {
+                "question_text": "질문",
+                "explanation_text": "해설",
+                "question_type_code": 1,
+                "difficulty_code": 9,
+                "answer_code": 1,
+                "options": ["a", "b", "c", "d"],
+            }
+        ]
+    }
+    summaries = [PartSummary(part_name="PART.01 A", content="요약")]
+
+    options = QuestionGenerationOptions(total_questions=1, difficulty=2)
+
+    questions = generate_llm_questions(summaries, options, _FakeLLM(payload))
+
+    assert questions[0].difficulty_code == 2
+    assert Question.model_validate(questions[0].model_dump()) == questions[0]
+
+
+def test_generated_questions_share_one_part_name_object():
+    summaries = [PartSummary(part_name="".join(["PART.01 ", "A"]), content="요약")]
+
+    questions = generate_llm_questions(summaries, QuestionGenerationOptions(total_questions=3), _FakeLLM({}))
+
+    assert len(questions) == 3
+    assert all(q.part_name is questions[0].part_name for q in questions)
+
+
+def test_llm_questions_skip_revalidation_but_stay_schema_valid():
+    payload = {
+        "questions": [
+            {
+                "question_text": "질문 1",
+                "explanation_text": "해설",
+                "question_type": "mcq",
+                "difficulty_code": 4,
+                "answer_code": 3,
+                "options": ["a", "b", "c", "d"],
+            },
+            {
+                "question_text": "질문 2",
+                "explanation_text": "해설",
+                "question_type": "OX",
+                "answer_code": 5,
+            },
+            {
+                "question_text": "질문 3",
+                "explanation_text": "해설",
+                "question_type": "1",
+                "answer_code": 2,
+                "options": "abcd",
+            },
+        ]
+    }
+    summaries = [PartSummary(part_name="PART.01 A", content="요약")]
+
+    questions = generate_llm_questions(summaries, QuestionGenerationOptions(total_questions=3), _FakeLLM(payload))
+
+    assert [q.question_type_code for q in questions] == [1, 3, 1]
+    assert (questions[0].difficulty_code, questions[0].answer_code) == (4, 3)
+    assert questions[1].answer_code == 1  # out-of-range OX answer falls back
+    assert len(questions[2].options) == 4 and questions[2].options[0] != "a"
+    for question in questions:
+        assert Question.model_validate(question.model_dump()) == question
+
+
+def test_question_options_reject_non_positive_parallel_requests():
+    with pytest.raises(ValueError):
+        QuestionGenerationOptions(max_parallel_requests=0).validate()
+
+
+def test_short_llm_payload_leaves_no_placeholder_slots():
+    payload = {
+        "questions": [
+            {
+                "question_text": "질문",
+                "explanation_text": "해설",
+                "question_type_code": 3,
+                "answer_code": 1,
+            }
+        ]
+    }
+    summaries = [PartSummary(part_name="PART.01 A", content="요약")]
+
+    questions = generate_llm_questions(summaries, QuestionGenerationOptions(total_questions=3), _FakeLLM(payload))
+
+    assert len(questions) == 1
+    assert all(isinstance(q, Question) for q in questions)
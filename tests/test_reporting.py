@@ -1,4 +1,5 @@
-from quizen.reporting import build_meta_report, build_meta_sheet_rows
+from quizen import reporting
+from quizen.reporting import build_meta_report, build_meta_sheet_rows, part_score_distribution
 from quizen.models import Part, Question
 
 
@@ -41,6 +42,8 @@ def test_build_meta_sheet_rows_produces_part_and_question_sections():
     )
 
     assert rows[1] == ["PART.01", "Intro", "2", "L1, L2"]
+    assert ["1", "PART.01 Intro", "1", "3", "1"] in rows
+    assert ["2", "PART.02 Deep", "3", "2", "2"] in rows
     assert ["pipeline_event", "payload"] in rows
     assert ["warning"] in rows
     assert ["service", "operation", "status", "error_code", "message"] in rows
@@ -76,3 +79,29 @@ def test_build_meta_report_collects_failed_calls():
     assert report["warnings"] == ["warn"]
     assert report["events"][0]["event"] == "run_started"
     assert report["failed_calls"] == [{"service": "llm", "operation": "summary", "status": "error", "error_code": "Timeout"}]
+
+
+def test_precomputed_distribution_is_shared_by_sheet_rows_and_report(monkeypatch):
+    parts = [Part(part_code="PART.01", part_title="Intro", part_name="PART.01 Intro", lecture_ids=["L1"])]
+    questions = [
+        Question(
+            difficulty_code=3,
+            question_type_code=3,
+            question_text="Q1",
+            explanation_text="E1",
+            answer_code=1,
+            part_name="PART.01 Intro",
+            validity_score=75,
+        )
+    ]
+    distribution = part_score_distribution(parts, questions)
+    expected_rows = build_meta_sheet_rows(parts, questions)
+    expected_report = build_meta_report(parts, questions)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("distribution recomputed")
+
+    monkeypatch.setattr(reporting, "part_score_distribution", _fail)
+
+    assert build_meta_sheet_rows(parts, questions, distribution=distribution) == expected_rows
+    assert build_meta_report(parts, questions, distribution=distribution) == expected_report
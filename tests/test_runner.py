@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pytest
 
+from quizen.google_api import SheetsClient
 from quizen.models import Lecture
 from quizen.runner import build_lectures_from_drive, run_drive_to_sheet
 
@@ -68,7 +69,7 @@ def test_run_drive_to_sheet_uses_clients_and_returns_result(monkeypatch):
 
     # Patch load_credentials to avoid file I/O
     monkeypatch.setattr("quizen.runner.load_credentials", StubTokenLoader(fake_creds))
-    monkeypatch.setattr("quizen.runner.build_meta_sheet_rows", lambda *args, **kwargs: meta_rows)
+    monkeypatch.setattr("quizen.runner.iter_meta_sheet_rows", lambda *args, **kwargs: meta_rows)
 
     result = run_drive_to_sheet(
         credentials_path=Path("/tmp/creds.json"),
@@ -110,3 +111,31 @@ def test_run_drive_to_sheet_can_skip_meta_sheet(monkeypatch):
     )
 
     assert fake_sheets.meta_writes == []
+
+
+def test_run_drive_to_sheet_can_batch_meta_sheet_with_export(monkeypatch):
+    class BatchingSheets(FakeSheets):
+        meta_value_range = staticmethod(SheetsClient.meta_value_range)
+
+        def write_export_rows(self, spreadsheet_id, rows, sheet_name="Sheet1", extra_ranges=None):
+            self.extra_ranges = extra_ranges
+            return super().write_export_rows(spreadsheet_id, rows, sheet_name=sheet_name)
+
+    fake_creds = StubCredentials()
+    fake_sheets = BatchingSheets()
+    monkeypatch.setattr("quizen.runner.load_credentials", StubTokenLoader(fake_creds))
+    monkeypatch.setattr("quizen.runner.iter_meta_sheet_rows", lambda *args, **kwargs: iter([["meta"]]))
+
+    run_drive_to_sheet(
+        credentials_path=Path("/tmp/creds.json"),
+        srt_folder_id="folder-xyz",
+        template_sheet_id="template-123",
+        copy_name="Copy",
+        drive_client=FakeDrive(fake_creds),
+        sheets_client=fake_sheets,
+        batch_meta_sheet=True,
+    )
+
+    assert len(fake_sheets.writes) == 1
+    assert fake_sheets.extra_ranges == [{"range": "quizen_meta!A1:Z1", "values": [["meta"]]}]
+    assert fake_sheets.meta_writes == []
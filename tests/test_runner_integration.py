@@ -80,7 +80,7 @@ def test_run_drive_to_sheet_with_mock_clients(monkeypatch):
     mock_sheets = MockSheets()
     meta_rows = [["meta", "row"]]
 
-    monkeypatch.setattr("quizen.runner.build_meta_sheet_rows", lambda *args, **kwargs: meta_rows)
+    monkeypatch.setattr("quizen.runner.iter_meta_sheet_rows", lambda *args, **kwargs: meta_rows)
 
     result = run_drive_to_sheet(
         credentials_path=None,
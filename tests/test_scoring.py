@@ -1,44 +1,7 @@
-import sys
-import types
-
-# Stub Google client libraries to avoid heavy dependencies during tests
-google_stub = types.ModuleType("google")
-sys.modules.setdefault("google", google_stub)
-sys.modules.setdefault("google.oauth2", types.ModuleType("google.oauth2"))
-credentials_module = types.ModuleType("google.oauth2.credentials")
-credentials_module.Credentials = type("Credentials", (), {})
-sys.modules.setdefault("google.oauth2.credentials", credentials_module)
-service_account_module = types.ModuleType("google.oauth2.service_account")
-service_account_module.Credentials = type(
-    "ServiceAccountCredentials",
-    (),
-    {"from_service_account_file": staticmethod(lambda *args, **kwargs: object())},
-)
-sys.modules.setdefault("google.oauth2.service_account", service_account_module)
-flow_module = types.ModuleType("google_auth_oauthlib.flow")
-flow_module.InstalledAppFlow = type(
-    "InstalledAppFlow",
-    (),
-    {"from_client_secrets_file": staticmethod(lambda *a, **k: type("_Flow", (), {"run_local_server": lambda self, port=0: object()})())},
-)
-sys.modules.setdefault("google_auth_oauthlib", types.ModuleType("google_auth_oauthlib"))
-sys.modules.setdefault("google_auth_oauthlib.flow", flow_module)
-discovery_module = types.ModuleType("googleapiclient.discovery")
-discovery_module.build = lambda *args, **kwargs: None
-sys.modules.setdefault("googleapiclient", types.ModuleType("googleapiclient"))
-sys.modules.setdefault("googleapiclient.discovery", discovery_module)
-http_module = types.ModuleType("googleapiclient.http")
-http_module.MediaIoBaseDownload = type(
-    "MediaIoBaseDownload", (), {"next_chunk": lambda self: (None, True)}
-)
-sys.modules.setdefault("googleapiclient.http", http_module)
-fastapi_module = types.ModuleType("fastapi")
-fastapi_module.FastAPI = type("FastAPI", (), {"__init__": lambda self, *a, **k: None})
-fastapi_module.HTTPException = type("HTTPException", (Exception,), {})
-sys.modules.setdefault("fastapi", fastapi_module)
+import pytest
 
 from quizen.models import Question
-from quizen.scoring import THRESHOLD_FLAG, score_questions
+from quizen.scoring import THRESHOLD_FLAG, _detect_style_flags, score_questions
 
 
 class _FakeLLMClient:
@@ -106,3 +69,42 @@ def test_score_questions_flags_threshold_breaches():
 
     assert THRESHOLD_FLAG in questions[0].style_violation_flags
     assert "off_topic" in questions[0].style_violation_flags
+
+
+@pytest.mark.parametrize(
+    "explanation, flagged",
+    [("정답은 A입니다.", True), ("정답은 A라고 합니다  \n", False), ("확인합니까", False), ("   ", True)],
+)
+def test_detect_style_flags_ignores_trailing_whitespace(explanation, flagged):
+    question = _question(q_type=1).model_copy(update={"explanation_text": explanation})
+
+    assert ("explanation_tone" in _detect_style_flags(question)) is flagged
+
+
+def test_score_questions_shards_rubric_and_falls_back_per_chunk():
+    class _ChunkLLM:
+        def __init__(self):
+            self.prompts = []
+
+        def generate_json(self, prompt, schema):
+            self.prompts.append(prompt)
+            if "[2]" not in prompt:  # only the trailing one-question chunk
+                raise RuntimeError("chunk failed")
+            return {"scores": [{"total_score": 90}, {"total_score": 91}]}
+
+    llm = _ChunkLLM()
+    questions = [_question() for _ in range(5)]
+
+    score_questions(questions, llm_client=llm, chunk_size=2)
+
+    assert len(llm.prompts) == 3
+    assert [q.validity_score for q in questions] == [90.0, 91.0, 90.0, 91.0, 85.0]
+
+
+def test_score_questions_splits_rubric_by_estimated_tokens():
+    llm = _FakeLLMClient(payload={"scores": [{"total_score": 88}]})
+    long_question = _question().model_copy(update={"explanation_text": "설명 " * 50})
+
+    score_questions([long_question, long_question.model_copy(), _question()], llm_client=llm, max_prompt_tokens=60)
+
+    assert len(llm.calls) == 3
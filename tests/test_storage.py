@@ -0,0 +1,95 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from quizen import storage as storage_module
+from quizen.storage import JsonStorage
+
+
+def test_load_reuses_parsed_run_until_file_changes(tmp_path):
+    storage = JsonStorage(tmp_path)
+    path = storage.save("run1", {"questions": [{"question_text": "질문"}]})
+
+    first = storage.load("run1")
+    assert storage.load("run1") is first
+
+    path.write_text(json.dumps({"questions": []}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert storage.load("run1") == {"questions": []}
+
+
+def test_load_interns_part_names(tmp_path):
+    JsonStorage(tmp_path).save("run1", {"questions": [{"part_name": "PART.01 A"} for _ in range(3)]})
+    questions = JsonStorage(tmp_path).load("run1")["questions"]
+    assert all(q["part_name"] is questions[0]["part_name"] for q in questions)
+
+
+def test_load_missing_run_raises_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError, match="missing"):
+        JsonStorage(tmp_path).load("missing")
+
+
+def test_patches_are_appended_and_replayed_on_load(tmp_path):
+    storage = JsonStorage(tmp_path)
+    run = {"questions": [{"answer_code": 1}, {"answer_code": 2}]}
+    storage.save("run1", run)
+    snapshot = (tmp_path / "run1.json").read_bytes()
+
+    run["questions"] = [run["questions"][0], {"answer_code": 3}]
+    storage.save_patch("run1", run, ["questions", 1], {"answer_code": 3})
+
+    assert (tmp_path / "run1.json").read_bytes() == snapshot
+    assert JsonStorage(tmp_path).load("run1") == {"questions": [{"answer_code": 1}, {"answer_code": 3}]}
+
+
+def test_torn_patch_lines_are_skipped_on_load(tmp_path, caplog):
+    storage = JsonStorage(tmp_path)
+    run = {"questions": [{"answer_code": 1}, {"answer_code": 2}]}
+    storage.save("run1", run)
+    run["questions"] = [{"answer_code": 3}, run["questions"][1]]
+    storage.save_patch("run1", run, ["questions", 0], {"answer_code": 3})
+    with (tmp_path / "run1.log").open("ab") as handle:
+        handle.write(b'{"path": ["questions", 1], "va\n{"path": ["questions", 1], "value"')
+
+    assert JsonStorage(tmp_path).load("run1") == {"questions": [{"answer_code": 3}, {"answer_code": 2}]}
+    assert len(caplog.records) == 2
+
+
+def test_patch_log_is_folded_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_module, "SNAPSHOT_EVERY", 3)
+    storage = JsonStorage(tmp_path)
+    run = {"questions": [{"answer_code": 1}]}
+    storage.save("run1", run)
+
+    for answer in (2, 3):
+        run["questions"] = [{"answer_code": answer}]
+        storage.save_patch("run1", run, ["questions", 0], {"answer_code": answer})
+    assert (tmp_path / "run1.log").exists()
+
+    run["questions"] = [{"answer_code": 4}]
+    storage.save_patch("run1", run, ["questions", 0], {"answer_code": 4})
+
+    assert not (tmp_path / "run1.log").exists()
+    assert JsonStorage(tmp_path).load("run1") == {"questions": [{"answer_code": 4}]}
+
+
+def test_concurrent_patches_are_all_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_module, "SNAPSHOT_EVERY", 7)
+    storage = JsonStorage(tmp_path)
+    payload = {"questions": [{"answer_code": 0} for _ in range(40)]}
+    storage.save("r1", payload)
+
+    def edit(idx):
+        payload["questions"][idx]["answer_code"] = 1
+        storage.save_patch("r1", payload, ["questions", idx, "answer_code"], 1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(edit, range(40)))
+
+    reloaded = JsonStorage(tmp_path).load("r1")
+    assert [q["answer_code"] for q in reloaded["questions"]] == [1] * 40
+    assert not list(tmp_path.glob("*.tmp"))
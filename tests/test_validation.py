@@ -0,0 +1,55 @@
+from quizen.models import ExportRow
+from quizen.validation import export_rows_valid, iter_export_row_errors, validate_export_rows
+
+
+def _row(**overrides) -> ExportRow:
+    values = dict(
+        difficulty_code=3,
+        question_type_code=1,
+        question_text="Q",
+        explanation_text="E",
+        answer_code=1,
+        options=["a", "b", "c", "d"],
+    )
+    values.update(overrides)
+    return ExportRow.model_construct(**values)
+
+
+def test_validate_export_rows_accepts_valid_rows():
+    rows = [_row(), _row(question_type_code=3, answer_code=2, options=[]), _row(difficulty_code=5, answer_code=4)]
+
+    assert validate_export_rows(rows) == (True, [])
+
+
+def test_validate_export_rows_reports_every_problem_per_row():
+    rows = [
+        _row(),
+        _row(difficulty_code=9, answer_code=5, options=["a"]),
+        _row(question_type_code=3, answer_code=3, options=[]),
+        _row(question_type_code=2),
+    ]
+
+    ok, errors = validate_export_rows(rows)
+
+    assert not ok
+    assert errors == [
+        "Row 4: difficulty must be 1-5",
+        "Row 4: MCQ must have 4 options",
+        "Row 4: MCQ answer must be 1-4",
+        "Row 5: OX answer must be 1 or 2",
+        "Row 6: question_type must be 1 or 3",
+    ]
+
+
+def test_export_rows_valid_stops_at_first_invalid_row():
+    consumed = []
+
+    def rows():
+        for row in [_row(), _row(difficulty_code=9), _row(question_type_code=2)]:
+            consumed.append(row)
+            yield row
+
+    assert export_rows_valid(rows()) is False
+    assert len(consumed) == 2
+    assert export_rows_valid([_row()]) is True
+    assert next(iter_export_row_errors([_row(answer_code=7)])) == "Row 3: MCQ answer must be 1-4"
@@ -1,8 +1,26 @@
 import json
 
+import pytest
 from fastapi.testclient import TestClient
 
-from quizen.web import create_app
+import quizen.web as web
+from quizen.storage import JsonStorage
+from quizen.web import (
+    QuestionEditPayload,
+    _apply_question_edit,
+    _QuestionIndex,
+    _RunStateCache,
+    _sort_questions,
+    _templates,
+    create_app,
+)
+
+
+@pytest.fixture
+def client(tmp_path):
+    # Entered once so every request reuses one event-loop portal instead of starting its own.
+    with TestClient(create_app(storage_dir=tmp_path)) as test_client:
+        yield test_client
 
 
 def test_create_app_runs_pipeline_and_persists(tmp_path):
@@ -31,8 +49,7 @@ def test_create_app_runs_pipeline_and_persists(tmp_path):
     assert body["state"]["status"] == "completed"
 
 
-def test_runs_endpoint_persists_full_payload(tmp_path):
-    client = TestClient(create_app(storage_dir=tmp_path))
+def test_runs_endpoint_persists_full_payload(client, tmp_path):
 
     payload = {
         "lectures": [
@@ -55,8 +72,7 @@ def test_runs_endpoint_persists_full_payload(tmp_path):
     assert stored["events"][-1]["event"] == "export_ready"
 
 
-def test_form_endpoint_runs_pipeline_and_stores_drive_settings(tmp_path):
-    client = TestClient(create_app(storage_dir=tmp_path))
+def test_form_endpoint_runs_pipeline_and_stores_drive_settings(client, tmp_path):
     before = {p.name for p in tmp_path.glob("*.json")}
 
     lectures_json = json.dumps([
@@ -91,6 +107,14 @@ def test_form_endpoint_runs_pipeline_and_stores_drive_settings(tmp_path):
     assert len(payload["export_rows"]) == 2
 
 
+def test_form_endpoint_rejects_malformed_lectures_json(client):
+
+    response = client.post("/runs/form", data={"lectures_json": "[{"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid lectures JSON")
+
+
 def test_health_endpoint():
     client = TestClient(create_app(storage_dir="/tmp"))
     resp = client.get("/health")
@@ -98,8 +122,7 @@ def test_health_endpoint():
     assert resp.json()["status"] == "ok"
 
 
-def test_home_template_and_filters(tmp_path):
-    client = TestClient(create_app(storage_dir=tmp_path))
+def test_home_template_and_filters(client):
     html = client.get("/")
     assert "Drive 상위 폴더 ID" in html.text
     assert "문항 수" in html.text
@@ -121,8 +144,7 @@ def test_home_template_and_filters(tmp_path):
     assert style_only["count"] <= filtered["count"]
 
 
-def test_question_patch_validates(tmp_path):
-    client = TestClient(create_app(storage_dir=tmp_path))
+def test_question_patch_validates(client):
     payload = {
         "lectures": [{"order": "001", "id": "L1", "title": "Intro"}],
         "total_questions": 1,
@@ -148,8 +170,7 @@ def test_question_patch_validates(tmp_path):
     assert valid.json()["state"]["status"] == "completed"
 
 
-def test_revalidation_endpoint_updates_state(tmp_path):
-    client = TestClient(create_app(storage_dir=tmp_path))
+def test_revalidation_endpoint_updates_state(client):
     payload = {
         "lectures": [
             {"order": "001", "id": "L1", "title": "Intro"},
@@ -182,3 +203,247 @@ def test_token_auth_dependency(monkeypatch, tmp_path):
 
     authed = client.get("/", headers={"X-Auth-Token": "secret"})
     assert authed.status_code == 200
+
+
+def test_password_auth_accepts_only_the_configured_password(monkeypatch, tmp_path):
+    monkeypatch.setenv("QUIZEN_AUTH_PASSWORD", "pw-123")
+    client = TestClient(create_app(storage_dir=tmp_path))
+
+    assert client.get("/", headers={"X-Auth-Password": "pw-12"}).status_code == 401
+    assert client.get("/", headers={"X-Auth-Token": "pw-123"}).status_code == 401
+    assert client.get("/", headers={"X-Auth-Password": "pw-123"}).status_code == 200
+
+
+def test_app_reuses_llm_client_and_leaves_it_open_on_shutdown(tmp_path):
+    class _ClosingLLM:
+        def __init__(self):
+            self.closed = False
+
+        def generate_json(self, prompt, schema):
+            raise RuntimeError("offline")
+
+        def close(self):
+            self.closed = True
+
+    llm = _ClosingLLM()
+    payload = {"lectures": [{"order": "001", "id": "L1", "title": "Intro"}], "total_questions": 1}
+
+    with TestClient(create_app(storage_dir=tmp_path, llm_client=llm)) as client:
+        assert client.post("/runs", json=payload).status_code == 200
+        assert client.post("/runs", json=payload).status_code == 200
+        assert not llm.closed
+
+    # The caller owns the client, so a second app can keep using it.
+    assert not llm.closed
+    with TestClient(create_app(storage_dir=tmp_path, llm_client=llm)) as client:
+        assert client.post("/runs", json=payload).status_code == 200
+    assert not llm.closed
+
+
+def test_question_index_matches_linear_filter():
+    questions = [
+        {"part_name": "PART.01 A", "question_type_code": 1, "question_text": "Alpha", "validity_score": 90},
+        {"part_name": "PART.02 B", "question_type_code": 3, "question_text": "beta", "validity_score": 70},
+        {"part_name": "PART.01 A", "question_type_code": 3, "explanation_text": "ALPHA note", "style_violation_flags": ["x"]},
+        {"part_name": "PART.01 A", "question_type_code": 1, "question_text": "gamma", "validity_score": 80},
+    ]
+    index = _QuestionIndex(questions)
+
+    def scan(part_name=None, question_type=None, min_score=None, style_only=False, search=None):
+        return [
+            q
+            for q in questions
+            if (not part_name or q.get("part_name") == part_name)
+            and (question_type is None or q.get("question_type_code") == question_type)
+            and (min_score is None or (q.get("validity_score") is not None and q["validity_score"] >= min_score))
+            and (not style_only or q.get("style_violation_flags"))
+            and (not search or search.lower() in f"{q.get('question_text','')} {q.get('explanation_text','')}".lower())
+        ]
+
+    cases = [
+        {},
+        {"part_name": "PART.01 A"},
+        {"question_type": 3},
+        {"part_name": "PART.01 A", "question_type": 1},
+        {"part_name": "PART.09 Z"},
+        {"min_score": 80},
+        {"style_only": True},
+        {"search": "alpha"},
+        {"search": "a"},
+        {"search": "ha b"},
+        {"search": "zzz"},
+        {"part_name": "PART.01 A", "question_type": 3, "search": "Alpha"},
+    ]
+    for filters in cases:
+        assert index.filter(**filters) == scan(**filters), filters
+    assert index.part_names == ["PART.01 A", "PART.02 B"]
+    assert index.filter() is questions
+    assert index.filter(question_type=0) == []
+
+
+def test_question_search_sees_edits(client):
+    payload = {"lectures": [{"order": "001", "id": "L1", "title": "Intro"}], "total_questions": 1, "include_ox": False}
+    run_id = client.post("/runs", json=payload).json()["run_id"]
+    assert client.get(f"/runs/{run_id}/questions", params={"search": "새 문항"}).json()["count"] == 0
+
+    client.patch(f"/runs/{run_id}/questions/0", json={"question_text": "새 문항입니까?"})
+
+    assert client.get(f"/runs/{run_id}/questions", params={"search": "새 문항"}).json()["count"] == 1
+
+
+def test_sort_questions_puts_missing_keys_last():
+    questions = [
+        {"part_name": "PART.02 B", "validity_score": None},
+        {"part_name": "PART.01 A", "validity_score": 70},
+        {"validity_score": 90},
+    ]
+
+    by_score = _sort_questions(questions, "validity", "desc")
+    by_part = _sort_questions(questions, "part", "asc")
+
+    assert [q["validity_score"] for q in by_score] == [90, 70, None]
+    assert [q.get("part_name") for q in by_part] == ["PART.01 A", "PART.02 B", None]
+
+
+def test_unchanged_question_edit_does_not_rewrite_run(client, tmp_path):
+    payload = {"lectures": [{"order": "001", "id": "L1", "title": "Intro"}], "total_questions": 1, "include_ox": False}
+    run_id = client.post("/runs", json=payload).json()["run_id"]
+    run_file = tmp_path / f"{run_id}.json"
+    question = client.get(f"/runs/{run_id}").json()["questions"][0]
+    before = run_file.stat().st_mtime_ns
+
+    same = client.patch(f"/runs/{run_id}/questions/0", json={"answer_code": question["answer_code"]})
+
+    assert same.status_code == 200
+    assert same.json()["question"] == question
+    assert run_file.stat().st_mtime_ns == before
+
+
+def test_failed_edit_leaves_cached_run_unchanged(client):
+    payload = {"lectures": [{"order": "001", "id": "L1", "title": "Intro"}], "total_questions": 1, "include_ox": False}
+    run_id = client.post("/runs", json=payload).json()["run_id"]
+    before = client.get(f"/runs/{run_id}").json()
+
+    assert client.patch(f"/runs/{run_id}/questions/0", json={"answer_code": 5}).status_code == 400
+
+    assert client.get(f"/runs/{run_id}").json() == before
+
+
+def test_edits_save_a_copy_instead_of_mutating_the_loaded_run(monkeypatch, tmp_path):
+    storage = JsonStorage(tmp_path)
+    monkeypatch.setattr(web, "JsonStorage", lambda root: storage)
+    client = TestClient(create_app(storage_dir=tmp_path))
+    payload = {"lectures": [{"order": "001", "id": "L1", "title": "Intro"}], "total_questions": 1, "include_ox": False}
+    run_id = client.post("/runs", json=payload).json()["run_id"]
+    loaded = storage.load(run_id)
+    original_text = loaded["questions"][0]["question_text"]
+
+    client.patch(f"/runs/{run_id}/questions/0", json={"question_text": "새 문항입니까?"})
+    client.post(f"/runs/{run_id}/revalidate")
+
+    assert loaded["questions"][0]["question_text"] == original_text
+    assert "revalidation_completed" not in [e["event"] for e in loaded["events"]]
+    assert storage.load(run_id)["questions"][0]["question_text"] == "새 문항입니까?"
+
+
+def test_run_state_is_reused_until_events_grow():
+    cache = _RunStateCache()
+    run = {"events": [{"event": "run_started"}]}
+
+    first = cache.update("r1", run)
+    assert cache.update("r1", run) is first
+    assert first["status"] == "running"
+
+    run["events"].append({"event": "export_ready"})
+    updated = cache.update("r1", run)
+
+    assert updated is not first
+    assert updated["status"] == "completed" and "state" not in run
+
+
+def test_report_summarizes_scores_in_one_pass(tmp_path):
+    app = create_app(storage_dir=tmp_path)
+    questions = [
+        {"part_name": "PART.01 A", "question_text": "낮은 점수 문항", "validity_score": 60, "style_violation_flags": []},
+        {"part_name": "PART.02 B", "question_text": "높은 점수 문항", "validity_score": 90, "style_violation_flags": ["ox_tone"]},
+        {"part_name": "PART.01 A", "question_text": "미채점 문항", "validity_score": None},
+    ]
+    JsonStorage(tmp_path).save("r1", {"questions": questions, "events": [{"event": "run_started"}]})
+
+    html = TestClient(app).get("/runs/r1/report").text
+
+    assert "평균 점수: 75" in html
+    assert "저점수(<70) 문항: 1 · 스타일 플래그: 1" in html
+
+
+def test_fast_json_response_encodes_models_and_paths():
+    from pathlib import Path
+
+    from quizen.models import Lecture
+    from quizen.web import FastJSONResponse
+
+    response = FastJSONResponse({"path": Path("a/b"), "lecture": Lecture(order="001", id="L1", title="강의")})
+
+    assert response.headers["content-type"] == "application/json"
+    body = json.loads(response.body)
+    assert body["path"] == "a/b"
+    assert body["lecture"]["title"] == "강의"
+
+
+def test_text_only_edit_skips_question_revalidation(monkeypatch):
+    stored = {
+        "difficulty_code": 3,
+        "question_type_code": 3,
+        "question_text": "Q",
+        "explanation_text": "E",
+        "answer_code": 1,
+        "options": [],
+        "part_name": "PART.01 A",
+    }
+
+    def fail(**_kwargs):
+        raise AssertionError("Question should not be rebuilt for a text edit")
+
+    monkeypatch.setattr(web, "Question", fail)
+    edited = _apply_question_edit(stored, QuestionEditPayload(explanation_text="새 해설"))
+
+    assert edited == {**stored, "explanation_text": "새 해설"}
+    with pytest.raises(AssertionError):
+        _apply_question_edit(stored, QuestionEditPayload(answer_code=2))
+
+
+def test_templates_are_shared_and_precompiled():
+    templates = _templates()
+
+    assert _templates() is templates
+    assert len(templates.env.cache) == len(templates.env.list_templates())
+
+
+def test_large_responses_are_gzipped(client):
+    payload = {"lectures": [{"order": "001", "id": "L1", "title": "Intro"}], "total_questions": 10, "include_ox": False}
+    run_id = client.post("/runs", json=payload).json()["run_id"]
+
+    questions = client.get(f"/runs/{run_id}/questions", headers={"Accept-Encoding": "gzip"})
+    health = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+    assert questions.headers["content-encoding"] == "gzip"
+    assert questions.json()["count"] == 10
+    assert "content-encoding" not in health.headers
+
+
+def test_run_reads_honor_if_none_match_until_edited(client):
+    payload = {"lectures": [{"order": "001", "id": "L1", "title": "Intro"}], "total_questions": 1, "include_ox": False}
+    run_id = client.post("/runs", json=payload).json()["run_id"]
+
+    first = client.get(f"/runs/{run_id}")
+    etag = first.headers["etag"]
+    cached = client.get(f"/runs/{run_id}", headers={"If-None-Match": etag})
+    search = client.get(f"/runs/{run_id}/questions", headers={"If-None-Match": etag})
+    client.patch(f"/runs/{run_id}/questions/0", json={"question_text": "바뀐 문항입니까?"})
+    after_edit = client.get(f"/runs/{run_id}", headers={"If-None-Match": etag})
+
+    assert cached.status_code == 304 and not cached.content
+    assert search.status_code == 304
+    assert after_edit.status_code == 200
+    assert after_edit.headers["etag"] != etag
+    assert client.get("/runs/missing", headers={"If-None-Match": "*"}).status_code == 404